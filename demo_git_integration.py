@@ -334,6 +334,36 @@ This project is used with the AI Codebase Migration Tool for automated Spring mi
     
     return demo_dir
 
+def read_repository_state(project_dir):
+    """
+    Read the current branch and changed files with a single git status call.
+
+    Returns:
+        tuple: (branch name, list of (XY status, path)); the branch is empty
+        on a detached HEAD
+    """
+    result = subprocess.run(
+        ["git", "status", "--porcelain=v2", "--branch", "-uall"],
+        cwd=project_dir, capture_output=True, text=True, check=True
+    )
+    branch = ""
+    changes = []
+    for line in result.stdout.splitlines():
+        kind = line[:1]
+        if line.startswith("# branch.head "):
+            head = line[len("# branch.head "):]
+            branch = "" if head == "(detached)" else head
+        elif kind == "1":
+            changes.append((line[2:4], line.split(" ", 8)[8]))
+        elif kind == "2":
+            # Renames and copies end in "<path>\t<original path>"
+            changes.append((line[2:4], line.split(" ", 9)[9].split("\t")[0]))
+        elif kind == "u":
+            changes.append((line[2:4], line.split(" ", 10)[10]))
+        elif kind == "?":
+            changes.append(("??", line[2:]))
+    return branch, changes
+
 def demonstrate_git_integration(project_dir):
     """Demonstrate the Git integration workflow."""
     
@@ -341,17 +371,18 @@ def demonstrate_git_integration(project_dir):
     print(f"🚀 DEMONSTRATING GIT INTEGRATION WORKFLOW")
     print(f"="*60)
     
+    # One status call reports both the branch and the changed files
+    current_branch, changes = read_repository_state(project_dir)
+    
     print(f"\n1. 📋 Current Git Status:")
-    result = subprocess.run(["git", "status", "--short"], cwd=project_dir, capture_output=True, text=True)
-    if result.stdout.strip():
-        print(f"   Changes detected: {len(result.stdout.strip().split())}")
-        print(f"   {result.stdout}")
+    if changes:
+        print(f"   Changes detected: {len(changes)}")
+        for status, path in changes:
+            print(f"   {status} {path}")
     else:
         print(f"   ✅ Working directory is clean")
     
     print(f"\n2. 🌿 Current Branch:")
-    result = subprocess.run(["git", "branch", "--show-current"], cwd=project_dir, capture_output=True, text=True)
-    current_branch = result.stdout.strip()
     print(f"   📍 {current_branch}")
     
     print(f"\n3. 🔗 Remote Repository:")
@@ -12,16 +12,29 @@ Enhanced with large repository handling capabilities:
 import argparse
 import sys
 import os
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
-
-from flow import create_spring_migration_flow
 from utils.performance_monitor import enable_performance_monitoring, get_performance_monitor
 from utils.verbose_logger import enable_verbose_logging, get_verbose_logger
 
 
+# File filtering patterns - optimized for Spring projects
+SPRING_INCLUDE_PATTERNS = frozenset({
+    "*.java", "*.xml", "*.properties", "*.yml", "*.yaml",
+    "*.gradle", "*.gradle.kts", "pom.xml", "*.sql", "*.jsp", "*.jspx"
+})
+SPRING_EXCLUDE_PATTERNS = frozenset({
+    "*/target/*", "*/build/*", "*/.git/*", "*/.idea/*",
+    "*/node_modules/*", "*.class", "*.jar", "*.war", "*.ear"
+})
+
+
+class _FrozenSetAction(argparse.Action):
+    """Store nargs values as a frozenset so main() can use them as-is."""
+    
+    def __call__(self, parser, namespace, values, option_string=None):
+        setattr(namespace, self.dest, frozenset(values))
+
+
 def create_shared_state(args):
     """Create the shared state dictionary for the flow."""
     
@@ -35,23 +48,20 @@ def create_shared_state(args):
         vlogger.section_header("Spring Migration Tool - Verbose Mode")
         vlogger.log("Initializing shared state and configuration")
     
+    # Resolve the GitHub token once: explicit flag wins over the environment
+    github_token = args.github_token or os.getenv("GITHUB_TOKEN")
+    
     shared = {
         # Repository settings
         "repo_url": args.repo,
         "local_dir": args.dir,
-        "github_token": args.github_token,
+        "github_token": github_token,
         "source_branch": args.source_branch,
         
-        # File filtering patterns - optimized for Spring projects
-        "include_patterns": [
-            "*.java", "*.xml", "*.properties", "*.yml", "*.yaml",
-            "*.gradle", "*.gradle.kts", "pom.xml", "*.sql", "*.jsp", "*.jspx"
-        ],
-        "exclude_patterns": [
-            "*/target/*", "*/build/*", "*/.git/*", "*/.idea/*", 
-            "*/node_modules/*", "*.class", "*.jar", "*.war", "*.ear"
-        ],
-        "max_file_size": 1024 * 1024,  # 1MB max per file
+        # File filtering patterns - shared read-only module constants
+        "include_patterns": args.include or SPRING_INCLUDE_PATTERNS,
+        "exclude_patterns": args.exclude or SPRING_EXCLUDE_PATTERNS,
+        "max_file_size": args.max_size,  # Bytes; files above this are skipped
         
         # Output and processing settings
         "output_dir": args.output,
@@ -168,6 +178,10 @@ def validate_arguments(args):
         print("❌ Error: --batch-size must be at least 1")
         return False
     
+    if args.max_size < 1:
+        print("❌ Error: --max-size must be a positive number of bytes")
+        return False
+    
     if args.max_files and args.max_files < 10:
         print("❌ Error: --max-files must be at least 10")
         return False
@@ -251,6 +265,10 @@ Examples:
                        help="GitHub personal access token (for private repos)")
     parser.add_argument("--source-branch", type=str,
                        help="Git branch to fetch and analyze from the repository (default: repository's default branch)")
+    parser.add_argument("-i", "--include", nargs="+", action=_FrozenSetAction, metavar="PATTERN",
+                       help="Glob patterns of files to include (default: Spring source, build and config files)")
+    parser.add_argument("-e", "--exclude", nargs="+", action=_FrozenSetAction, metavar="PATTERN",
+                       help="Glob patterns of files to exclude (default: build output, VCS and IDE folders)")
     parser.add_argument("-o", "--output", type=str, default="./migration_analysis",
                        help="Output directory for reports (default: ./migration_analysis)")
     
@@ -279,6 +297,8 @@ Examples:
                            help="Batch size for concurrent processing (default: 10)")
     perf_group.add_argument("--max-files", type=int,
                            help="Maximum number of files to analyze (for very large repos)")
+    perf_group.add_argument("--max-size", type=int, default=1024 * 1024,
+                           help="Maximum file size in bytes; larger files are skipped (default: 1048576, about 1MB)")
     perf_group.add_argument("--disable-optimization", action="store_true",
                            help="Disable automatic performance optimizations")
     perf_group.add_argument("--disable-performance-monitoring", action="store_true",
@@ -286,6 +306,10 @@ Examples:
     
     args = parser.parse_args()
     
+    # Load environment variables from .env file (deferred so --help stays cheap)
+    from dotenv import load_dotenv
+    load_dotenv()
+    
     # Validate arguments
     if not validate_arguments(args):
         sys.exit(1)
@@ -297,43 +321,47 @@ Examples:
         vlogger.section_header("AI-Powered Spring Migration Tool")
         vlogger.log("Verbose mode enabled - showing detailed progress")
     
-    # Print startup information
-    print("🚀 AI-Powered Spring Migration Tool")
-    print("=" * 50)
+    # Print startup information as one assembled block
+    banner = ["🚀 AI-Powered Spring Migration Tool", "=" * 50]
     
     if args.repo:
-        print(f"📂 Repository: {args.repo}")
+        banner.append(f"📂 Repository: {args.repo}")
         if args.source_branch:
-            print(f"🌿 Source Branch: {args.source_branch}")
+            banner.append(f"🌿 Source Branch: {args.source_branch}")
         if args.verbose:
             vlogger.debug(f"Repository URL: {args.repo}")
             if args.source_branch:
                 vlogger.debug(f"Source branch: {args.source_branch}")
     else:
-        print(f"📁 Directory: {args.dir}")
+        banner.append(f"📁 Directory: {args.dir}")
         if args.verbose:
             vlogger.debug(f"Local directory: {args.dir}")
     
-    print(f"📤 Output: {args.output}")
+    banner.append(f"📤 Output: {args.output}")
     if args.verbose:
         vlogger.debug(f"Output directory: {args.output}")
     
     # Performance settings summary
-    print(f"\n⚡ Performance Settings:")
-    print(f"   Parallel Processing: {'✅' if args.parallel else '❌'}")
-    print(f"   Max Workers: {args.max_workers}")
-    print(f"   Batch Size: {args.batch_size}")
-    print(f"   Max Files: {args.max_files or 'Unlimited'}")
-    print(f"   Optimizations: {'✅' if not args.disable_optimization else '❌'}")
-    print(f"   Performance Monitoring: {'✅' if not args.disable_performance_monitoring else '❌'}")
-    print(f"   Verbose Logging: {'✅' if args.verbose else '❌'}")
+    banner.extend([
+        "\n⚡ Performance Settings:",
+        f"   Parallel Processing: {'✅' if args.parallel else '❌'}",
+        f"   Max Workers: {args.max_workers}",
+        f"   Batch Size: {args.batch_size}",
+        f"   Max Files: {args.max_files or 'Unlimited'}",
+        f"   Optimizations: {'✅' if not args.disable_optimization else '❌'}",
+        f"   Performance Monitoring: {'✅' if not args.disable_performance_monitoring else '❌'}",
+        f"   Verbose Logging: {'✅' if args.verbose else '❌'}",
+    ])
     
     # Analysis settings
-    print(f"\n🔍 Analysis Settings:")
-    print(f"   Apply Changes: {'✅' if args.apply_changes else '❌'}")
-    print(f"   Git Integration: {'✅' if args.git_integration else '❌'}")
-    print(f"   LLM Caching: {'✅' if not args.no_cache else '❌'}")
-    print(f"   Analysis Mode: {'Quick' if args.quick_analysis else 'Detailed'}")
+    banner.extend([
+        "\n🔍 Analysis Settings:",
+        f"   Apply Changes: {'✅' if args.apply_changes else '❌'}",
+        f"   Git Integration: {'✅' if args.git_integration else '❌'}",
+        f"   LLM Caching: {'✅' if not args.no_cache else '❌'}",
+        f"   Analysis Mode: {'Quick' if args.quick_analysis else 'Detailed'}",
+    ])
+    print("\n".join(banner))
     
     if args.verbose:
         vlogger.subsection_header("Configuration Summary")
@@ -354,14 +382,18 @@ Examples:
             vlogger.step("Creating shared state configuration")
         shared = create_shared_state(args)
         
+        # Fetched after create_shared_state, which installs the run's monitor
+        monitor = get_performance_monitor()
+        
         # Create and run the migration flow
         print("🎯 Starting Spring migration analysis...")
         if args.verbose:
             vlogger.step("Initializing migration flow")
+        # Imported lazily: pulls in the whole node pipeline and LLM clients
+        from flow import create_spring_migration_flow
         flow = create_spring_migration_flow()
         
         # Start performance monitoring
-        monitor = get_performance_monitor()
         monitor.start_operation("complete_migration_analysis")
         
         if args.verbose:
@@ -379,10 +411,10 @@ Examples:
             
             # Print final output location
             output_dir = shared.get("final_output_dir", args.output)
-            print(f"\n📋 Reports saved to: {output_dir}")
-            print(f"   📄 Detailed analysis: {shared['project_name']}_spring_migration_report.json")
-            print(f"   📋 Summary: {shared['project_name']}_migration_summary.md")
-            print(f"   📊 Performance: {shared['project_name']}_performance_report.json")
+            print(f"\n📋 Reports saved to: {output_dir}\n"
+                  f"   📄 Detailed analysis: {shared['project_name']}_spring_migration_report.json\n"
+                  f"   📋 Summary: {shared['project_name']}_migration_summary.md\n"
+                  f"   📊 Performance: {shared['project_name']}_performance_report.json")
             
             if args.verbose:
                 vlogger.debug(f"Reports saved to: {output_dir}")
@@ -399,10 +431,10 @@ Examples:
                     skipped = len(applied.get("skipped", []))
                     failed = len(applied.get("failed", []))
                     
-                    print(f"\n🔧 Change Application Summary:")
-                    print(f"   ✅ Applied: {successful}")
-                    print(f"   ⏭️  Skipped: {skipped}")
-                    print(f"   ❌ Failed: {failed}")
+                    print(f"\n🔧 Change Application Summary:\n"
+                          f"   ✅ Applied: {successful}\n"
+                          f"   ⏭️  Skipped: {skipped}\n"
+                          f"   ❌ Failed: {failed}")
                     
                     if args.verbose:
                         vlogger.subsection_header("Change Application Results")
@@ -430,38 +462,26 @@ Examples:
                 # Print final performance summary
                 if not args.disable_performance_monitoring:
                     perf_summary = monitor.get_performance_summary()
-                    print(f"\n📊 Final Performance Summary:")
-                    print(f"   ⏱️  Total Time: {perf_summary['overall_duration']:.1f} seconds")
-                    print(f"   📁 Files Processed: {perf_summary['total_files_processed']}")
-                    print(f"   🤖 LLM Calls: {perf_summary['total_llm_calls']}")
-                    print(f"   💾 Peak Memory: {perf_summary['peak_memory_mb']:.1f} MB")
-                    print(f"   🚀 Processing Rate: {perf_summary['files_per_second']:.1f} files/sec")
-                    
-                    if args.verbose:
-                        vlogger.subsection_header("Final Performance Metrics")
-                        vlogger.performance_metric("Total duration", perf_summary['overall_duration'], "seconds")
-                        vlogger.performance_metric("Files processed", perf_summary['total_files_processed'])
-                        vlogger.performance_metric("LLM calls", perf_summary['total_llm_calls'])
-                        vlogger.performance_metric("Peak memory", perf_summary['peak_memory_mb'], "MB")
-                        vlogger.performance_metric("Processing rate", perf_summary['files_per_second'], "files/sec")
+                    print(f"\n📊 Final Performance Summary:\n"
+                          f"   ⏱️  Total Time: {perf_summary['overall_duration']:.1f} seconds\n"
+                          f"   📁 Files Processed: {perf_summary['total_files_processed']}\n"
+                          f"   🤖 LLM Calls: {perf_summary['total_llm_calls']}\n"
+                          f"   💾 Peak Memory: {perf_summary['peak_memory_mb']:.1f} MB\n"
+                          f"   🚀 Processing Rate: {perf_summary['files_per_second']:.1f} files/sec")
                     
                     # Show optimization recommendations
                     optimizations = perf_summary.get('optimization_recommendations', [])
+                    
+                    # Verbose metrics and recommendations go out as one block
+                    if args.verbose:
+                        vlogger.emit_summary_block(perf_summary, optimizations)
+                    
                     if optimizations:
-                        print(f"\n💡 Performance Optimization Recommendations:")
-                        for opt in optimizations[:3]:  # Show top 3
-                            print(f"   {opt}")
-                        
-                        if args.verbose:
-                            vlogger.subsection_header("Optimization Recommendations")
-                            for i, opt in enumerate(optimizations):
-                                vlogger.optimization_applied(f"Recommendation {i+1}", opt)
-                        
+                        lines = ["\n💡 Performance Optimization Recommendations:"]
+                        lines.extend(f"   {opt}" for opt in optimizations[:3])  # Show top 3
                         if len(optimizations) > 3:
-                            print(f"   ... and {len(optimizations) - 3} more (see performance report)")
-                
-                # Stop monitoring
-                monitor.stop_monitoring()
+                            lines.append(f"   ... and {len(optimizations) - 3} more (see performance report)")
+                        print("\n".join(lines))
                 
                 # Show verbose summary
                 if args.verbose:
@@ -471,18 +491,11 @@ Examples:
                 print(f"Warning: Error during cleanup: {cleanup_error}")
                 if args.verbose:
                     vlogger.warning(f"Cleanup error: {cleanup_error}")
-                # Still try to stop monitoring
-                try:
-                    monitor.stop_monitoring()
-                except:
-                    pass
             
     except KeyboardInterrupt:
         print("\n⏹️ Analysis interrupted by user")
         if args.verbose:
             vlogger.warning("Analysis interrupted by user (Ctrl+C)")
-        monitor = get_performance_monitor()
-        monitor.stop_monitoring()
         sys.exit(1)
     
     except Exception as e:
@@ -493,14 +506,15 @@ Examples:
             vlogger.error("Analysis failed", e)
             vlogger.show_summary()
         
-        # Still try to stop monitoring gracefully
+        sys.exit(1)
+    
+    finally:
+        # Single cleanup point for every exit path (success, error, Ctrl+C);
+        # looked up here since the monitor may not have been fetched yet
         try:
-            monitor = get_performance_monitor()
-            monitor.stop_monitoring()
-        except:
+            get_performance_monitor().stop_monitoring()
+        except Exception:
             pass
-        
-        sys.exit(1)
 
 
 if __name__ == "__main__":
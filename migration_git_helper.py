@@ -10,13 +10,85 @@ import os
 import sys
 import subprocess
 import json
+import re
 import shutil
+import atexit
+import functools
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
+# Readline history for the interactive menu
+HISTORY_FILE = os.path.expanduser("~/.migraite_history")
+
+# Change-type flags used to classify staged files for commit messages
+CHANGE_JAVA, CHANGE_POM, CHANGE_GRADLE, CHANGE_CONFIG = 1, 2, 4, 8
+
+# Change-type markers in a NUL-joined file list; suffixes must end a name, pom.xml may appear anywhere
+CHANGE_TYPE_RE = re.compile(
+    r'(?P<java>\.java)(?=\0|\Z)'
+    r'|(?P<pom>pom\.xml)'
+    r'|(?P<gradle>\.gradle(?:\.kts)?)(?=\0|\Z)'
+    r'|(?P<config>\.(?:properties|ya?ml))(?=\0|\Z)'
+)
+CHANGE_TYPE_FLAGS = {"java": CHANGE_JAVA, "pom": CHANGE_POM, "gradle": CHANGE_GRADLE, "config": CHANGE_CONFIG}
+
+# Abbreviated hash in git commit's summary line, e.g. "[main (root-commit) 1a2b3c4] message"
+COMMIT_SUMMARY_RE = re.compile(r'^\[[^\]]*?\b([0-9a-f]{7,40})\]', re.MULTILINE)
+
+
+def _newest_dir(directory, name_matches):
+    """
+    Return the most recently modified subdirectory whose name satisfies
+    name_matches, or None. The name is checked first and scandir entries
+    carry their file type, so only matching candidates cost a stat call.
+    Symlinked directories are followed, so a linked workspace is still found.
+    """
+    with os.scandir(directory) as entries:
+        candidates = [
+            (entry.stat().st_mtime, entry.path) for entry in entries
+            if name_matches(entry.name) and entry.is_dir()
+        ]
+    
+    # max() picks the newest without sorting every candidate
+    return Path(max(candidates)[1]) if candidates else None
+
+
+@functools.cache
+def _line_change_viewer_cls():
+    """Import LineChangeViewer on first use, extending sys.path only once."""
+    sys.path.insert(0, str(Path(__file__).parent))
+    from view_line_changes import LineChangeViewer
+    return LineChangeViewer
+
+
 class MigrationGitHelper:
-    def __init__(self, migration_workspace_path=None):
-        """Initialize the git helper."""
+    DEFAULT_MAX_DIFF_LINES = 2000
+    QUIT_CHOICES = ('q', 'quit', 'exit')
+    HELP_CHOICES = ('?', 'h', 'help', '')
+    MENU = "\n".join([
+        "\n📋 Available actions:",
+        "1. [s] Show status",
+        "2. [r] Review changes",
+        "3. [l] Show line-by-line analysis",
+        "4. [a] Stage all changes",
+        "5. [c] Commit changes",
+        "6. [p] Create patch file",
+        "7. [compare] Compare git diff vs analysis",
+        "8. [export] Export line changes report",
+        "9. [branch] Create migration branch",
+        "",
+        "Advanced:",
+        "- [copy] Copy changes to original project",
+        "- [log] Show commit history",
+        "- [q] Quit",
+    ])
+    ACTION_NAMES = ('status', 'review', 'line', 'stage', 'add', 'commit', 'patch', 'compare',
+                    'export', 'branch', 'copy', 'log', 'help', 'quit', 'exit')
+    
+    def __init__(self, migration_workspace_path=None, max_diff_lines=DEFAULT_MAX_DIFF_LINES):
+        """Initialize the git helper. max_diff_lines=None prints diffs in full."""
         if migration_workspace_path:
             self.workspace = Path(migration_workspace_path)
         else:
@@ -26,81 +98,153 @@ class MigrationGitHelper:
         if not self.workspace or not self.workspace.exists():
             raise ValueError("Migration workspace not found. Please specify the path.")
         
+        self.max_diff_lines = max_diff_lines
+        self._actions = self._build_actions()
+        
+        # Output of index-only git queries, keyed by argv: {args: (stamp, result)}
+        self._diff_cache = {}
+        # Analysis directory found by the first successful lookup
+        self._analysis_dir = None
+        
         print(f"🏠 Using migration workspace: {self.workspace}")
     
+    def _index_stamp(self):
+        """Cheap fingerprint of the staged state: index mtime plus HEAD commit."""
+        try:
+            index_mtime = os.stat(self.workspace / ".git" / "index").st_mtime_ns
+        except OSError:
+            index_mtime = None
+        head = subprocess.run(["git", "rev-parse", "--verify", "-q", "HEAD"],
+                              capture_output=True, cwd=self.workspace)
+        return index_mtime, head.stdout.strip() if head.returncode == 0 else None
+    
+    def _cached_git(self, *args):
+        """
+        Run a git command whose output depends only on the index and HEAD
+        (e.g. ``diff --cached``), reusing the previous result while neither
+        has changed. Working-tree queries must not go through this cache.
+        Output is returned as bytes; decode only what is needed.
+        """
+        return self._cached_on_index(
+            args, lambda: subprocess.run(["git", *args], cwd=self.workspace, capture_output=True)
+        )
+    
+    def _cached_on_index(self, key, compute):
+        """Return compute()'s result, reusing it while the index and HEAD are unchanged."""
+        stamp = self._index_stamp()
+        cached = self._diff_cache.get(key)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        
+        result = compute()
+        self._diff_cache[key] = (stamp, result)
+        return result
+    
+    def _invalidate_git_cache(self):
+        """Drop cached index queries after an operation that changes the index or HEAD."""
+        self._diff_cache.clear()
+    
     def _find_migration_workspace(self):
         """Auto-detect the most recent migration workspace."""
-        current_dir = Path.cwd()
-        
         # Look for directories ending with _migration_<timestamp>
-        migration_dirs = []
-        for item in current_dir.iterdir():
-            if item.is_dir() and "_migration_" in item.name:
-                migration_dirs.append(item)
-        
-        if migration_dirs:
-            # Return the most recent one
-            migration_dirs.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-            return migration_dirs[0]
-        
-        return None
+        return _newest_dir(Path.cwd(), lambda name: "_migration_" in name)
     
     def show_status(self):
         """Show current git status and change summary."""
         print("\n📊 Git Status")
         print("=" * 50)
         
-        os.chdir(self.workspace)
+        # Porcelain output is stable across git versions and configs. The untracked
+        # cache lets git skip rescanning directories whose mtime has not changed.
+        # Output stays bytes: it is classified by status column and decoded
+        # only to be printed
+        result = subprocess.run(
+            ["git", "-c", "core.untrackedCache=true", "status", "--porcelain"],
+            capture_output=True, cwd=self.workspace
+        )
         
         # Show git status
-        result = subprocess.run(["git", "status", "--short"], capture_output=True, text=True)
-        if result.returncode == 0:
-            if result.stdout.strip():
-                print("Modified files:")
-                print(result.stdout)
-            else:
-                print("✅ No changes detected")
-        
-        # Show change statistics
-        diff_result = subprocess.run(["git", "diff", "--stat"], capture_output=True, text=True)
-        if diff_result.returncode == 0 and diff_result.stdout.strip():
-            print("\n📈 Change Summary:")
-            print(diff_result.stdout)
+        if result.returncode != 0:
+            print(f"❌ Error getting git status: {result.stderr.decode(errors='replace').strip()}")
+            return
+        if not result.stdout:
+            print("✅ No changes detected")
+            return
+        print("Modified files:")
+        print(result.stdout.decode("utf-8", errors="replace"))
+        
+        # git diff --stat only covers unstaged edits to tracked files (the
+        # second status column), so skip it when status shows none
+        if not any(line[1:2] not in (b" ", b"?", b"") for line in result.stdout.split(b"\n")):
+            return
+        
+        # Show change statistics, streamed and clamped to a fixed width
+        # instead of being captured whole
+        print("\n📈 Change Summary:")
+        self._print_git_output("diff", "--stat=80,40")
     
     def review_changes(self, file_path=None):
         """Review changes in detail."""
-        os.chdir(self.workspace)
-        
         if file_path:
             print(f"\n📖 Reviewing changes in: {file_path}")
             print("=" * 60)
-            subprocess.run(["git", "diff", file_path])
+            self._page_git_output("diff", "--", file_path)
         else:
             print("\n📖 Reviewing all changes")
             print("=" * 40)
             
             # Show file list first
-            result = subprocess.run(["git", "diff", "--name-status"], capture_output=True, text=True)
-            if result.returncode == 0 and result.stdout.strip():
+            result = subprocess.run(["git", "diff", "--name-status"], capture_output=True, encoding="utf-8", errors="replace", cwd=self.workspace)
+            if result.returncode == 0 and result.stdout:
                 print("Changed files:")
                 print(result.stdout)
                 
                 response = input("\n🤔 Show detailed diff for all files? [y/N]: ")
                 if response.lower() in ['y', 'yes']:
-                    subprocess.run(["git", "diff"])
+                    self._page_git_output("diff")
             else:
                 print("No changes to review")
     
+    def _page_git_output(self, *args):
+        """Show git output through git's pager on a terminal, otherwise print it capped."""
+        if sys.stdout.isatty():
+            # The pager reads straight from git, so the output is neither
+            # passed through Python nor truncated
+            subprocess.run(["git", "--paginate", *args], cwd=self.workspace)
+        else:
+            self._print_git_output(*args)
+    
+    def _print_git_output(self, *args):
+        """Stream git output to the terminal, stopping after max_diff_lines lines. Returns lines printed."""
+        proc = subprocess.Popen(
+            ["git", "--no-pager", *args],
+            stdout=subprocess.PIPE, encoding="utf-8", errors="replace", cwd=self.workspace
+        )
+        printed = 0
+        try:
+            for line in proc.stdout:
+                if self.max_diff_lines is not None and printed >= self.max_diff_lines:
+                    proc.kill()
+                    print(f"... output truncated after {self.max_diff_lines} lines; "
+                          f"create a patch file or use --full to see everything")
+                    break
+                sys.stdout.write(line)
+                printed += 1
+        finally:
+            proc.stdout.close()
+            proc.wait()
+        return printed
+    
     def stage_changes(self, file_path=None):
         """Stage changes for commit."""
-        os.chdir(self.workspace)
-        
         if file_path:
             print(f"📦 Staging file: {file_path}")
-            result = subprocess.run(["git", "add", file_path], capture_output=True, text=True)
+            result = subprocess.run(["git", "add", "--", file_path], capture_output=True, encoding="utf-8", errors="replace", cwd=self.workspace)
         else:
             print("📦 Staging all changes...")
-            result = subprocess.run(["git", "add", "."], capture_output=True, text=True)
+            result = subprocess.run(["git", "add", "."], capture_output=True, encoding="utf-8", errors="replace", cwd=self.workspace)
+        
+        self._invalidate_git_cache()
         
         if result.returncode == 0:
             print("✅ Changes staged successfully")
@@ -109,11 +253,8 @@ class MigrationGitHelper:
     
     def commit_changes(self, message=None):
         """Commit staged changes."""
-        os.chdir(self.workspace)
-        
         # Check if there are staged changes
-        result = subprocess.run(["git", "diff", "--cached", "--quiet"], capture_output=True)
-        if result.returncode == 0:
+        if not self._staged_files():
             print("❌ No staged changes to commit")
             return False
         
@@ -121,67 +262,101 @@ class MigrationGitHelper:
             # Generate a default commit message
             message = self._generate_commit_message()
         
-        print(f"💾 Committing changes with message: {message[:50]}...")
+        return self._run_commit(message)
+    
+    def stage_and_commit(self, message=None):
+        """Stage all changes and commit them with as few git processes as possible."""
+        print("📦 Staging all changes...")
+        
+        result = subprocess.run(["git", "add", "-A"], capture_output=True, encoding="utf-8", errors="replace", cwd=self.workspace)
+        self._invalidate_git_cache()
+        if result.returncode != 0:
+            print(f"❌ Error staging changes: {result.stderr}")
+            return False
         
+        if message:
+            # git diff --quiet exits 0 when nothing is staged and 1 when something is
+            result = subprocess.run(["git", "diff", "--cached", "--quiet"], capture_output=True, encoding="utf-8", errors="replace", cwd=self.workspace)
+            if result.returncode == 0:
+                print("❌ No staged changes to commit")
+                return False
+            if result.returncode != 1:
+                print(f"❌ Error checking staged changes: {result.stderr}")
+                return False
+        else:
+            # The staged file list is needed for the message anyway
+            staged_listing = self._staged_listing()
+            if not staged_listing:
+                print("❌ No staged changes to commit")
+                return False
+            message = self._generate_commit_message(staged_listing)
+        
+        return self._run_commit(message)
+    
+    def _run_commit(self, message):
+        """Run a commit command that reads the message from stdin and report the new commit."""
+        subject = message.partition("\n")[0]
+        print(f"💾 Committing changes with message: {subject}")
+        
+        # The message goes through stdin, so its length is not limited by argv
         result = subprocess.run(
-            ["git", "commit", "-m", message], 
-            capture_output=True, text=True
+            ["git", "commit", "-F", "-"], input=message,
+            capture_output=True, encoding="utf-8", errors="replace", cwd=self.workspace
         )
+        self._invalidate_git_cache()
         
         if result.returncode == 0:
             print("✅ Changes committed successfully!")
             
-            # Show commit hash
-            hash_result = subprocess.run(
-                ["git", "rev-parse", "HEAD"], 
-                capture_output=True, text=True
-            )
-            if hash_result.returncode == 0:
-                commit_hash = hash_result.stdout.strip()
-                print(f"   Commit hash: {commit_hash[:8]}")
+            # Show commit hash from git's own summary line
+            match = COMMIT_SUMMARY_RE.search(result.stdout)
+            if match:
+                print(f"   Commit hash: {match.group(1)}")
             
             return True
         else:
             print(f"❌ Error committing changes: {result.stderr}")
             return False
     
-    def _generate_commit_message(self):
-        """Generate a smart commit message based on changes."""
-        os.chdir(self.workspace)
-        
-        # Get change statistics
-        stat_result = subprocess.run(
-            ["git", "diff", "--cached", "--stat"], 
-            capture_output=True, text=True
-        )
-        
-        # Get list of changed files
-        files_result = subprocess.run(
-            ["git", "diff", "--cached", "--name-only"], 
-            capture_output=True, text=True
-        )
-        
-        changed_files = files_result.stdout.strip().split('\n') if files_result.stdout.strip() else []
+    def _staged_listing(self):
+        """
+        Staged file paths as one NUL-terminated string. commit_changes,
+        _generate_commit_message and create_patch all share this one cached query.
+        """
+        # NUL-separated so any file name round-trips
+        return os.fsdecode(self._cached_git("diff", "--cached", "-z", "--name-only").stdout)
+    
+    def _staged_files(self):
+        """List staged file paths."""
+        return self._staged_listing().split("\0")[:-1]
+    
+    def _generate_commit_message(self, staged_listing=None):
+        """Generate a smart commit message from a NUL-terminated list of changed files."""
+        if staged_listing is None:
+            # Repeated commit attempts on an unchanged index reuse the message
+            return self._cached_on_index(
+                ("commit-message",), lambda: self._generate_commit_message(self._staged_listing())
+            )
         
-        # Analyze change types
-        has_java_files = any(f.endswith('.java') for f in changed_files)
-        has_pom_files = any('pom.xml' in f for f in changed_files)
-        has_gradle_files = any(f.endswith(('.gradle', '.gradle.kts')) for f in changed_files)
-        has_config_files = any(f.endswith(('.properties', '.yml', '.yaml')) for f in changed_files)
+        # Analyze change types with one regex scan over the raw listing; no per-file list is built
+        change_flags = 0
+        for match in CHANGE_TYPE_RE.finditer(staged_listing):
+            change_flags |= CHANGE_TYPE_FLAGS[match.lastgroup]
+        file_count = staged_listing.count("\0")
         
         # Generate message based on file types
         message_parts = ["Spring 5 to 6 migration - Automated changes", ""]
         
-        if has_java_files:
+        if change_flags & CHANGE_JAVA:
             message_parts.append("- Updated Java source files (javax → jakarta)")
-        if has_pom_files or has_gradle_files:
+        if change_flags & (CHANGE_POM | CHANGE_GRADLE):
             message_parts.append("- Updated build files and dependencies")
-        if has_config_files:
+        if change_flags & CHANGE_CONFIG:
             message_parts.append("- Updated configuration files")
         
         message_parts.extend([
             "",
-            f"📊 Files changed: {len(changed_files)}",
+            f"📊 Files changed: {file_count}",
             "🤖 Generated by Spring Migration Tool"
         ])
         
@@ -189,35 +364,40 @@ class MigrationGitHelper:
     
     def create_patch(self, patch_file="migration.patch"):
         """Create a patch file of all changes."""
-        os.chdir(self.workspace)
-        
         print(f"📋 Creating patch file: {patch_file}")
         
-        with open(patch_file, 'w') as f:
-            # Write staged changes if any, otherwise unstaged changes
-            staged_result = subprocess.run(
-                ["git", "diff", "--cached"], 
-                capture_output=True, text=True
-            )
-            
-            if staged_result.stdout.strip():
-                f.write("# Staged Changes\n")
-                f.write(staged_result.stdout)
-                f.write("\n\n")
+        # Relative patch names are created inside the workspace
+        with open(self.workspace / patch_file, 'wb') as f:
+            # Write staged changes if any
+            if self._write_git_section(f, b"# Staged Changes\n", "diff", "--cached"):
+                f.write(b"\n\n")
             
             # Write unstaged changes
-            unstaged_result = subprocess.run(
-                ["git", "diff"], 
-                capture_output=True, text=True
-            )
-            
-            if unstaged_result.stdout.strip():
-                f.write("# Unstaged Changes\n")
-                f.write(unstaged_result.stdout)
+            self._write_git_section(f, b"# Unstaged Changes\n", "diff")
         
         print(f"✅ Patch file created: {patch_file}")
         return patch_file
     
+    def _write_git_section(self, f, header, *args):
+        """
+        Write a header followed by git's output into a patch file. Rather than
+        probing for changes with a separate git call, the header is dropped
+        again if git wrote nothing. Returns True if the section was kept.
+        """
+        header_end = f.tell() + len(header)
+        f.write(header)
+        self._stream_git_to_file(f, *args)
+        if f.seek(0, os.SEEK_END) == header_end:
+            f.seek(header_end - len(header))
+            f.truncate()
+            return False
+        return True
+    
+    def _stream_git_to_file(self, f, *args):
+        """Let git write its output straight into an open binary file."""
+        f.flush()  # Keep our own header bytes ahead of git's output
+        subprocess.Popen(["git", *args], cwd=self.workspace, stdout=f).wait()
+    
     def copy_to_original_project(self, original_project_path, dry_run=False):
         """Copy migration changes back to the original project."""
         original_path = Path(original_project_path)
@@ -231,146 +411,264 @@ class MigrationGitHelper:
         if dry_run:
             print("🧪 DRY RUN - No files will be copied")
         
-        os.chdir(self.workspace)
-        
-        # Get list of changed files
-        result = subprocess.run(
-            ["git", "diff", "--name-only", "HEAD~1"], 
-            capture_output=True, text=True
+        # Get list of changed files, NUL-separated so names with spaces or newlines survive
+        proc = subprocess.Popen(
+            ["git", "diff", "-z", "--name-only", "HEAD~1"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, cwd=self.workspace
         )
+        output = proc.stdout.read()
+        proc.stdout.close()
         
-        if result.returncode != 0:
+        if proc.wait() != 0:
             print("❌ Error getting changed files")
             return False
         
-        changed_files = result.stdout.strip().split('\n') if result.stdout.strip() else []
+        changed_files = [os.fsdecode(name) for name in output.split(b'\0') if name]
         
         if not changed_files:
             print("❌ No changed files to copy")
             return False
         
-        copied_count = 0
         skipped_count = 0
+        copy_files = []
         
         for file_path in changed_files:
-            if not file_path:  # Skip empty lines
-                continue
-                
-            source_file = self.workspace / file_path
-            target_file = original_path / file_path
-            
-            if not source_file.exists():
+            if not (self.workspace / file_path).exists():
                 print(f"   ⚠️  Source file not found: {file_path}")
                 skipped_count += 1
                 continue
             
-            # Create target directory if needed
-            target_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            if dry_run:
+            copy_files.append(file_path)
+        
+        if dry_run:
+            for file_path in copy_files:
                 print(f"   📄 Would copy: {file_path}")
-            else:
-                try:
-                    shutil.copy2(source_file, target_file)
-                    print(f"   ✅ Copied: {file_path}")
-                    copied_count += 1
-                except Exception as e:
-                    print(f"   ❌ Error copying {file_path}: {e}")
-                    skipped_count += 1
+            return False
+        
+        # One tar pipeline copies the whole batch; fall back to per-file copies
+        if self._copy_files_batch(copy_files, original_path):
+            copied_count = len(copy_files)
+        else:
+            copied_count, failed_count = self._copy_files_individually(copy_files, original_path)
+            skipped_count += failed_count
         
-        if not dry_run:
-            print(f"\n📊 Copy Summary:")
-            print(f"   ✅ Copied: {copied_count} files")
-            if skipped_count > 0:
-                print(f"   ⚠️  Skipped: {skipped_count} files")
+        print(f"\n📊 Copy Summary:")
+        print(f"   ✅ Copied: {copied_count} files")
+        if skipped_count > 0:
+            print(f"   ⚠️  Skipped: {skipped_count} files")
         
         return copied_count > 0
     
+    def _copy_files_batch(self, file_paths, original_path):
+        """Copy all files through one tar | tar pipeline. Returns False if tar is unavailable or fails."""
+        if not file_paths or not shutil.which("tar"):
+            return False
+        
+        with tempfile.TemporaryFile() as pack_errors:
+            # Pack in the workspace and unpack in the target, one process per side;
+            # the unpacking tar creates missing parent directories itself
+            pack = subprocess.Popen(
+                ["tar", "-cf", "-", "--null", "-T", "-"],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=pack_errors, cwd=self.workspace
+            )
+            unpack = subprocess.Popen(
+                ["tar", "-xf", "-", "-C", str(original_path)],
+                stdin=pack.stdout, stderr=subprocess.PIPE
+            )
+            pack.stdout.close()  # Only the unpacking tar reads the archive
+            
+            # A "./" prefix keeps names starting with "-" from being read as options
+            pack.stdin.write(b"\0".join(b"./" + os.fsencode(path) for path in file_paths))
+            pack.stdin.close()
+            
+            _, unpack_stderr = unpack.communicate()
+            if pack.wait() != 0 or unpack.returncode != 0:
+                pack_errors.seek(0)
+                errors = (pack_errors.read() + unpack_stderr).decode(errors='replace').strip()
+                print(f"   ⚠️  tar copy failed, copying files individually: {errors}")
+                return False
+        return True
+    
+    def _copy_files_individually(self, file_paths, original_path):
+        """Copy files one at a time. Returns (copied_count, failed_count)."""
+        copied_count = 0
+        failed_count = 0
+        
+        # Create each distinct target directory once instead of once per file;
+        # a directory that cannot be created shows up as a copy error below
+        for parent in {(original_path / file_path).parent for file_path in file_paths}:
+            try:
+                parent.mkdir(parents=True, exist_ok=True)
+            except OSError:
+                pass
+        
+        def copy_file(file_path):
+            try:
+                # copyfile skips copystat and uses the kernel fast path (sendfile) on Linux
+                shutil.copyfile(self.workspace / file_path, original_path / file_path)
+                return None
+            except Exception as e:
+                return e
+        
+        # Copies are I/O bound, so threads keep several in flight at once
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as executor:
+            for file_path, error in zip(file_paths, executor.map(copy_file, file_paths)):
+                if error is None:
+                    copied_count += 1
+                else:
+                    print(f"   ❌ Error copying {file_path}: {error}")
+                    failed_count += 1
+        
+        return copied_count, failed_count
+    
     def interactive_workflow(self):
         """Interactive git workflow for migration changes."""
         print("\n🎯 Spring Migration Git Helper")
         print("=" * 40)
         print(f"Working with: {self.workspace.name}")
         
+        if sys.stdin.isatty():
+            self._enable_action_completion()
+        
+        try:
+            self._interactive_loop()
+        except EOFError:
+            # Piped or scripted input ran out
+            print("\n👋 Goodbye!")
+    
+    def _enable_action_completion(self):
+        """Install tab completion and history for menu actions when readline is available."""
+        try:
+            import readline
+        except ImportError:
+            return
+        
+        readline.set_completer(self._complete_action)
+        readline.parse_and_bind("tab: complete")
+        
+        # Keep choices and answers across sessions for up-arrow and ^R recall
+        readline.set_history_length(200)
+        try:
+            readline.read_history_file(HISTORY_FILE)
+        except OSError:
+            pass  # First run, or history not readable
+        atexit.register(self._save_history, readline)
+    
+    @staticmethod
+    def _save_history(readline):
+        """Write the readline history file, ignoring an unwritable home directory."""
+        try:
+            readline.write_history_file(HISTORY_FILE)
+        except OSError:
+            pass
+    
+    def _complete_action(self, text, state):
+        """readline completer returning the state-th action name starting with text."""
+        matches = [action for action in self.ACTION_NAMES if action.startswith(text.lower())]
+        return matches[state] if state < len(matches) else None
+    
+    def _interactive_loop(self):
+        """Prompt for actions until the user quits."""
+        # The menu is shown once and then only on request or after an invalid choice
+        show_menu = True
         while True:
-            print("\n📋 Available actions:")
-            print("1. [s] Show status")
-            print("2. [r] Review changes")
-            print("3. [l] Show line-by-line analysis")
-            print("4. [a] Stage all changes")
-            print("5. [c] Commit changes")
-            print("6. [p] Create patch file")
-            print("7. [compare] Compare git diff vs analysis")
-            print("8. [export] Export line changes report")
-            print("9. [branch] Create migration branch")
-            print("")
-            print("Advanced:")
-            print("- [copy] Copy changes to original project")
-            print("- [log] Show commit history")
-            print("- [q] Quit")
-            
-            choice = input("\n🤔 Choose an action: ").strip().lower()
-            
-            if choice in ['1', 's', 'status']:
-                self.show_status()
-            
-            elif choice in ['2', 'r', 'review']:
-                file_path = input("📄 Specific file (or Enter for all): ").strip()
-                self.review_changes(file_path if file_path else None)
-            
-            elif choice in ['3', 'l', 'line']:
-                file_path = input("📄 Specific file (or Enter for summary): ").strip()
-                if file_path:
-                    self.show_file_line_changes(file_path)
-                else:
-                    self.show_line_by_line_changes()
-            
-            elif choice in ['4', 'a', 'stage', 'add']:
-                file_path = input("📄 Specific file (or Enter for all): ").strip()
-                self.stage_changes(file_path if file_path else None)
-            
-            elif choice in ['5', 'c', 'commit']:
-                message = input("💬 Commit message (or press Enter for auto-generated): ").strip()
-                self.commit_changes(message if message else None)
-            
-            elif choice in ['6', 'p', 'patch']:
-                patch_name = input("📋 Patch filename (migration.patch): ").strip()
-                patch_file = self.create_patch(patch_name if patch_name else "migration.patch")
-                print(f"   Patch saved to: {patch_file}")
-            
-            elif choice in ['7', 'compare']:
-                file_path = input("📄 Specific file (or Enter for overview): ").strip()
-                self.compare_with_git_diff(file_path if file_path else None)
-            
-            elif choice in ['8', 'export']:
-                filename = input("📄 Report filename (line_changes_report.md): ").strip()
-                self.export_line_changes_report(filename if filename else "line_changes_report.md")
-            
-            elif choice in ['branch', 'b']:
-                branch_name = input("🌿 Branch name (or Enter for auto-generated): ").strip()
-                self.create_migration_branch(branch_name if branch_name else None)
-            
-            elif choice in ['copy']:
-                original_path = input("📂 Original project path: ").strip()
-                if original_path:
-                    dry_run = input("🧪 Dry run first? [Y/n]: ").strip().lower() != 'n'
-                    if dry_run:
-                        self.copy_to_original_project(original_path, dry_run=True)
-                        if input("   Proceed with actual copy? [y/N]: ").strip().lower() == 'y':
-                            self.copy_to_original_project(original_path, dry_run=False)
-                    else:
-                        self.copy_to_original_project(original_path, dry_run=False)
+            if show_menu:
+                print(self.MENU)
+                show_menu = False
             
-            elif choice in ['log']:
-                os.chdir(self.workspace)
-                subprocess.run(["git", "log", "--oneline", "-10"])
+            choice = input("\n🤔 Choose an action (? for menu): ").strip().lower()
             
-            elif choice in ['9', 'q', 'quit', 'exit']:
+            if choice in self.QUIT_CHOICES:
                 print("👋 Goodbye!")
                 break
             
+            if choice in self.HELP_CHOICES:
+                show_menu = True
+                continue
+            
+            action = self._actions.get(choice)
+            if action:
+                action()
             else:
                 print("❓ Invalid choice. Please try again.")
+                show_menu = True
+    
+    def _build_actions(self):
+        """Map every menu alias to its handler once, so each choice is a single dict lookup."""
+        actions = [
+            (('1', 's', 'status'), self.show_status),
+            (('2', 'r', 'review'), self._review_action),
+            (('3', 'l', 'line'), self._line_changes_action),
+            (('4', 'a', 'stage', 'add'), self._stage_action),
+            (('5', 'c', 'commit'), self._commit_action),
+            (('6', 'p', 'patch'), self._patch_action),
+            (('7', 'compare'), self._compare_action),
+            (('8', 'export'), self._export_action),
+            (('9', 'b', 'branch'), self._branch_action),
+            (('copy',), self._copy_action),
+            (('log',), self._log_action),
+        ]
+        return {alias: handler for aliases, handler in actions for alias in aliases}
+    
+    def _review_action(self):
+        """Prompt for an optional file and review its changes."""
+        file_path = input("📄 Specific file (or Enter for all): ").strip()
+        self.review_changes(file_path if file_path else None)
+    
+    def _line_changes_action(self):
+        """Prompt for an optional file and show its line-by-line changes."""
+        file_path = input("📄 Specific file (or Enter for summary): ").strip()
+        if file_path:
+            self.show_file_line_changes(file_path)
+        else:
+            self.show_line_by_line_changes()
+    
+    def _stage_action(self):
+        """Prompt for an optional file and stage it."""
+        file_path = input("📄 Specific file (or Enter for all): ").strip()
+        self.stage_changes(file_path if file_path else None)
+    
+    def _commit_action(self):
+        """Prompt for an optional message and commit staged changes."""
+        message = input("💬 Commit message (or press Enter for auto-generated): ").strip()
+        self.commit_changes(message if message else None)
+    
+    def _patch_action(self):
+        """Prompt for a patch filename and create the patch."""
+        patch_name = input("📋 Patch filename (migration.patch): ").strip()
+        patch_file = self.create_patch(patch_name if patch_name else "migration.patch")
+        print(f"   Patch saved to: {patch_file}")
+    
+    def _compare_action(self):
+        """Prompt for an optional file and compare git diff with the analysis."""
+        file_path = input("📄 Specific file (or Enter for overview): ").strip()
+        self.compare_with_git_diff(file_path if file_path else None)
+    
+    def _export_action(self):
+        """Prompt for a report filename and export the line changes report."""
+        filename = input("📄 Report filename (line_changes_report.md): ").strip()
+        self.export_line_changes_report(filename if filename else "line_changes_report.md")
+    
+    def _branch_action(self):
+        """Prompt for an optional branch name and create the migration branch."""
+        branch_name = input("🌿 Branch name (or Enter for auto-generated): ").strip()
+        self.create_migration_branch(branch_name if branch_name else None)
+    
+    def _copy_action(self):
+        """Prompt for the original project and copy changes, optionally after a dry run."""
+        original_path = input("📂 Original project path: ").strip()
+        if original_path:
+            dry_run = input("🧪 Dry run first? [Y/n]: ").strip().lower() != 'n'
+            if dry_run:
+                self.copy_to_original_project(original_path, dry_run=True)
+                if input("   Proceed with actual copy? [y/N]: ").strip().lower() == 'y':
+                    self.copy_to_original_project(original_path, dry_run=False)
+            else:
+                self.copy_to_original_project(original_path, dry_run=False)
+    
+    def _log_action(self):
+        """Show the last ten commits."""
+        subprocess.run(["git", "log", "--oneline", "-10"], cwd=self.workspace)
 
     def show_line_by_line_changes(self):
         """Show detailed line-by-line changes from migration analysis."""
@@ -383,10 +681,7 @@ class MigrationGitHelper:
                 return
             
             # Import the line change viewer
-            sys.path.insert(0, str(Path(__file__).parent))
-            from view_line_changes import LineChangeViewer
-            
-            viewer = LineChangeViewer(str(analysis_dir))
+            viewer = _line_change_viewer_cls()(str(analysis_dir))
             line_report = viewer.load_line_change_report()
             viewer.show_summary(line_report)
             
@@ -405,10 +700,7 @@ class MigrationGitHelper:
                 print("❌ Migration analysis directory not found")
                 return
             
-            sys.path.insert(0, str(Path(__file__).parent))
-            from view_line_changes import LineChangeViewer
-            
-            viewer = LineChangeViewer(str(analysis_dir))
+            viewer = _line_change_viewer_cls()(str(analysis_dir))
             line_report = viewer.load_line_change_report()
             viewer.show_file_changes(line_report, file_path)
             
@@ -416,7 +708,13 @@ class MigrationGitHelper:
             print(f"❌ Error showing file changes: {e}")
 
     def _find_analysis_dir(self):
-        """Find the migration analysis directory."""
+        """Find the migration analysis directory, remembering it once found."""
+        if self._analysis_dir is None:
+            self._analysis_dir = self._scan_analysis_dir()
+        return self._analysis_dir
+    
+    def _scan_analysis_dir(self):
+        """Scan the current directory for the migration analysis directory."""
         # Look for migration_analysis in current directory
         current_dir = Path.cwd()
         analysis_dir = current_dir / "migration_analysis"
@@ -424,20 +722,10 @@ class MigrationGitHelper:
             return analysis_dir
         
         # Look for analysis directories in current directory
-        analysis_dirs = [d for d in current_dir.iterdir() 
-                        if d.is_dir() and "migration" in d.name.lower() and "analysis" in d.name.lower()]
-        
-        if analysis_dirs:
-            # Return the most recent one
-            analysis_dirs.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-            return analysis_dirs[0]
-        
-        return None
+        return _newest_dir(current_dir, lambda name: "migration" in name.lower() and "analysis" in name.lower())
 
     def compare_with_git_diff(self, file_path=None):
         """Compare migration changes with git diff for the same file."""
-        os.chdir(self.workspace)
-        
         print(f"\n🔄 Git Diff vs Migration Analysis Comparison")
         print("=" * 60)
         
@@ -446,10 +734,7 @@ class MigrationGitHelper:
             
             # Show git diff first
             print(f"\n🔧 Git Changes:")
-            git_result = subprocess.run(["git", "diff", file_path], capture_output=True, text=True)
-            if git_result.stdout.strip():
-                print(git_result.stdout)
-            else:
+            if not self._print_git_output("diff", "--", file_path):
                 print("No git changes detected")
             
             # Show line-by-line analysis
@@ -458,7 +743,7 @@ class MigrationGitHelper:
         else:
             # Show overview comparison
             print(f"\n🔧 Git Status:")
-            subprocess.run(["git", "status", "--short"])
+            self._print_git_output("status", "--short")
             
             print(f"\n📊 Migration Analysis Summary:")
             self.show_line_by_line_changes()
@@ -471,15 +756,11 @@ class MigrationGitHelper:
                 print("❌ Migration analysis directory not found")
                 return
             
-            sys.path.insert(0, str(Path(__file__).parent))
-            from view_line_changes import LineChangeViewer
-            
-            viewer = LineChangeViewer(str(analysis_dir))
+            viewer = _line_change_viewer_cls()(str(analysis_dir))
             line_report = viewer.load_line_change_report()
             
             # Export to file in the workspace
-            os.chdir(self.workspace)
-            viewer.export_to_file(line_report, output_file)
+            viewer.export_to_file(line_report, self.workspace / output_file)
             
             print(f"✅ Line changes report exported to: {self.workspace / output_file}")
             
@@ -488,37 +769,30 @@ class MigrationGitHelper:
 
     def create_migration_branch(self, branch_name=None):
         """Create a git branch for migration changes with optional custom name."""
-        os.chdir(self.workspace)
-        
-        if not (self.workspace / ".git").exists():
-            print("❌ No git repository found. Initializing...")
-            subprocess.run(["git", "init"], check=True)
-            subprocess.run(["git", "config", "user.name", "Spring Migration Tool"], check=True)
-            subprocess.run(["git", "config", "user.email", "migration-tool@localhost"], check=True)
-            
-            # Add and commit existing files first
-            subprocess.run(["git", "add", "."], check=True)
-            subprocess.run(["git", "commit", "-m", "Initial commit - pre-migration source"], check=True)
-            print("   ✅ Git repository initialized")
-        
         # Generate branch name if not provided
         if not branch_name:
             from datetime import datetime
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             branch_name = f"spring-6-migration-{timestamp}"
         
-        print(f"🌿 Creating migration branch: {branch_name}")
-        
         try:
+            if not (self.workspace / ".git").exists():
+                print("❌ No git repository found. Initializing...")
+                self._init_repository()
+                print("   ✅ Git repository initialized")
+            
+            print(f"🌿 Creating migration branch: {branch_name}")
+            
             # Create and checkout new branch
-            result = subprocess.run(["git", "checkout", "-b", branch_name], capture_output=True, text=True)
+            result = subprocess.run(["git", "checkout", "-b", branch_name], capture_output=True, encoding="utf-8", errors="replace", cwd=self.workspace)
+            self._invalidate_git_cache()
             
             if result.returncode == 0:
                 print(f"✅ Created and switched to branch: {branch_name}")
                 
                 # Show current status
                 print(f"\n📊 Current status:")
-                subprocess.run(["git", "status", "--short"])
+                subprocess.run(["git", "status", "--short"], cwd=self.workspace)
                 
                 print(f"\n💡 Next steps:")
                 print(f"   1. Make your migration changes")
@@ -534,6 +808,22 @@ class MigrationGitHelper:
         except subprocess.CalledProcessError as e:
             print(f"❌ Git command failed: {e}")
             return None
+    
+    def _init_repository(self):
+        """Initialize the workspace repository and commit the existing files."""
+        commands = [
+            ["git", "init", "-q"],
+            ["git", "config", "user.name", "Spring Migration Tool"],
+            ["git", "config", "user.email", "migration-tool@localhost"],
+            # Add and commit existing files first
+            ["git", "add", "."],
+            ["git", "commit", "-q", "-m", "Initial commit - pre-migration source"],
+        ]
+        try:
+            for command in commands:
+                subprocess.run(command, check=True, cwd=self.workspace)
+        finally:
+            self._invalidate_git_cache()
 
 
 def main():
@@ -609,12 +899,17 @@ Examples:
     parser.add_argument(
         "--commit", 
         action="store_true", 
-        help="Commit all staged changes with auto-generated message"
+        help="Stage and commit all changes with auto-generated message"
     )
     parser.add_argument(
         "--patch", 
         help="Create patch file with specified name"
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help=f"Print diffs in full instead of stopping after {MigrationGitHelper.DEFAULT_MAX_DIFF_LINES} lines"
+    )
     parser.add_argument(
         "--branch", "-b",
         help="Specify git branch name for migration (default: auto-generated)"
@@ -623,7 +918,10 @@ Examples:
     args = parser.parse_args()
     
     try:
-        helper = MigrationGitHelper(args.workspace)
+        helper = MigrationGitHelper(
+            args.workspace,
+            max_diff_lines=None if args.full else MigrationGitHelper.DEFAULT_MAX_DIFF_LINES
+        )
         
         # Execute specific action if requested
         if args.status:
@@ -637,8 +935,7 @@ Examples:
         elif args.export_report:
             helper.export_line_changes_report(args.export_report)
         elif args.commit:
-            helper.stage_changes()
-            helper.commit_changes()
+            helper.stage_and_commit()
         elif args.patch:
             helper.create_patch(args.patch)
         elif args.branch:
@@ -1,10 +1,30 @@
+import io
 import os
 import re
+import stat
 import yaml
 import json
+import heapq
+import tarfile
+import subprocess
+import threading
+from datetime import datetime
+from string import Template
+from functools import lru_cache, partial
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from pocketflow import Node, BatchNode
+from tqdm import tqdm
 from utils.crawl_github_files import crawl_github_files
-from utils.call_llm import call_llm, auto_configure_timeouts_for_repository_size, configure_maximum_timeouts
+from utils.call_llm import call_llm, auto_configure_timeouts_for_repository_size, configure_maximum_timeouts, is_fallback_response
+from utils.analysis_cache import (
+    analysis_cache_key,
+    load_cached_analysis,
+    store_cached_analysis,
+    file_content_key,
+    open_structure_cache
+)
 from utils.crawl_local_files import crawl_local_files
 from utils.performance_monitor import (
     get_performance_monitor,
@@ -15,6 +35,82 @@ from utils.verbose_logger import get_verbose_logger
 import xml.etree.ElementTree as ET
 import xml.dom.minidom as minidom
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def json_dumps_indented(value):
+    """Serialize value as 2-space indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass  # Types orjson rejects still get the stdlib's error or output
+    return json.dumps(value, indent=2)
+
+
+def _json_default(value):
+    """Serialize sets (such as files_modified) as sorted lists."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_bytes_indented(value):
+    """Like json_dumps_indented, but return UTF-8 bytes ready to write to a file."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=_json_default, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(value, indent=2, ensure_ascii=False, default=_json_default).encode('utf-8')
+
+
+def json_loads(json_str):
+    """Parse JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(json_str)
+        except orjson.JSONDecodeError:
+            pass  # Input orjson rejects (NaN, lone surrogates) still gets the stdlib's answer
+    return json.loads(json_str)
+
+
+def load_llm_json(json_str, clean):
+    """
+    Parse a JSON document extracted from an LLM response.
+    
+    Well-formed JSON (control characters inside strings allowed) is parsed
+    as-is. The line-based clean() repair only runs when that fails, since it
+    would corrupt values that already contain escaped quotes.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(json_str)
+        except orjson.JSONDecodeError:
+            pass
+    try:
+        return json.loads(json_str, strict=False)
+    except json.JSONDecodeError:
+        return json.loads(clean(json_str))
+
+
+# Appended to a prompt when a node retries, so the retry is a distinct request
+# (with its own LLM cache entry) rather than a replay of the cached answer
+RETRY_JSON_REMINDER = "\n\nReturn ONLY the JSON object, with no prose, markdown or comments."
+
+
+def retry_prompt(prompt, cur_retry):
+    """Return the prompt to send on attempt cur_retry of a node's exec."""
+    return prompt + RETRY_JSON_REMINDER if cur_retry else prompt
+
 
 # Helper to get content for specific file indices
 def get_content_for_indices(files_data, indices):
@@ -28,6 +124,162 @@ def get_content_for_indices(files_data, indices):
     return content_map
 
 
+# Paths that get their content in the analysis context rather than a structure summary
+PRIORITY_PATH_RE = re.compile(
+    "|".join(re.escape(p) for p in ('pom.xml', 'build.gradle', 'application.', 'config',
+                                    'controller', 'service', 'repository', 'security')),
+    re.IGNORECASE
+)
+
+# Spring stereotype annotations worth showing in a structure summary
+SPRING_ANNOTATION_RE = re.compile(r'@(?:Component|Service|Controller|Repository|Configuration|Entity)')
+
+# Whole lines holding an import statement or a Spring stereotype annotation
+IMPORT_LINE_RE = re.compile(r'^[^\S\n]*import[^\n]*', re.MULTILINE)
+SPRING_ANNOTATION_LINE_RE = re.compile(
+    r'^[^\n]*' + SPRING_ANNOTATION_RE.pattern + r'[^\n]*', re.MULTILINE
+)
+
+
+# File types and path fragments that are unlikely to need Spring migration changes
+SKIP_MIGRATION_EXTENSIONS = ('.md', '.txt', '.log', '.json', '.csv', '.sql', '.sh', '.bat', '.png', '.jpg', '.gif')
+SKIP_MIGRATION_PATH_RE = re.compile(
+    "|".join(re.escape(p) for p in ('readme', 'changelog', 'license',
+                                    'docker', 'target/', 'build/', 'node_modules/', '.git/', '.idea/')),
+    re.IGNORECASE
+)
+
+
+# Lines a Java file is reduced to for the LLM: package and import lines,
+# annotations, type declarations and the Spring Security DSL calls that change
+JAVA_STRUCTURE_LINE_RE = re.compile(
+    r'^[^\S\n]*(?:package |import |@\w'
+    r'|(?:(?:public|protected|private|abstract|final|static|sealed)\s+)*(?:class|interface|enum|record)\s+\w)[^\n]*'
+    r'|^[^\n]*\.(?:authorizeRequests|antMatchers|mvcMatchers|regexMatchers|csrf|cors)\([^\n]*',
+    re.MULTILINE
+)
+
+
+# Windows and old Mac line endings, normalized to \n in one pass
+NEWLINE_RE = re.compile(r'\r\n?')
+
+# How much of a file's head is inspected when deciding whether it is text
+TEXT_SAMPLE_SIZE = 8192
+
+
+def lines_end_offset(text, line_count):
+    """Return the offset where the first line_count lines of text end, excluding their last newline."""
+    end = -1
+    for _ in range(line_count):
+        end = text.find('\n', end + 1)
+        if end < 0:
+            return len(text)
+    return end
+
+
+def java_structural_summary(content):
+    """Reduce Java source to the lines that carry migration signal, dropping method bodies."""
+    return '\n'.join(m.group().rstrip() for m in JAVA_STRUCTURE_LINE_RE.finditer(content))
+
+
+def should_skip_migration_file(file_path):
+    """Check if a file is unlikely to need Spring migration changes."""
+    # Check extension
+    if file_path.lower().endswith(SKIP_MIGRATION_EXTENSIONS):
+        return True
+    
+    # Check patterns (using more specific patterns to avoid false positives)
+    if SKIP_MIGRATION_PATH_RE.search(file_path):
+        return True
+    
+    # Skip large non-Java files (properties files with many entries)
+    if file_path.endswith('.properties') and file_path.count('/') > 3:
+        # Skip deeply nested properties files which are likely translations/configs
+        return True
+    
+    return False
+
+
+def build_files_index(files_data):
+    """
+    Classify every crawled path once for the downstream nodes.
+    
+    Returns:
+        dict: "priority" paths whose content goes into the analysis context,
+        "skip" paths the change generator ignores, and the "files" list the
+        index was built from
+    """
+    priority = set()
+    skip = set()
+    for path, _ in files_data:
+        if PRIORITY_PATH_RE.search(path):
+            priority.add(path)
+        if should_skip_migration_file(path):
+            skip.add(path)
+    return {"files": files_data, "priority": priority, "skip": skip}
+
+
+def get_files_index(shared):
+    """Return shared["files_index"], building it if missing or stale for shared["files"]."""
+    files_index = shared.get("files_index")
+    if files_index is None or files_index["files"] is not shared["files"]:
+        files_index = shared["files_index"] = build_files_index(shared["files"])
+    return files_index
+
+
+# A JSON string literal (possibly unterminated) or a single bracket, for nesting scans
+JSON_NESTING_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"?|[{}\[\]]', re.DOTALL)
+JSON_CLOSERS = {'{': '}', '[': ']'}
+
+
+def find_json_span(text):
+    """
+    Return the first balanced {...} object in text, or None if it has no '{'.
+    
+    One linear pass from the first brace; braces inside string literals are
+    skipped. An object still open at the end of text is returned up to the
+    end, so missing_json_closers() can complete it.
+    """
+    start = text.find('{')
+    if start == -1:
+        return None
+    depth = 0
+    for match in JSON_NESTING_TOKEN_RE.finditer(text, start):
+        token = match.group()
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:match.end()]
+    return text[start:]
+
+
+def missing_json_closers(json_text):
+    """Return the brackets that close every still-open object/array in json_text, innermost first."""
+    # One regex pass; brackets inside string literals are skipped along with the string
+    stack = []
+    for token in JSON_NESTING_TOKEN_RE.findall(json_text):
+        closer = JSON_CLOSERS.get(token)
+        if closer:
+            stack.append(closer)
+        elif stack and token == stack[-1]:
+            stack.pop()
+    return ''.join(reversed(stack))
+
+
+# Fewest uncached files worth handing to a process pool in SpringMigrationAnalyzer.prep
+PARALLEL_STRUCTURE_MIN_FILES = 64
+
+
+def extract_java_structure(content):
+    """Return the leading import lines and Spring stereotype annotation lines of a source file."""
+    # Scan the content in place and stop at the limit instead of splitting every line
+    imports = [m.group() for m in islice(IMPORT_LINE_RE.finditer(content), 10)]
+    class_annotations = [m.group() for m in islice(SPRING_ANNOTATION_LINE_RE.finditer(content), 5)]
+    return imports, class_annotations
+
+
 class FetchRepo(Node):
     def prep(self, shared):
         vlogger = get_verbose_logger()
@@ -38,7 +290,7 @@ class FetchRepo(Node):
         prep_data = {
             "repo_url": shared.get("repo_url"),
             "local_dir": shared.get("local_dir"),
-            "token": shared.get("github_token") or os.environ.get("GITHUB_TOKEN"),
+            "token": shared.get("github_token") or os.getenv("GITHUB_TOKEN"),
             "source_branch": shared.get("source_branch"),
             "include_patterns": shared.get("include_patterns", []),
             "exclude_patterns": shared.get("exclude_patterns", []),
@@ -184,6 +436,7 @@ class FetchRepo(Node):
         vlogger = get_verbose_logger()
         
         shared["files"] = exec_res  # List of (path, content) tuples
+        shared["files_index"] = build_files_index(exec_res)
 
         # Automatically configure timeouts based on repository size
         file_count = len(exec_res)
@@ -206,171 +459,9 @@ class FetchRepo(Node):
 # SPRING MIGRATION NODES
 # ==========================================
 
-class SpringMigrationAnalyzer(Node):
-    """
-    Analyzes a Spring codebase for migration from Spring 5 to Spring 6.
-    Enhanced with concurrent analysis and performance optimization.
-    """
-    
-    def prep(self, shared):
-        vlogger = get_verbose_logger()
-        
-        if shared.get("verbose_mode"):
-            vlogger.step("Preparing Spring migration analysis")
-        
-        files_data = shared["files"]
-        project_name = shared["project_name"]
-        use_cache = shared.get("use_cache", True)
-        optimization_settings = shared.get("optimization_settings", {})
-        
-        # Apply optimization settings
-        enable_parallel = optimization_settings.get("enable_parallel_processing", False)
-        max_content_length = optimization_settings.get("max_content_length", 10000)
-        
-        # Filter for Spring-relevant files and create context
-        def create_spring_context(files_data):
-            context = ""
-            file_summary = []
-            
-            for i, (path, content) in enumerate(files_data):
-                # Apply content length optimization
-                if len(content) > max_content_length:
-                    content = content[:max_content_length] + "...[truncated for performance]"
-                
-                # Prioritize key Spring files
-                if any(pattern in path.lower() for pattern in ['pom.xml', 'build.gradle', 'application.', 'config', 'controller', 'service', 'repository', 'security']):
-                    entry = f"--- File {i}: {path} ---\n{content[:5000]}{'...[truncated]' if len(content) > 5000 else ''}\n\n"
-                else:
-                    # For other Java files, show just the structure
-                    lines = content.split('\n')
-                    imports = [line for line in lines if line.strip().startswith('import')]
-                    class_annotations = [line for line in lines if '@' in line and any(anno in line for anno in ['@Component', '@Service', '@Controller', '@Repository', '@Configuration', '@Entity'])]
-                    
-                    entry = f"--- File {i}: {path} ---\n"
-                    entry += "IMPORTS:\n" + "\n".join(imports[:10]) + "\n"
-                    entry += "KEY ANNOTATIONS:\n" + "\n".join(class_annotations[:5]) + "\n"
-                    if len(content) > 1000:
-                        entry += f"[File size: {len(content)} chars - showing structure only]\n\n"
-                    else:
-                        entry += content + "\n\n"
-                
-                context += entry
-                file_summary.append(f"- {i}: {path}")
-                
-                # Limit total context size for performance
-                if len(context) > 50000:
-                    context += "... [Additional files truncated for context length] ...\n"
-                    break
-            
-            return context, file_summary
-        
-        context, file_summary = create_spring_context(files_data)
-        file_listing = "\n".join(file_summary)
-        
-        return context, file_listing, project_name, use_cache, optimization_settings
-
-    def exec(self, prep_res):
-        monitor = get_performance_monitor()
-        monitor.start_operation("spring_migration_analysis")
-        
-        context, file_listing, project_name, use_cache, optimization_settings = prep_res
-        print(f"Analyzing Spring codebase for migration...")
-        
-        # Check if we should use fallback for very large contexts
-        enable_fallback_for_large_repos = len(context) > 100000
-        
-        # Use maximum timeout for large repositories
-        use_max_timeout = len(context) > 50000 or len(file_listing.split('\n')) > 200
-        if use_max_timeout:
-            print("⚡ Large repository detected - using maximum timeout settings...")
-            configure_maximum_timeouts()
-        
-        if enable_fallback_for_large_repos:
-            print("⚡ Large repository detected - using optimized analysis...")
-            # Use a more focused prompt for very large repositories
-            analysis = self._analyze_large_repository(context, file_listing, project_name, use_cache)
-        else:
-            # Use the full comprehensive prompt for smaller repositories
-            analysis = self._analyze_standard_repository(context, file_listing, project_name, use_cache)
-        
-        monitor.end_operation("spring_migration_analysis", 
-                            files_processed=len(file_listing.split('\n')),
-                            llm_calls=1)
-        return analysis
-    
-    def _analyze_large_repository(self, context, file_listing, project_name, use_cache):
-        """Optimized analysis for large repositories."""
-        prompt = f"""# Spring 6 Migration – Large Repository Analysis
-
-You are analyzing a large Spring codebase for project `{project_name}` for Spring 5 to 6 migration.
-
-## Repository Overview:
-- Large codebase requiring optimized analysis
-- Focus on high-impact migration issues
-- Provide realistic effort estimates
-
-## Sample Files (truncated for performance):
-{context[:20000]}... [Additional content available]
-
-## Available Files:
-{file_listing[:5000]}... [Additional files not shown]
-
-## CRITICAL: Provide a focused analysis in JSON format for large repositories:
-
-```json
-{{
-  "executive_summary": {{
-    "migration_impact": "High-level assessment of migration complexity",
-    "key_blockers": ["Top 3 critical blockers"],
-    "recommended_approach": "Phased migration strategy for large repository"
-  }},
-  "detailed_analysis": {{
-    "framework_audit": {{}},
-    "jakarta_migration": {{}},
-    "security_migration": {{}},
-    "estimated_scope": {{
-      "total_files_analyzed": "approximate number",
-      "high_priority_files": "files requiring immediate attention",
-      "complexity_assessment": "Low|Medium|High|Very High"
-    }}
-  }},
-  "effort_estimation": {{
-    "total_effort": "X person-weeks (adjusted for large repository)",
-    "team_size_recommendation": "3-8 developers",
-    "timeline": "X months",
-    "priority_levels": {{
-      "critical": ["items blocking migration"],
-      "high": ["items requiring early attention"],
-      "medium": ["items for later phases"]
-    }}
-  }},
-  "migration_roadmap": [
-    {{
-      "step": 1,
-      "title": "Foundation Phase",
-      "description": "Core infrastructure updates",
-      "estimated_effort": "X person-weeks"
-    }}
-  ]
-}}
-```
-
-Focus on providing actionable insights for large-scale migration planning."""
-
-        try:
-            response = call_llm(prompt, use_cache=(use_cache and self.cur_retry == 0))
-            return self._parse_analysis_response(response, file_listing)
-        except Exception as e:
-            print(f"Large repository analysis failed: {e}")
-            return self._get_fallback_analysis((context, file_listing, project_name, use_cache), file_listing)
-    
-    def _analyze_standard_repository(self, context, file_listing, project_name, use_cache):
-        """Standard comprehensive analysis for normal-sized repositories."""
-        # Store prep_res for fallback use
-        prep_res = (context, file_listing, project_name, use_cache)
-        
-        # Use the existing comprehensive prompt
-        prompt = """# System Prompt: Spring 6 Migration – Full Codebase Analysis
+# Analysis prompts for SpringMigrationAnalyzer, parsed once at import instead of
+# rebuilt as f-strings on every call; fill them with format_map()
+SPRING_ANALYSIS_PROMPT = """# System Prompt: Spring 6 Migration – Full Codebase Analysis
 
 You are an expert in Java, Spring Framework, Jakarta EE, and enterprise application modernization. Analyze the Java codebase for project `{project_name}` to determine what changes are needed for Spring Framework 6 migration.
 
@@ -599,75 +690,308 @@ IMPORTANT:
 - Focus on actual code patterns, imports, and configurations found
 - Provide specific line-by-line analysis where possible
 
-Analyze the codebase thoroughly and provide the complete JSON response based on actual findings.""".format(
-            project_name=project_name,
-            context=context,
-            file_listing=file_listing
-        )
+Analyze the codebase thoroughly and provide the complete JSON response based on actual findings."""
 
-        try:
-            response = call_llm(prompt, use_cache=(use_cache and self.cur_retry == 0))
-            return self._parse_analysis_response(response, file_listing)
-        except Exception as e:
-            print(f"Standard repository analysis failed: {e}")
-            return self._get_fallback_analysis(prep_res, file_listing)
-    
-    def _parse_analysis_response(self, response, file_listing):
-        """Parse the LLM analysis response with enhanced error handling."""
-        try:
-            # Clean the response
-            response = response.strip()
-            
-            # Try to find JSON block in response
-            if "```json" in response:
-                json_str = response.split("```json")[1].split("```")[0].strip()
-            elif response.startswith("{") and response.endswith("}"):
-                json_str = response
-            else:
-                import re
-                json_match = re.search(r'\{.*\}', response, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group(0)
-                else:
-                    raise ValueError("No JSON content found in response")
-            
-            # Clean up common JSON issues
-            json_str = self._clean_json_string(json_str)
-            
-            # Try to parse JSON
-            analysis = json.loads(json_str)
-            
-            # Basic validation
-            required_keys = ["executive_summary", "detailed_analysis", "effort_estimation"]
-            for key in required_keys:
-                if key not in analysis:
-                    print(f"Warning: Missing required key: {key}")
-                    analysis[key] = self._get_default_value(key)
-            
-            return analysis
-            
-        except json.JSONDecodeError as e:
-            print(f"JSON parsing error: {e}")
-            print(f"Response content (first 500 chars): {response[:500]}")
-            return self._get_fallback_analysis(None, file_listing)
-        except Exception as e:
-            print(f"Error processing LLM response: {e}")
-            return self._get_fallback_analysis(None, file_listing)
-    
-    def _clean_json_string(self, json_str):
-        """Clean common JSON formatting issues."""
-        # Remove any leading/trailing whitespace
-        json_str = json_str.strip()
-        
-        # Fix common issues with unescaped quotes in strings
-        import re
-        
-        # Fix unescaped quotes within string values (simple heuristic)
-        # This is a basic fix - for production, you'd want more sophisticated handling
-        lines = json_str.split('\n')
-        cleaned_lines = []
-        
-        for line in lines:
+LARGE_REPOSITORY_ANALYSIS_PROMPT = """# Spring 6 Migration – Large Repository Analysis
+
+You are analyzing a large Spring codebase for project `{project_name}` for Spring 5 to 6 migration.
+
+## Repository Overview:
+- Large codebase requiring optimized analysis
+- Focus on high-impact migration issues
+- Provide realistic effort estimates
+
+## Sample Files (truncated for performance):
+{context}... [Additional content available]
+
+## Available Files:
+{file_listing}... [Additional files not shown]
+
+## CRITICAL: Provide a focused analysis in JSON format for large repositories:
+
+```json
+{{
+  "executive_summary": {{
+    "migration_impact": "High-level assessment of migration complexity",
+    "key_blockers": ["Top 3 critical blockers"],
+    "recommended_approach": "Phased migration strategy for large repository"
+  }},
+  "detailed_analysis": {{
+    "framework_audit": {{}},
+    "jakarta_migration": {{}},
+    "security_migration": {{}},
+    "estimated_scope": {{
+      "total_files_analyzed": "approximate number",
+      "high_priority_files": "files requiring immediate attention",
+      "complexity_assessment": "Low|Medium|High|Very High"
+    }}
+  }},
+  "effort_estimation": {{
+    "total_effort": "X person-weeks (adjusted for large repository)",
+    "team_size_recommendation": "3-8 developers",
+    "timeline": "X months",
+    "priority_levels": {{
+      "critical": ["items blocking migration"],
+      "high": ["items requiring early attention"],
+      "medium": ["items for later phases"]
+    }}
+  }},
+  "migration_roadmap": [
+    {{
+      "step": 1,
+      "title": "Foundation Phase",
+      "description": "Core infrastructure updates",
+      "estimated_effort": "X person-weeks"
+    }}
+  ]
+}}
+```
+
+Focus on providing actionable insights for large-scale migration planning."""
+
+
+class SpringMigrationAnalyzer(Node):
+    """
+    Analyzes a Spring codebase for migration from Spring 5 to Spring 6.
+    Enhanced with concurrent analysis and performance optimization.
+    """
+    
+    def prep(self, shared):
+        vlogger = get_verbose_logger()
+        
+        if shared.get("verbose_mode"):
+            vlogger.step("Preparing Spring migration analysis")
+        
+        files_data = shared["files"]
+        priority_paths = get_files_index(shared)["priority"]
+        project_name = shared["project_name"]
+        use_cache = shared.get("use_cache", True)
+        optimization_settings = shared.get("optimization_settings", {})
+        
+        # Apply optimization settings
+        enable_parallel = optimization_settings.get("enable_parallel_processing", False)
+        max_content_length = optimization_settings.get("max_content_length", 10000)
+        
+        def prepare_files(files_data):
+            """Truncate each file and classify its path once, keying non-priority files for the structure cache."""
+            for path, content in files_data:
+                # Apply content length optimization
+                if len(content) > max_content_length:
+                    content = content[:max_content_length] + "...[truncated for performance]"
+                
+                # Prioritize key Spring files; other files only get a structure summary
+                structure_key = None if path in priority_paths else file_content_key(path, content)
+                yield path, content, structure_key
+        
+        def prefetch_structures(prepared_files):
+            """Extract uncached file structures in worker processes."""
+            misses = {
+                structure_key: content
+                for _, content, structure_key in prepared_files
+                if structure_key is not None and structure_key not in structure_cache
+            }
+            
+            # Small batches are cheaper to extract inline than to ship to workers
+            if len(misses) < PARALLEL_STRUCTURE_MIN_FILES:
+                return
+            try:
+                with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                    structures = executor.map(extract_java_structure, misses.values(), chunksize=16)
+                    for structure_key, structure in zip(misses, structures):
+                        structure_cache[structure_key] = structure
+            except (OSError, BrokenProcessPool) as e:
+                # The serial pass below extracts whatever is still missing
+                vlogger.warning(f"Parallel structure extraction failed, continuing serially: {e}")
+        
+        # Filter for Spring-relevant files and create context
+        def create_spring_context(prepared_files):
+            parts = []
+            total_len = 0
+            file_summary = []
+            
+            for i, (path, content, structure_key) in enumerate(prepared_files):
+                if structure_key is None:
+                    if len(content) > 5000:
+                        content = content[:5000] + '...[truncated]'
+                    entry = f"--- File {i}: {path} ---\n{content}\n\n"
+                else:
+                    # For other Java files, show just the structure (cached across runs)
+                    structure = structure_cache.get(structure_key)
+                    if structure is None:
+                        structure = extract_java_structure(content)
+                        structure_cache[structure_key] = structure
+                    imports, class_annotations = structure
+                    
+                    if len(content) > 1000:
+                        body = f"[File size: {len(content)} chars - showing structure only]"
+                    else:
+                        body = content
+                    import_lines = "\n".join(imports)
+                    annotation_lines = "\n".join(class_annotations)
+                    entry = (f"--- File {i}: {path} ---\n"
+                             f"IMPORTS:\n{import_lines}\n"
+                             f"KEY ANNOTATIONS:\n{annotation_lines}\n"
+                             f"{body}\n\n")
+                
+                parts.append(entry)
+                total_len += len(entry)
+                file_summary.append(f"- {i}: {path}")
+                
+                # Limit total context size for performance
+                if total_len > 50000:
+                    parts.append("... [Additional files truncated for context length] ...\n")
+                    break
+            
+            return "".join(parts), file_summary
+        
+        structure_cache = open_structure_cache(shared.get("output_dir"))
+        try:
+            # Serial runs stay lazy so files past the context limit are never hashed
+            prepared_files = prepare_files(files_data)
+            if enable_parallel:
+                prepared_files = list(prepared_files)
+                prefetch_structures(prepared_files)
+            context, file_summary = create_spring_context(prepared_files)
+        finally:
+            structure_cache.close()
+        file_listing = "\n".join(file_summary)
+        
+        return context, file_listing, project_name, use_cache, optimization_settings
+
+    def exec(self, prep_res):
+        monitor = get_performance_monitor()
+        monitor.start_operation("spring_migration_analysis")
+        
+        context, file_listing, project_name, use_cache, optimization_settings = prep_res
+        print(f"Analyzing Spring codebase for migration...")
+        
+        # Check if we should use fallback for very large contexts
+        enable_fallback_for_large_repos = len(context) > 100000
+        
+        # Use maximum timeout for large repositories
+        file_count = file_listing.count('\n') + 1
+        use_max_timeout = len(context) > 50000 or file_count > 200
+        if use_max_timeout:
+            print("⚡ Large repository detected - using maximum timeout settings...")
+            configure_maximum_timeouts()
+        
+        if enable_fallback_for_large_repos:
+            print("⚡ Large repository detected - using optimized analysis...")
+            # Use a more focused prompt for very large repositories
+            analysis = self._analyze_large_repository(context, file_listing, project_name, use_cache)
+        else:
+            # Use the full comprehensive prompt for smaller repositories
+            analysis = self._analyze_standard_repository(context, file_listing, project_name, use_cache)
+        
+        monitor.end_operation("spring_migration_analysis", 
+                            files_processed=file_count,
+                            llm_calls=1)
+        return analysis
+    
+    def _analyze_large_repository(self, context, file_listing, project_name, use_cache):
+        """Optimized analysis for large repositories."""
+        prompt = LARGE_REPOSITORY_ANALYSIS_PROMPT.format_map({
+            "project_name": project_name,
+            "context": context[:20000],
+            "file_listing": file_listing[:5000]
+        })
+
+        try:
+            return self._run_analysis_prompt(prompt, file_listing, project_name, use_cache)
+        except Exception as e:
+            print(f"Large repository analysis failed: {e}")
+            return self._get_fallback_analysis((context, file_listing, project_name, use_cache), file_listing)
+    
+    def _analyze_standard_repository(self, context, file_listing, project_name, use_cache):
+        """Standard comprehensive analysis for normal-sized repositories."""
+        # Store prep_res for fallback use
+        prep_res = (context, file_listing, project_name, use_cache)
+        
+        # Use the existing comprehensive prompt
+        prompt = SPRING_ANALYSIS_PROMPT.format_map({
+            "project_name": project_name,
+            "context": context,
+            "file_listing": file_listing
+        })
+
+        try:
+            return self._run_analysis_prompt(prompt, file_listing, project_name, use_cache)
+        except Exception as e:
+            print(f"Standard repository analysis failed: {e}")
+            return self._get_fallback_analysis(prep_res, file_listing)
+    
+    def _run_analysis_prompt(self, prompt, file_listing, project_name, use_cache):
+        """Call the LLM for an analysis prompt, reusing a persisted result for unchanged input."""
+        cache_key = analysis_cache_key(prompt, project_name) if use_cache else None
+        if cache_key:
+            analysis = load_cached_analysis("spring_analysis", cache_key)
+            if analysis is not None:
+                print("💾 Reusing cached migration analysis")
+                return analysis
+        
+        response = call_llm(retry_prompt(prompt, self.cur_retry), use_cache=use_cache)
+        analysis = self._parse_analysis_response(response, file_listing)
+        
+        # Only persist real model answers, never fallbacks
+        if (cache_key and not is_fallback_response(response)
+                and "fallback_reason" not in analysis.get("analysis_metadata", {})):
+            store_cached_analysis("spring_analysis", cache_key, analysis)
+        return analysis
+    
+    def _parse_analysis_response(self, response, file_listing):
+        """Parse the LLM analysis response with enhanced error handling."""
+        try:
+            # Clean the response
+            response = response.strip()
+            
+            # Try to find JSON block in response
+            if "```json" in response:
+                json_str = response.split("```json")[1].split("```")[0].strip()
+            elif response.startswith("{") and response.endswith("}"):
+                json_str = response
+            else:
+                json_str = find_json_span(response)
+                if json_str is None:
+                    raise ValueError("No JSON content found in response")
+            
+            # Parse JSON, cleaning up common issues only if it is malformed
+            try:
+                analysis = load_llm_json(json_str, self._clean_json_string)
+            except json.JSONDecodeError:
+                # Last tier: close brackets of a truncated response and parse again
+                repaired = self._attempt_json_fix(response)
+                if repaired is None:
+                    raise
+                analysis = json.loads(repaired)
+            
+            # Basic validation
+            required_keys = ["executive_summary", "detailed_analysis", "effort_estimation"]
+            for key in required_keys:
+                if key not in analysis:
+                    print(f"Warning: Missing required key: {key}")
+                    analysis[key] = self._get_default_value(key)
+            
+            return analysis
+            
+        except json.JSONDecodeError as e:
+            print(f"JSON parsing error: {e}")
+            print(f"Response content (first 500 chars): {response[:500]}")
+            return self._get_fallback_analysis(None, file_listing)
+        except Exception as e:
+            print(f"Error processing LLM response: {e}")
+            return self._get_fallback_analysis(None, file_listing)
+    
+    def _clean_json_string(self, json_str):
+        """Clean common JSON formatting issues."""
+        # Remove any leading/trailing whitespace
+        json_str = json_str.strip()
+        
+        # Fix unescaped quotes within string values (simple heuristic)
+        # This is a basic fix - for production, you'd want more sophisticated handling
+        lines = json_str.split('\n')
+        cleaned_lines = []
+        
+        for line in lines:
             # If line contains a string value with unescaped quotes, try to fix
             if ':' in line and '"' in line:
                 # Simple fix for common case: "key": "value with "quotes" inside"
@@ -697,30 +1021,16 @@ Analyze the codebase thoroughly and provide the complete JSON response based on
                 json_part = response.split("```json")[1].split("```")[0].strip()
             else:
                 # Try to find JSON-like content
-                import re
-                json_match = re.search(r'\{.*\}', response, re.DOTALL)
-                if json_match:
-                    json_part = json_match.group(0)
-                else:
+                json_part = find_json_span(response)
+                if json_part is None:
                     return None
             
-            # Try to fix truncated JSON by closing brackets/braces
-            open_braces = json_part.count('{')
-            close_braces = json_part.count('}')
-            open_brackets = json_part.count('[')
-            close_brackets = json_part.count(']')
+            # Try to fix truncated JSON by closing brackets/braces in nesting order
+            closers = missing_json_closers(json_part)
             
-            # Add missing closing braces/brackets
-            missing_braces = open_braces - close_braces
-            missing_brackets = open_brackets - close_brackets
-            
-            if missing_braces > 0 or missing_brackets > 0:
+            if closers:
                 # Remove any trailing incomplete content
-                json_part = json_part.rstrip(',\n\r\t ')
-                
-                # Add missing closing brackets/braces
-                json_part += ']' * missing_brackets
-                json_part += '}' * missing_braces
+                json_part = json_part.rstrip(',\n\r\t ') + closers
                 
                 # Try to parse the fixed JSON
                 test_parse = json.loads(json_part)
@@ -990,24 +1300,8 @@ Analyze the codebase thoroughly and provide the complete JSON response based on
         return "default"
 
 
-class MigrationPlanGenerator(Node):
-    """
-    Generates a detailed migration plan based on the analysis results.
-    """
-    
-    def prep(self, shared):
-        analysis = shared["migration_analysis"]
-        project_name = shared["project_name"]
-        use_cache = shared.get("use_cache", True)
-        
-        return analysis, project_name, use_cache
-    
-    def exec(self, prep_res):
-        import json
-        analysis, project_name, use_cache = prep_res
-        print(f"Generating detailed migration plan...")
-        
-        prompt = f"""
+# Plan prompt for MigrationPlanGenerator; fill it with format_map()
+MIGRATION_PLAN_PROMPT = """
 You are analyzing a Spring Boot project for migration from version 2.x to 3.x.
 
 ## 🚨 **CRITICAL JAVAX TO JAKARTA MIGRATION PRIORITY** 🚨
@@ -1018,7 +1312,7 @@ Based on the following analysis results, create a comprehensive, actionable migr
 
 **Project:** {project_name}
 **Analysis Results:**
-{json.dumps(analysis, indent=2)}
+{analysis_json}
 
 ## **JAVAX TO JAKARTA MIGRATION REQUIREMENTS**
 
@@ -1164,14 +1458,60 @@ Generate a detailed migration plan based on the actual findings from the analysi
 
 **CRITICAL:** Return ONLY the JSON object. Do not include any explanatory text before or after the JSON. Ensure javax→jakarta migration is prominently featured in phases and tasks."""
 
+
+class MigrationPlanGenerator(Node):
+    """
+    Generates a detailed migration plan based on the analysis results.
+    """
+    
+    # Last analysis serialized for the prompt; exec retries reuse the same object
+    _serialized_analysis = None
+    _analysis_json = None
+    
+    def prep(self, shared):
+        analysis = shared["migration_analysis"]
+        project_name = shared["project_name"]
+        use_cache = shared.get("use_cache", True)
+        
+        return analysis, project_name, use_cache
+    
+    def exec(self, prep_res):
+        analysis, project_name, use_cache = prep_res
+        print(f"Generating detailed migration plan...")
+        
+        analysis_json = self._serialize_analysis(analysis)
+        
+        cache_key = analysis_cache_key(analysis_json, project_name) if use_cache else None
+        if cache_key:
+            plan = load_cached_analysis("migration_plan", cache_key)
+            if plan is not None:
+                print("💾 Reusing cached migration plan")
+                return plan
+        
+        prompt = MIGRATION_PLAN_PROMPT.format_map({
+            "project_name": project_name,
+            "analysis_json": analysis_json
+        })
+
         try:
-            response = call_llm(prompt, use_cache=(use_cache and self.cur_retry == 0))
-            return self._parse_plan_response(response, analysis, project_name)
+            response = call_llm(retry_prompt(prompt, self.cur_retry), use_cache=use_cache)
+            plan = self._parse_plan_response(response, analysis, project_name)
+            if (cache_key and not is_fallback_response(response)
+                    and "fallback_reason" not in plan.get("plan_metadata", {})):
+                store_cached_analysis("migration_plan", cache_key, plan)
+            return plan
             
         except Exception as e:
             print(f"Migration plan generation failed: {e}")
             return self._get_fallback_plan(analysis, project_name)
     
+    def _serialize_analysis(self, analysis):
+        """Serialize the analysis for the prompt, once per analysis object."""
+        if self._serialized_analysis is not analysis:
+            self._analysis_json = json_dumps_indented(analysis)
+            self._serialized_analysis = analysis
+        return self._analysis_json
+    
     def _parse_plan_response(self, response, analysis, project_name):
         """Parse the LLM plan response with enhanced error handling."""
         try:
@@ -1184,18 +1524,12 @@ Generate a detailed migration plan based on the actual findings from the analysi
             elif response.startswith("{") and response.endswith("}"):
                 json_str = response
             else:
-                import re
-                json_match = re.search(r'\{.*\}', response, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group(0)
-                else:
+                json_str = find_json_span(response)
+                if json_str is None:
                     raise ValueError("No JSON content found in response")
             
-            # Clean up common JSON issues (reuse cleaning logic from SpringMigrationAnalyzer)
-            json_str = self._clean_plan_json_string(json_str)
-            
-            # Try to parse JSON
-            plan = json.loads(json_str)
+            # Parse JSON, cleaning up common issues only if it is malformed
+            plan = load_llm_json(json_str, self._clean_plan_json_string)
             
             # Enhanced validation with better error handling
             required_keys = ["migration_strategy", "phase_breakdown", "automation_recommendations", "testing_strategy"]
@@ -1282,9 +1616,6 @@ Generate a detailed migration plan based on the actual findings from the analysi
         # Remove any leading/trailing whitespace
         json_str = json_str.strip()
         
-        # Fix common issues with unescaped quotes in strings
-        import re
-        
         lines = json_str.split('\n')
         cleaned_lines = []
         
@@ -1629,7 +1960,10 @@ Generate a detailed migration plan based on the actual findings from the analysi
                     "target": "No high-risk vulnerabilities",
                     "measurement_method": "Security scanning tools"
                 }
-            ]
+            ],
+            "plan_metadata": {
+                "fallback_reason": "LLM plan generation or parsing failed"
+            }
         }
         
         return fallback_plan
@@ -1653,10 +1987,6 @@ class EnhancedFileBackupManager(Node):
         return files_data, output_dir, project_name
     
     def exec(self, prep_res):
-        import os
-        import shutil
-        from datetime import datetime
-        
         files_data, output_dir, project_name = prep_res
         
         # Create backup directory with timestamp
@@ -1671,51 +2001,57 @@ class EnhancedFileBackupManager(Node):
         
         print(f"📦 Creating structured backup and migration workspace...")
         
+        # One compressed archive keeps the original layout without an inode per file
+        archive_name = "files.tar.zst" if zstandard is not None else "files.tar.gz"
+        backup_archive = os.path.join(backup_dir, archive_name)
+        
         backup_info = {
             "backup_dir": backup_dir,
+            "backup_archive": backup_archive,
             "migration_workspace": migration_workspace,
             "timestamp": timestamp,
             "files_backed_up": [],
             "migration_files": []
         }
         
-        for i, (file_path, content) in enumerate(files_data):
-            # Create backup with flattened names (for safety)
-            backup_file_path = os.path.join(backup_dir, file_path.replace("/", "_").replace("\\", "_"))
-            
+        migration_dirs = set()
+        write_jobs = []
+        for file_path, content in files_data:
             # Create migration file with proper directory structure
             migration_file_path = os.path.join(migration_workspace, file_path)
-            migration_dir = os.path.dirname(migration_file_path)
-            
-            # Ensure directory exists for migration file
-            if migration_dir:
-                os.makedirs(migration_dir, exist_ok=True)
+            migration_dirs.add(os.path.dirname(migration_file_path))
             
-            # Write backup file (flattened)
-            with open(backup_file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            # Write migration file (structured)
-            with open(migration_file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Encode once; the workspace copy and the archive share the bytes
+            data = content if isinstance(content, (bytes, bytearray)) else content.encode('utf-8')
+            write_jobs.append((file_path, migration_file_path, data))
             
             backup_info["files_backed_up"].append({
                 "original_path": file_path,
-                "backup_path": backup_file_path
+                "archive_member": file_path
             })
             
             backup_info["migration_files"].append({
                 "original_path": file_path,
                 "migration_path": migration_file_path
             })
-            
-            if (i + 1) % 10 == 0:
-                print(f"   Processed {i + 1}/{len(files_data)} files...")
+        
+        # Ensure directories exist for migration files, once per directory
+        for migration_dir in sorted(migration_dirs):
+            if migration_dir:
+                os.makedirs(migration_dir, exist_ok=True)
+        
+        # File writes are I/O bound, so threads overlap their syscalls while
+        # this thread streams the backup archive
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as executor:
+            writes = executor.map(lambda job: self._write_migration_file(job[1], job[2]), write_jobs)
+            self._write_backup_archive(backup_archive, write_jobs)
+            for _ in tqdm(writes, total=len(write_jobs), desc="   Backing up", unit="file"):
+                pass
         
         # Create backup manifest
         manifest_path = os.path.join(backup_dir, "backup_manifest.json")
-        with open(manifest_path, 'w', encoding='utf-8') as f:
-            json.dump(backup_info, f, indent=2)
+        with open(manifest_path, 'wb') as f:
+            f.write(json_bytes_indented(backup_info))
         
         # Create migration workspace README
         readme_path = os.path.join(migration_workspace, "MIGRATION_README.md")
@@ -1726,6 +2062,31 @@ class EnhancedFileBackupManager(Node):
         print(f"✅ Migration workspace created: {migration_workspace}")
         return backup_info
     
+    def _write_migration_file(self, migration_file_path, data):
+        """Write one file's encoded content into the migration workspace."""
+        with open(migration_file_path, 'wb') as f:
+            f.write(data)
+    
+    def _write_backup_archive(self, archive_path, write_jobs):
+        """Stream the (original path, workspace path, bytes) jobs into a tar archive, zstd-compressed when available."""
+        mtime = datetime.now().timestamp()
+        with open(archive_path, 'wb') as raw:
+            if zstandard is not None:
+                stream = zstandard.ZstdCompressor(level=3, threads=-1).stream_writer(raw)
+                tar = tarfile.open(fileobj=stream, mode="w|")
+            else:
+                stream = None
+                tar = tarfile.open(fileobj=raw, mode="w:gz", compresslevel=6)
+            with tar:
+                for file_path, _, data in write_jobs:
+                    info = tarfile.TarInfo(name=file_path.replace("\\", "/"))
+                    info.size = len(data)
+                    info.mtime = mtime
+                    info.mode = 0o644
+                    tar.addfile(info, io.BytesIO(data))
+            if stream is not None:
+                stream.close()
+    
     def _create_migration_readme(self, project_name, timestamp):
         """Create a README for the migration workspace."""
         return f"""# Spring Migration Workspace - {project_name}
@@ -1787,7 +2148,7 @@ This workspace contains all source files from your original project with the sam
 
 ## Safety Notes
 
-- Original files are backed up separately in the backup directory
+- Original files are backed up separately in a compressed archive in the backup directory
 - This workspace is a copy - your original project is unchanged
 - Use git to track and manage migration changes
 - Test thoroughly before applying to your main project
@@ -1811,10 +2172,6 @@ class GitMigrationManager(Node):
         return backup_info, applied_changes, project_name
     
     def exec(self, prep_res):
-        import os
-        import subprocess
-        from datetime import datetime
-        
         backup_info, applied_changes, project_name = prep_res
         migration_workspace = backup_info.get("migration_workspace")
         
@@ -1824,10 +2181,7 @@ class GitMigrationManager(Node):
         
         print(f"🔧 Setting up git workflow in migration workspace...")
         
-        # Change to migration workspace
-        original_cwd = os.getcwd()
-        os.chdir(migration_workspace)
-        
+        # Run every git command inside the migration workspace without changing the process cwd
         try:
             git_info = {
                 "workspace_path": migration_workspace,
@@ -1837,8 +2191,8 @@ class GitMigrationManager(Node):
             }
             
             # Initialize git if not exists
-            if not os.path.exists(".git"):
-                result = subprocess.run(["git", "init"], capture_output=True, text=True)
+            if not os.path.exists(os.path.join(migration_workspace, ".git")):
+                result = subprocess.run(["git", "init"], capture_output=True, text=True, cwd=migration_workspace)
                 if result.returncode == 0:
                     git_info["operations"].append("✅ Git repository initialized")
                     print("   Git repository initialized")
@@ -1846,17 +2200,17 @@ class GitMigrationManager(Node):
                     print(f"   Warning: Git init failed: {result.stderr}")
             
             # Configure git user if not set (for CI environments)
-            self._ensure_git_config()
+            self._ensure_git_config(migration_workspace)
             
             # Add all files and create initial commit
-            subprocess.run(["git", "add", "."], capture_output=True)
+            subprocess.run(["git", "add", "."], capture_output=True, cwd=migration_workspace)
             
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             initial_commit_msg = f"Initial commit - {project_name} pre-migration source"
             
             result = subprocess.run(
                 ["git", "commit", "-m", initial_commit_msg], 
-                capture_output=True, text=True
+                capture_output=True, text=True, cwd=migration_workspace
             )
             
             if result.returncode == 0:
@@ -1866,7 +2220,7 @@ class GitMigrationManager(Node):
                 # Get commit hash
                 commit_result = subprocess.run(
                     ["git", "rev-parse", "HEAD"], 
-                    capture_output=True, text=True
+                    capture_output=True, text=True, cwd=migration_workspace
                 )
                 if commit_result.returncode == 0:
                     git_info["commit_hash"] = commit_result.stdout.strip()
@@ -1875,7 +2229,7 @@ class GitMigrationManager(Node):
             branch_name = f"spring-6-migration-{timestamp}"
             result = subprocess.run(
                 ["git", "checkout", "-b", branch_name], 
-                capture_output=True, text=True
+                capture_output=True, text=True, cwd=migration_workspace
             )
             
             if result.returncode == 0:
@@ -1891,30 +2245,24 @@ class GitMigrationManager(Node):
         except Exception as e:
             print(f"   Error setting up git: {e}")
             return {"status": "error", "error": str(e)}
-        
-        finally:
-            # Return to original directory
-            os.chdir(original_cwd)
     
-    def _ensure_git_config(self):
+    def _ensure_git_config(self, workspace):
         """Ensure git user is configured for commits."""
-        import subprocess
-        
         # Check if user.name is set
         result = subprocess.run(
             ["git", "config", "user.name"], 
-            capture_output=True, text=True
+            capture_output=True, text=True, cwd=workspace
         )
         
         if result.returncode != 0:
             # Set default user for migration commits
             subprocess.run(
                 ["git", "config", "user.name", "Spring Migration Tool"], 
-                capture_output=True
+                capture_output=True, cwd=workspace
             )
             subprocess.run(
                 ["git", "config", "user.email", "migration-tool@localhost"], 
-                capture_output=True
+                capture_output=True, cwd=workspace
             )
             print("   Configured git user for migration commits")
     
@@ -1935,7 +2283,7 @@ echo ""
 # Show change summary
 echo "📈 Change Summary:"
 echo "  Modified files: $(git diff --name-only --cached | wc -l)"
-echo "  Total changes: $(git diff --cached --stat | tail -1)"
+echo "  Total changes: $(git diff --cached --shortstat)"
 echo ""
 
 # Offer common operations
@@ -1966,7 +2314,7 @@ case $action in
         git commit -m "Spring 5 to 6 migration - Automated changes
 
 ✅ Migration completed for {project_name}
-📊 Changes applied: $(git diff --cached --stat | tail -1)
+📊 Changes applied: $(git diff --cached --shortstat)
 
 Changes include:
 - javax.* → jakarta.* namespace migration
@@ -2012,7 +2360,6 @@ esac
             f.write(script_content)
         
         # Make script executable
-        import stat
         os.chmod(script_path, stat.S_IRWXU | stat.S_IRGRP | stat.S_IROTH)
         
         print(f"   Created git workflow script: git-migration-workflow.sh")
@@ -2022,184 +2369,64 @@ esac
         return "default"
 
 
-class MigrationChangeGenerator(Node):
-    """
-    Enhanced change generator with concurrent file processing capabilities.
-    """
-    
-    def prep(self, shared):
-        vlogger = get_verbose_logger()
-        
-        if shared.get("verbose_mode"):
-            vlogger.step("Preparing migration change generation")
-        
-        files_data = shared["files"]
-        analysis = shared.get("migration_analysis", {})
-        project_name = shared["project_name"]
-        use_cache = shared.get("use_cache", True)
-        optimization_settings = shared.get("optimization_settings", {})
-        
-        # Defensive check: ensure analysis has required structure
-        if not isinstance(analysis, dict):
-            if shared.get("verbose_mode"):
-                vlogger.warning("Analysis is not a dictionary, using empty analysis")
-            analysis = {}
-        
-        # Ensure critical keys exist with safe defaults
-        if "executive_summary" not in analysis:
-            if shared.get("verbose_mode"):
-                vlogger.warning("Missing executive_summary in analysis, adding default")
-            analysis["executive_summary"] = {
-                "migration_impact": "Unknown - analysis incomplete",
-                "key_blockers": [],
-                "recommended_approach": "Manual review required"
-            }
-        
-        if "detailed_analysis" not in analysis:
-            if shared.get("verbose_mode"):
-                vlogger.warning("Missing detailed_analysis in analysis, adding default")
-            analysis["detailed_analysis"] = {}
-        
-        if shared.get("verbose_mode"):
-            vlogger.debug(f"Analysis validated with keys: {list(analysis.keys())}")
-        
-        return files_data, analysis, project_name, use_cache, optimization_settings
-    
-    def exec(self, prep_res):
-        files_data, analysis, project_name, use_cache, optimization_settings = prep_res
-        
-        vlogger = get_verbose_logger()
-        if optimization_settings.get("verbose_mode"):
-            vlogger.debug(f"Starting change generation for {len(files_data)} files")
-            vlogger.debug(f"Analysis object type: {type(analysis)}")
-            vlogger.debug(f"Analysis keys: {list(analysis.keys()) if isinstance(analysis, dict) else 'Not a dict'}")
-        
-        # Double-check analysis object integrity before proceeding
-        if not isinstance(analysis, dict):
-            if optimization_settings.get("verbose_mode"):
-                vlogger.error("Analysis is not a dictionary! Creating empty analysis.")
-            analysis = {
-                "executive_summary": {"migration_impact": "Unknown", "key_blockers": []},
-                "detailed_analysis": {}
-            }
-        
-        monitor = get_performance_monitor()
-        monitor.start_operation("migration_change_generation")
-        
-        print(f"🔧 Generating specific migration changes using LLM analysis...")
-        
-        # Initialize changes structure
-        changes = {
-            "javax_to_jakarta": [],
-            "spring_security_updates": [],
-            "dependency_updates": [],
-            "configuration_updates": [],
-            "other_changes": []
-        }
-        
-        # Optimization: Use concurrent analysis if enabled
-        batch_size = optimization_settings.get("batch_size", 10)
-        max_workers = optimization_settings.get("max_workers", 4)
-        parallel_enabled = optimization_settings.get("parallel", False)
-        
-        if parallel_enabled and len(files_data) > 5:
-            from utils.concurrent_manager import ConcurrentAnalysisManager
-            concurrent_manager = ConcurrentAnalysisManager(max_workers=max_workers)
-            
-            try:
-                def analyze_file_wrapper(file_path, content):
-                    return self._analyze_file_with_llm(file_path, content, analysis, project_name, use_cache)
-                
-                results = concurrent_manager.process_files_concurrently(
-                    files_data, 
-                    analyze_file_wrapper,
-                    batch_size=batch_size
-                )
-                
-                # Merge all results
-                for file_changes in results:
-                    for change_type, file_change_list in file_changes.items():
-                        changes[change_type].extend(file_change_list)
-            
-            finally:
-                concurrent_manager.shutdown()
-        else:
-            # Process sequentially
-            for i, (file_path, content) in enumerate(files_data):
-                if i % 10 == 0:
-                    print(f"   Analyzing {file_path} ({i+1}/{len(files_data)})...")
-                
-                try:
-                    file_changes = self._analyze_file_with_llm(file_path, content, analysis, project_name, use_cache)
-                    
-                    for change_type, file_change_list in file_changes.items():
-                        changes[change_type].extend(file_change_list)
-                        
-                except Exception as e:
-                    if optimization_settings.get("verbose_mode"):
-                        vlogger.error(f"Error analyzing {file_path}: {e}")
-                    print(f"     Error analyzing {file_path}: {e}")
-                    # Continue with next file
-                    continue
-        
-        monitor.end_operation("migration_change_generation", 
-                            files_processed=len(files_data),
-                            llm_calls=len([f for f, c in files_data if not self._should_skip_file(f)]))
-        
-        return changes
-    
-    def _analyze_file_with_llm(self, file_path, content, analysis, project_name, use_cache):
-        """Use LLM to analyze a single file and generate specific changes needed."""
-        
-        # Skip analysis for very large files or binary-like content
-        if len(content) > 20000:
-            print(f"     Skipping large file: {file_path}")
-            return self._get_empty_changes()
-        
-        if not self._is_text_file(file_path, content):
-            print(f"     Skipping non-text file: {file_path}")
-            return self._get_empty_changes()
-        
-        # Skip files that are unlikely to need Spring migration changes
-        if self._should_skip_file(file_path):
-            print(f"     Skipping non-migration-relevant file: {file_path}")
-            return self._get_empty_changes()
-        
-        # **NEW: Check Java version compatibility FIRST**
-        if file_path.endswith(('pom.xml', '.gradle', '.gradle.kts')):
-            java_version_issues = self._check_java_version_compatibility(content, file_path)
-            if java_version_issues:
-                # Return Java version issues as high-priority changes
-                return java_version_issues
-        
-        # **NEW: Pre-filter files that don't actually need changes**
-        if not self._file_needs_migration_analysis(file_path, content):
-            # Silently skip - no need to report files that don't need changes
-            return self._get_empty_changes()
-        
-        # Create context from the migration analysis
-        analysis_context = self._create_analysis_context(analysis)
-        
-        # Prepare file content for LLM (limit size and clean it)
-        clean_content = self._prepare_file_content_for_llm(content, file_path)
-        
-        # Enhanced prompt with better JSON guidance
-        prompt = f"""# Spring Migration Change Analysis - JAVAX TO JAKARTA PRIORITY
+# Substrings that mark a file as worth sending to the LLM for change analysis,
+# matched case-insensitively in one scan by _file_needs_migration_analysis
+MIGRATION_TRIGGER_PATTERNS = (
+    # javax imports that need migration
+    'import javax.',
+    # JPA/Hibernate
+    '@entity', '@table', '@column', '@id', '@generatedvalue', '@onetomany', '@manytoone',
+    '@joincolumn', '@embeddable', '@entitylisteners', 'hibernatetemplate', 'sessionfactory',
+    'jpatemplate',
+    # Spring Security
+    'websecurityconfigureradapter', 'authorizeequests()', 'antmatchers(', 'spring.security.',
+    '@enablewebsecurity', '@enableglobalmethodsecurity', 'httpsecurity', 'authenticationmanager',
+    'userdetailsservice', 'passwordencoder', 'csrf()', 'cors()', 'oauth2', 'jwt',
+    # JUnit 4→5
+    '@test', '@before', '@after', '@beforeclass', '@afterclass', '@runwith', '@rule', '@ignore',
+    'import org.junit.test', 'import org.junit.before', 'import org.junit.after',
+    'import org.junit.assert', 'runner.class', 'springrunner', 'mockitojunitrunner',
+    # Mockito annotations
+    '@mock', '@injectmocks', '@spy', '@captor', '@mockbean', '@spybean', 'mockitoannotations',
+    'mockito.when', 'mockito.verify', 'argumentcaptor',
+    # Spring Test
+    '@springboottest', '@datajpatest', '@webmvctest', '@jsontest', '@restclienttest',
+    '@mockmvctest', 'mockmvc', 'testresttemplate', 'webapplicationcontext', '@testconfiguration',
+    '@testpropertysource', '@activeprofiles', '@sql', '@transactional',
+    'import org.springframework.test', 'import org.springframework.boot.test',
+    '@testmethodorder', '@testinstance', '@parametrizedtest',
+)
+MIGRATION_TRIGGER_RE = re.compile("|".join(map(re.escape, MIGRATION_TRIGGER_PATTERNS)), re.IGNORECASE)
+
+# Extra triggers checked only in XML, properties and YAML configuration files
+CONFIG_MIGRATION_TRIGGER_RE = re.compile(
+    "|".join(map(re.escape, ('javax.', 'spring.security', 'hibernate.ddl', 'spring.jpa', 'spring.test',
+                             'junit.', 'logging.level.org.springframework', 'management.endpoints',
+                             'spring.datasource'))),
+    re.IGNORECASE
+)
 
-You are analyzing a file from project `{project_name}` for Spring 6 migration. **PRIMARY FOCUS: JAVAX TO JAKARTA MIGRATION**
+# Files packed into one change-analysis prompt; contents are capped at ~5000
+# chars each by _prepare_file_content_for_llm, so a batch stays well inside
+# the model context while sharing the long instruction block
+LLM_FILE_BATCH_SIZE = 8
 
-## Overall Migration Analysis Context:
-{analysis_context}
+# File type descriptions given to the LLM, by extension; pom.xml is
+# described as XML like any other .xml file
+FILE_TYPE_BY_EXTENSION = {
+    '.java': "Java source file",
+    '.xml': "XML configuration file",
+    '.properties': "Properties configuration file",
+    '.yml': "YAML configuration file",
+    '.yaml': "YAML configuration file",
+    '.gradle': "Gradle build file",
+}
 
-## File to Analyze:
-**File Path:** {file_path}
-**File Type:** {self._get_file_type(file_path)}
-**File Content:**
-```
-{clean_content}
-```
+# Fields every suggested change must carry, checked in one set comparison
+REQUIRED_CHANGE_FIELDS = frozenset(("file", "type", "description"))
 
-## 🚨 **CRITICAL JAVAX TO JAKARTA REQUIREMENTS** 🚨
+# Shared rules for per-file and batched change analysis prompts
+CHANGE_ANALYSIS_GUIDELINES = """## 🚨 **CRITICAL JAVAX TO JAKARTA REQUIREMENTS** 🚨
 
 ### **HIGHEST PRIORITY: javax.* → jakarta.* Migration**
 
@@ -2260,7 +2487,7 @@ You are analyzing a file from project `{project_name}` for Spring 6 migration. *
 
 ### Rule 2: Content Verification Required
 - **ONLY suggest changes for content that ACTUALLY EXISTS in the file**
-- **Before suggesting javax.* → jakarta.* change, VERIFY the javax import exists in the file content above**
+- **Before suggesting javax.* → jakarta.* change, VERIFY the javax import exists in the file content**
 - **Before suggesting version updates, VERIFY the version number exists in the file**
 - **Do NOT make assumptions about content not shown**
 
@@ -2332,51 +2559,62 @@ import javax.validation.constraints.NotNull;
 
 **YOU MUST INCLUDE THESE CHANGES:**
 ```json
-{{
+{
   "javax_to_jakarta": [
-    {{
-      "file": "{{file_path}}",
+    {
+      "file": "{file_path}",
       "type": "import_replacement",
       "from": "javax.persistence.Entity",
       "to": "jakarta.persistence.Entity",
       "automatic": true,
       "description": "JPA: javax.persistence → jakarta.persistence"
-    }},
-    {{
-      "file": "{{file_path}}",
+    },
+    {
+      "file": "{file_path}",
       "type": "import_replacement", 
       "from": "javax.persistence.Id",
       "to": "jakarta.persistence.Id",
       "automatic": true,
       "description": "JPA: javax.persistence → jakarta.persistence"
-    }},
-    {{
-      "file": "{{file_path}}",
+    },
+    {
+      "file": "{file_path}",
       "type": "import_replacement",
       "from": "javax.validation.constraints.NotNull", 
       "to": "jakarta.validation.constraints.NotNull",
       "automatic": true,
       "description": "Bean Validation: javax.validation → jakarta.validation"
-    }}
+    }
   ]
-}}
-```
+}
+```"""
+
+# Change analysis prompts keep every invariant instruction at the head and the
+# per-run and per-file text at the tail, so provider prompt caches, which only
+# match a leading prefix, reuse the instructions for every file after the first
+CHANGE_ANALYSIS_PROMPT_PREFIX = """# Spring Migration Change Analysis - JAVAX TO JAKARTA PRIORITY
+
+You are analyzing a file for Spring 6 migration. **PRIMARY FOCUS: JAVAX TO JAKARTA MIGRATION**
+
+The project, the overall migration analysis and the file to analyze follow these instructions.
+
+""" + CHANGE_ANALYSIS_GUIDELINES + """
 
 ## CRITICAL: You MUST respond with ONLY valid JSON - no additional text or explanations
 
 Your response must be ONLY a JSON object with this exact structure:
 
-{{
+{
   "javax_to_jakarta": [],
   "spring_security_updates": [],
   "dependency_updates": [],
   "configuration_updates": [],
   "other_changes": []
-}}
+}
 
 ## JSON Response Rules:
 1. Return ONLY the JSON object - no markdown, no explanation text
-2. **SCAN THE FILE CONTENT ABOVE FOR javax.* imports - INCLUDE ALL OF THEM**
+2. **SCAN THE FILE CONTENT BELOW FOR javax.* imports - INCLUDE ALL OF THEM**
 3. **javax_to_jakarta array is HIGHEST PRIORITY - never leave it empty if javax.* imports exist**
 4. **Verify file type matches change type (Java=imports, Build=versions)**
 5. Use only basic ASCII characters in strings
@@ -2385,10 +2623,286 @@ Your response must be ONLY a JSON object with this exact structure:
 8. Use "automatic": false only for complex changes requiring manual review
 9. **Double-check: Did I scan for ALL javax.* imports in the file content?**
 
+"""
+
+CHANGE_ANALYSIS_BATCH_PROMPT_PREFIX = """# Spring Migration Change Analysis - JAVAX TO JAKARTA PRIORITY
+
+You are analyzing several files for Spring 6 migration. **PRIMARY FOCUS: JAVAX TO JAKARTA MIGRATION**
+
+The project, the overall migration analysis and the numbered files to analyze follow these instructions.
+
+""" + CHANGE_ANALYSIS_GUIDELINES + """
+
+## CRITICAL: You MUST respond with ONLY valid JSON - no additional text or explanations
+
+Your response must be ONLY a JSON object keyed by file number, with one entry for every file below:
+
+{
+  "1": {
+    "javax_to_jakarta": [],
+    "spring_security_updates": [],
+    "dependency_updates": [],
+    "configuration_updates": [],
+    "other_changes": []
+  },
+  "2": { ... }
+}
+
+## JSON Response Rules:
+1. Return ONLY the JSON object - no markdown, no explanation text
+2. **Include an entry for EVERY file number, even when all of its arrays are empty**
+3. **Set each change's "file" field to the File Path of the file it belongs to**
+4. **Only suggest changes for content that exists in THAT file's content - never mix files**
+5. **SCAN EACH FILE'S CONTENT FOR javax.* imports - INCLUDE ALL OF THEM**
+6. **Verify file type matches change type (Java=imports, Build=versions)**
+7. Use only basic ASCII characters in strings
+8. If no changes needed in a category, use empty array: []
+9. **Mark javax→jakarta changes as automatic:true** (they are safe replacements)
+10. Use "automatic": false only for complex changes requiring manual review
+
+"""
+
+# Constant for a whole run, so it extends the cached prefix across files
+CHANGE_ANALYSIS_RUN_CONTEXT = """## Project: `{project_name}`
+
+## Overall Migration Analysis Context:
+{analysis_context}
+
+"""
+
+CHANGE_ANALYSIS_FILE_TEMPLATE = """## File to Analyze:
+**File Path:** {file_path}
+**File Type:** {file_type}
+**File Content:**
+```
+{clean_content}
+```
+
 **SCAN THE FILE CONTENT NOW FOR javax.* IMPORTS AND RETURN THE JSON RESPONSE:**"""
 
+CHANGE_ANALYSIS_BATCH_TEMPLATE = """## Files to Analyze ({file_count} files):
+{files_block}
+
+**SCAN EVERY FILE ABOVE FOR javax.* IMPORTS AND RETURN THE JSON RESPONSE:**"""
+
+
+class MigrationChangeGenerator(Node):
+    """
+    Enhanced change generator with concurrent file processing capabilities.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # LLM calls made by the current exec, counted from worker threads
+        self._llm_calls = 0
+        self._llm_calls_lock = threading.Lock()
+    
+    def prep(self, shared):
+        vlogger = get_verbose_logger()
+        
+        if shared.get("verbose_mode"):
+            vlogger.step("Preparing migration change generation")
+        
+        files_data = shared["files"]
+        skip_paths = get_files_index(shared)["skip"]
+        analysis = shared.get("migration_analysis", {})
+        project_name = shared["project_name"]
+        use_cache = shared.get("use_cache", True)
+        optimization_settings = shared.get("optimization_settings", {})
+        max_workers = shared.get("max_workers") or 4
+        enable_parallel = shared.get("enable_parallel_processing", False)
+        
+        # Defensive check: ensure analysis has required structure
+        if not isinstance(analysis, dict):
+            if shared.get("verbose_mode"):
+                vlogger.warning("Analysis is not a dictionary, using empty analysis")
+            analysis = {}
+        
+        # Ensure critical keys exist with safe defaults
+        if "executive_summary" not in analysis:
+            if shared.get("verbose_mode"):
+                vlogger.warning("Missing executive_summary in analysis, adding default")
+            analysis["executive_summary"] = {
+                "migration_impact": "Unknown - analysis incomplete",
+                "key_blockers": [],
+                "recommended_approach": "Manual review required"
+            }
+        
+        if "detailed_analysis" not in analysis:
+            if shared.get("verbose_mode"):
+                vlogger.warning("Missing detailed_analysis in analysis, adding default")
+            analysis["detailed_analysis"] = {}
+        
+        if shared.get("verbose_mode"):
+            vlogger.debug(f"Analysis validated with keys: {list(analysis.keys())}")
+        
+        return files_data, analysis, project_name, use_cache, optimization_settings, skip_paths, max_workers, enable_parallel
+    
+    def exec(self, prep_res):
+        files_data, analysis, project_name, use_cache, optimization_settings, skip_paths, max_workers, enable_parallel = prep_res
+        self._llm_calls = 0
+        
+        vlogger = get_verbose_logger()
+        if optimization_settings.get("verbose_mode"):
+            vlogger.debug(f"Starting change generation for {len(files_data)} files")
+            vlogger.debug(f"Analysis object type: {type(analysis)}")
+            vlogger.debug(f"Analysis keys: {list(analysis.keys()) if isinstance(analysis, dict) else 'Not a dict'}")
+        
+        # Double-check analysis object integrity before proceeding
+        if not isinstance(analysis, dict):
+            if optimization_settings.get("verbose_mode"):
+                vlogger.error("Analysis is not a dictionary! Creating empty analysis.")
+            analysis = {
+                "executive_summary": {"migration_impact": "Unknown", "key_blockers": []},
+                "detailed_analysis": {}
+            }
+        
+        monitor = get_performance_monitor()
+        monitor.start_operation("migration_change_generation")
+        
+        print(f"🔧 Generating specific migration changes using LLM analysis...")
+        
+        # Initialize changes structure
+        changes = {
+            "javax_to_jakarta": [],
+            "spring_security_updates": [],
+            "dependency_updates": [],
+            "configuration_updates": [],
+            "other_changes": []
+        }
+        
+        # The analysis is the same for every file, so summarize it once
+        analysis_context = self._create_analysis_context(analysis)
+        
+        # Screen files sequentially, then send the survivors to the LLM in batches
+        pending_files = []
+        cache_hits = 0
+        for file_path, content in tqdm(files_data, desc="   Analyzing", unit="file"):
+            try:
+                file_changes = self._screen_file_for_llm(file_path, content, skip_paths)
+            except Exception as e:
+                if optimization_settings.get("verbose_mode"):
+                    vlogger.error(f"Error analyzing {file_path}: {e}")
+                tqdm.write(f"     Error analyzing {file_path}: {e}")
+                # Continue with next file
+                continue
+            
+            if file_changes is None and use_cache:
+                # Unchanged files reuse the changes found for them on an earlier run
+                cache_key = self._file_changes_cache_key(file_path, content, analysis_context, project_name)
+                file_changes = load_cached_analysis("migration_changes", cache_key) if cache_key else None
+                cache_hits += file_changes is not None
+            if file_changes is None:
+                pending_files.append((file_path, content))
+                continue
+            for change_type, file_change_list in file_changes.items():
+                changes[change_type].extend(file_change_list)
+        
+        batches = []
+        pending_iter = iter(pending_files)
+        while file_batch := list(islice(pending_iter, LLM_FILE_BATCH_SIZE)):
+            batches.append(file_batch)
+        
+        # With parallel processing on, LLM calls block on HTTP so they overlap
+        # in threads; results are kept in batch order and merged here so the
+        # change lists stay deterministic
+        batch_results = [None] * len(batches)
+        if cache_hits:
+            print(f"   💾 Reusing cached changes for {cache_hits} unchanged files")
+        if batches:
+            analyze_batch = partial(self._analyze_files_batch, analysis_context=analysis_context,
+                                    project_name=project_name, use_cache=use_cache)
+            print(f"   Sending {len(pending_files)} files to the LLM in {len(batches)} batches...")
+            executor = None
+            if enable_parallel and len(batches) > 1:
+                executor = ThreadPoolExecutor(max_workers=min(max_workers, len(batches)))
+                futures = {executor.submit(analyze_batch, file_batch): index for index, file_batch in enumerate(batches)}
+                completed = ((futures[future], future.result) for future in as_completed(futures))
+            else:
+                completed = ((index, partial(analyze_batch, file_batch)) for index, file_batch in enumerate(batches))
+            try:
+                for index, batch_result in tqdm(completed, total=len(batches), desc="   LLM batches", unit="batch"):
+                    try:
+                        batch_results[index] = batch_result()
+                    except Exception as e:
+                        first_path = batches[index][0][0]
+                        if optimization_settings.get("verbose_mode"):
+                            vlogger.error(f"Error analyzing batch starting with {first_path}: {e}")
+                        tqdm.write(f"     Error analyzing batch starting with {first_path}: {e}")
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+        
+        for results in batch_results:
+            for file_changes in results or ():
+                for change_type, file_change_list in file_changes.items():
+                    changes[change_type].extend(file_change_list)
+        
+        monitor.end_operation("migration_change_generation", 
+                            files_processed=len(files_data),
+                            llm_calls=self._llm_calls)
+        
+        return changes
+    
+    def _screen_file_for_llm(self, file_path, content, skip_paths=None):
+        """
+        Run the cheap checks that settle a file without asking the LLM.
+
+        Returns:
+            dict or None: the file's changes when no LLM call is needed,
+            None when the file should be analyzed by the LLM
+        """
+        # Skip analysis for very large files or binary-like content
+        if len(content) > 20000:
+            tqdm.write(f"     Skipping large file: {file_path}")
+            return self._get_empty_changes()
+        
+        if not self._is_text_file(file_path, content):
+            tqdm.write(f"     Skipping non-text file: {file_path}")
+            return self._get_empty_changes()
+        
+        # Skip files that are unlikely to need Spring migration changes
+        skip_file = file_path in skip_paths if skip_paths is not None else self._should_skip_file(file_path)
+        if skip_file:
+            tqdm.write(f"     Skipping non-migration-relevant file: {file_path}")
+            return self._get_empty_changes()
+        
+        # **NEW: Check Java version compatibility FIRST**
+        if file_path.endswith(('pom.xml', '.gradle', '.gradle.kts')):
+            java_version_issues = self._check_java_version_compatibility(content, file_path)
+            if java_version_issues:
+                # Return Java version issues as high-priority changes
+                return java_version_issues
+        
+        # **NEW: Pre-filter files that don't actually need changes**
+        if not self._file_needs_migration_analysis(file_path, content):
+            # Silently skip - no need to report files that don't need changes
+            return self._get_empty_changes()
+        
+        return None
+    
+    def _analyze_file_with_llm(self, file_path, content, analysis_context, project_name, use_cache, skip_paths=None):
+        """Use LLM to analyze a single file and generate specific changes needed."""
+        
+        screened_changes = self._screen_file_for_llm(file_path, content, skip_paths)
+        if screened_changes is not None:
+            return screened_changes
+        
+        # Prepare file content for LLM (limit size and clean it)
+        clean_content = self._prepare_file_content_for_llm(content, file_path)
+        
+        cache_prefix = CHANGE_ANALYSIS_PROMPT_PREFIX + CHANGE_ANALYSIS_RUN_CONTEXT.format_map({
+            "project_name": project_name,
+            "analysis_context": analysis_context
+        })
+        prompt = cache_prefix + CHANGE_ANALYSIS_FILE_TEMPLATE.format_map({
+            "file_path": file_path,
+            "file_type": self._get_file_type(file_path),
+            "clean_content": clean_content
+        })
+
         try:
-            response = call_llm(prompt, use_cache=(use_cache and self.cur_retry == 0))
+            response = self._call_llm(prompt, use_cache, cache_prefix)
             
             # Enhanced debugging
             if len(response) < 50:
@@ -2402,25 +2916,12 @@ Your response must be ONLY a JSON object with this exact structure:
                 return self._get_empty_changes()
             
             # Parse JSON
-            file_changes = json.loads(json_str)
-            
-            # Validate structure
-            expected_keys = ["javax_to_jakarta", "spring_security_updates", "dependency_updates", "configuration_updates", "other_changes"]
-            for key in expected_keys:
-                if key not in file_changes:
-                    file_changes[key] = []
-            
-            # **NEW: Enhanced validation that verifies changes against actual file content**
-            validated_changes = self._validate_and_filter_changes(file_changes, content, file_path)
-            
-            # Report success only if there are real validated changes
-            total_changes = sum(len(changes) for changes in validated_changes.values())
-            if total_changes > 0:
-                print(f"     ✅ Found {total_changes} validated changes for {file_path}")
-                return validated_changes
-            else:
-                # No real changes found after validation - return empty 
-                return self._get_empty_changes()
+            file_changes = json_loads(json_str)
+            
+            cache_key = None
+            if use_cache and not is_fallback_response(response):
+                cache_key = self._file_changes_cache_key(file_path, content, analysis_context, project_name)
+            return self._validated_file_changes(file_changes, content, file_path, cache_key)
             
         except json.JSONDecodeError as e:
             print(f"     JSON parsing error for {file_path}: {e}")
@@ -2429,136 +2930,114 @@ Your response must be ONLY a JSON object with this exact structure:
             print(f"     Error analyzing {file_path}: {e}")
             return self._get_empty_changes()
     
-    def _file_needs_migration_analysis(self, file_path, content):
-        """Check if a file actually needs migration analysis by looking for relevant patterns."""
-        content_lower = content.lower()
+    def _call_llm(self, prompt, use_cache, cache_prefix):
+        """Call the LLM for change analysis, counting the call for the performance report."""
+        with self._llm_calls_lock:
+            self._llm_calls += 1
+        return call_llm(retry_prompt(prompt, self.cur_retry), use_cache=use_cache, cache_prefix=cache_prefix)
+    
+    def _file_changes_cache_key(self, file_path, content, analysis_context, project_name):
+        """Key a file's validated changes by the run context, its path and its content."""
+        return analysis_cache_key(CHANGE_ANALYSIS_PROMPT_PREFIX, analysis_context, project_name, file_path, content)
+    
+    def _validated_file_changes(self, file_changes, content, file_path, cache_key=None):
+        """
+        Complete a parsed per-file result and keep only changes backed by the file content.
         
-        # **ENHANCED: Check for javax imports that need migration**
-        if 'import javax.' in content:
-            return True
+        With a cache_key the validated result is persisted for later runs.
+        """
+        # Validate structure
+        expected_keys = ["javax_to_jakarta", "spring_security_updates", "dependency_updates", "configuration_updates", "other_changes"]
+        for key in expected_keys:
+            if key not in file_changes:
+                file_changes[key] = []
         
-        # **ENHANCED: JPA/Hibernate specific patterns**
-        jpa_hibernate_patterns = [
-            'import javax.persistence.',
-            '@entity',
-            '@table',
-            '@column',
-            '@id',
-            '@generatedvalue',
-            '@onetomany',
-            '@manytoone',
-            '@joincolumn',
-            '@embeddable',
-            '@entitylisteners',
-            'hibernatetemplate',
-            'sessionfactory',
-            'jpatemplate'
-        ]
-        
-        if any(pattern in content_lower for pattern in jpa_hibernate_patterns):
-            return True
+        # **NEW: Enhanced validation that verifies changes against actual file content**
+        validated_changes = self._validate_and_filter_changes(file_changes, content, file_path)
         
-        # **ENHANCED: Spring Security patterns that might need updates**
-        spring_security_patterns = [
-            'websecurityconfigureradapter',
-            'authorizeequests()',
-            'antmatchers(',
-            'spring.security.',
-            '@enablewebsecurity',
-            '@enableglobalmethodsecurity',
-            'httpsecurity',
-            'authenticationmanager',
-            'userdetailsservice',
-            'passwordencoder',
-            'csrf()',
-            'cors()',
-            'oauth2',
-            'jwt'
-        ]
-        
-        if any(pattern in content_lower for pattern in spring_security_patterns):
-            return True
+        # Report success only if there are real validated changes
+        total_changes = sum(len(changes) for changes in validated_changes.values())
+        if total_changes > 0:
+            print(f"     ✅ Found {total_changes} validated changes for {file_path}")
+        else:
+            # No real changes found after validation - return empty 
+            validated_changes = self._get_empty_changes()
         
-        # **NEW: JUnit 4→5 migration patterns**
-        junit_patterns = [
-            '@test',
-            '@before',
-            '@after',
-            '@beforeclass',
-            '@afterclass',
-            '@runwith',
-            '@rule',
-            '@ignore',
-            'import org.junit.test',
-            'import org.junit.before',
-            'import org.junit.after',
-            'import org.junit.assert',
-            'runner.class',
-            'springrunner',
-            'mockitojunitrunner'
-        ]
-        
-        if any(pattern in content_lower for pattern in junit_patterns):
-            return True
+        if cache_key:
+            store_cached_analysis("migration_changes", cache_key, validated_changes)
+        return validated_changes
+    
+    def _analyze_files_batch(self, file_batch, analysis_context, project_name, use_cache):
+        """
+        Analyze several screened files with a single LLM call.
+
+        The prompt numbers the files and asks for one JSON object keyed by
+        file number. Files whose entry is missing or unusable are analyzed
+        again on their own so a bad batch answer never loses changes.
+
+        Returns:
+            list: one changes dict per file, in file_batch order
+        """
+        if len(file_batch) == 1:
+            file_path, content = file_batch[0]
+            return [self._analyze_file_with_llm(file_path, content, analysis_context, project_name, use_cache)]
+        
+        file_sections = []
+        for index, (file_path, content) in enumerate(file_batch, 1):
+            clean_content = self._prepare_file_content_for_llm(content, file_path)
+            file_sections.append(f"""### File {index}
+**File Path:** {file_path}
+**File Type:** {self._get_file_type(file_path)}
+**File Content:**
+```
+{clean_content}
+```""")
         
-        # **NEW: Mockito annotation patterns**
-        mockito_patterns = [
-            '@mock',
-            '@injectmocks',
-            '@spy',
-            '@captor',
-            '@mockbean',
-            '@spybean',
-            'mockitoannotations',
-            'mockito.when',
-            'mockito.verify',
-            'argumentcaptor'
-        ]
-        
-        if any(pattern in content_lower for pattern in mockito_patterns):
-            return True
+        cache_prefix = CHANGE_ANALYSIS_BATCH_PROMPT_PREFIX + CHANGE_ANALYSIS_RUN_CONTEXT.format_map({
+            "project_name": project_name,
+            "analysis_context": analysis_context
+        })
+        prompt = cache_prefix + CHANGE_ANALYSIS_BATCH_TEMPLATE.format_map({
+            "file_count": len(file_batch),
+            "files_block": "\n\n".join(file_sections)
+        })
+        
+        batch_label = f"batch of {len(file_batch)} files"
+        batch_changes = {}
+        cacheable = False
+        try:
+            response = self._call_llm(prompt, use_cache, cache_prefix)
+            cacheable = use_cache and not is_fallback_response(response)
+            json_str = self._extract_and_clean_json(response, batch_label)
+            if json_str:
+                batch_changes = json_loads(json_str)
+        except Exception as e:
+            print(f"     Error analyzing {batch_label}: {e}")
         
-        # **ENHANCED: Spring Test patterns that need migration**
-        spring_test_patterns = [
-            '@springboottest',
-            '@datajpatest',
-            '@webmvctest',
-            '@jsontest',
-            '@restclienttest',
-            '@mockmvctest',
-            'mockmvc',
-            'testresttemplate',
-            'webapplicationcontext',
-            '@testconfiguration',
-            '@testpropertysource',
-            '@activeprofiles',
-            '@sql',
-            '@transactional',
-            'import org.springframework.test',
-            'import org.springframework.boot.test',
-            '@testmethodorder',
-            '@testinstance',
-            '@parametrizedtest'
-        ]
-        
-        if any(pattern in content_lower for pattern in spring_test_patterns):
+        results = []
+        for index, (file_path, content) in enumerate(file_batch, 1):
+            file_changes = batch_changes.get(str(index)) if isinstance(batch_changes, dict) else None
+            if isinstance(file_changes, dict):
+                try:
+                    cache_key = None
+                    if cacheable:
+                        cache_key = self._file_changes_cache_key(file_path, content, analysis_context, project_name)
+                    results.append(self._validated_file_changes(file_changes, content, file_path, cache_key))
+                    continue
+                except Exception as e:
+                    print(f"     Error validating batched changes for {file_path}: {e}")
+            results.append(self._analyze_file_with_llm(file_path, content, analysis_context, project_name, use_cache))
+        return results
+    
+    def _file_needs_migration_analysis(self, file_path, content):
+        """Check if a file actually needs migration analysis by looking for relevant patterns."""
+        # One case-insensitive scan covers every trigger; no lowered copy is made
+        if MIGRATION_TRIGGER_RE.search(content):
             return True
         
         # **ENHANCED: Configuration files that might need updates**
-        if file_path.endswith(('.xml', '.properties', '.yml', '.yaml')):
-            config_patterns = [
-                'javax.',
-                'spring.security',
-                'hibernate.ddl',
-                'spring.jpa',
-                'spring.test',
-                'junit.',
-                'logging.level.org.springframework',
-                'management.endpoints',
-                'spring.datasource'
-            ]
-            if any(pattern in content_lower for pattern in config_patterns):
-                return True
+        if file_path.endswith(('.xml', '.properties', '.yml', '.yaml')) and CONFIG_MIGRATION_TRIGGER_RE.search(content):
+            return True
         
         # **ENHANCED: Build files (always analyze, but with enhanced patterns)**
         if file_path.endswith(('pom.xml', '.gradle', '.gradle.kts', 'build.gradle.kts')):
@@ -2586,7 +3065,8 @@ Your response must be ONLY a JSON object with this exact structure:
     
     def _validate_change_against_content(self, change, content, file_path, category):
         """Validate that a specific change actually applies to the file content."""
-        if not isinstance(change, dict):
+        # Reject malformed changes before any content is scanned for them
+        if not isinstance(change, dict) or not change.keys() >= REQUIRED_CHANGE_FIELDS:
             return False
         
         # **NEW: Enhanced validation to catch false positives**
@@ -2638,11 +3118,6 @@ Your response must be ONLY a JSON object with this exact structure:
                 print(f"     🚨 REJECTED: Dependency update suggested for non-build file: {file_path}")
                 return False
         
-        # Basic validation that change has required fields
-        required_fields = ["file", "type", "description"]
-        if not all(field in change for field in required_fields):
-            return False
-        
         return True
     
     def _validate_change_logic(self, change, content, file_path, category):
@@ -2739,7 +3214,6 @@ Your response must be ONLY a JSON object with this exact structure:
             
             # Check for realistic version patterns
             if any(keyword in change_type.lower() for keyword in ["version", "spring", "boot", "junit", "mockito"]):
-                import re
                 version_pattern = r'^\d+\.\d+'
                 if from_value and not re.match(version_pattern, from_value) and not from_value.endswith('.RELEASE'):
                     if not any(from_value in content for content in [content]):  # Quick content check
@@ -2766,7 +3240,6 @@ Your response must be ONLY a JSON object with this exact structure:
     def _save_debug_response(self, file_path, response):
         """Save problematic LLM responses for debugging."""
         try:
-            import os
             debug_dir = "./debug_responses"
             os.makedirs(debug_dir, exist_ok=True)
             
@@ -2786,82 +3259,48 @@ Your response must be ONLY a JSON object with this exact structure:
     
     def _should_skip_file(self, file_path):
         """Check if file should be skipped for migration analysis."""
-        # Skip certain file types that are unlikely to need Spring migration changes
-        skip_extensions = {'.md', '.txt', '.log', '.json', '.csv', '.sql', '.sh', '.bat', '.png', '.jpg', '.gif'}
-        skip_patterns = {
-            'readme', 'changelog', 'license', 
-            'docker', 'target/', 'build/', 'node_modules/', '.git/', '.idea/'
-        }
-        
-        # Check extension
-        file_lower = file_path.lower()
-        if any(file_lower.endswith(ext) for ext in skip_extensions):
-            return True
-        
-        # Check patterns (using more specific patterns to avoid false positives)
-        if any(pattern in file_lower for pattern in skip_patterns):
-            return True
-        
-        # Skip large non-Java files (properties files with many entries)
-        if file_path.endswith('.properties') and len(file_path.split('/')) > 4:
-            # Skip deeply nested properties files which are likely translations/configs
-            return True
-        
-        return False
+        return should_skip_migration_file(file_path)
     
     def _get_file_type(self, file_path):
         """Get a simple description of file type for LLM context."""
         file_lower = file_path.lower()
         
-        # Check if it's a test file
-        if ('/test/' in file_lower or 
-            file_lower.endswith('test.java') or 
-            file_lower.endswith('tests.java') or
-            'test' in os.path.basename(file_lower)):
+        # Check if it's a test file (a *test.java / *tests.java name contains "test" too)
+        if '/test/' in file_lower or 'test' in os.path.basename(file_lower):
             return "Java test file"
-        elif file_path.endswith('.java'):
-            return "Java source file"
-        elif file_path.endswith('.xml'):
-            return "XML configuration file"
-        elif file_path.endswith('.properties'):
-            return "Properties configuration file"
-        elif file_path.endswith(('.yml', '.yaml')):
-            return "YAML configuration file"
-        elif file_path.endswith(('.gradle', '.gradle.kts')):
+        if file_path.endswith('.gradle.kts'):
             return "Gradle build file"
-        elif file_path.endswith('pom.xml'):
-            return "Maven POM file"
-        else:
-            return "Configuration file"
+        # Everything else is decided by the extension alone
+        return FILE_TYPE_BY_EXTENSION.get(os.path.splitext(file_path)[1], "Configuration file")
     
     def _prepare_file_content_for_llm(self, content, file_path):
         """Prepare file content for LLM analysis by cleaning and limiting size."""
         # Limit content size for LLM
         max_content_length = 5000
         
-        if len(content) > max_content_length:
-            # For Java files, try to keep imports and class declarations
-            if file_path.endswith('.java'):
-                lines = content.split('\n')
-                imports = [line for line in lines[:50] if line.strip().startswith('import') or line.strip().startswith('package')]
-                class_lines = [line for line in lines if any(keyword in line for keyword in ['class ', 'interface ', '@', 'public ', 'private ', 'protected '])]
-                
-                # Combine imports + key class lines + truncation notice
-                key_content = '\n'.join(imports[:20] + class_lines[:30])
-                content = key_content + f"\n\n... [File truncated - original length: {len(content)} chars] ..."
-            else:
-                # For other files, just truncate with notice
-                content = content[:max_content_length] + f"\n\n... [File truncated - original length: {len(content)} chars] ..."
+        # Java changes hinge on imports, annotations and declarations, so only
+        # those lines are sent; build and config files keep every line
+        if file_path.endswith('.java'):
+            summary = java_structural_summary(content)
+            if len(summary) > max_content_length:
+                # Cut at a line boundary so no statement is sent half-written
+                cut = summary.rfind('\n', 0, max_content_length)
+                summary = summary[:cut if cut > 0 else max_content_length]
+            content = summary + f"\n\n... [Structural summary - original length: {len(content)} chars] ..."
+        elif len(content) > max_content_length:
+            # For other files, just truncate with notice
+            content = content[:max_content_length] + f"\n\n... [File truncated - original length: {len(content)} chars] ..."
         
         # Clean content for JSON safety
         # Remove or escape problematic characters
-        content = content.replace('\r\n', '\n').replace('\r', '\n')
+        if '\r' in content:
+            content = NEWLINE_RE.sub('\n', content)
         
         # For properties files, limit to first few lines to avoid parsing issues
         if file_path.endswith('.properties'):
-            lines = content.split('\n')
-            if len(lines) > 50:
-                content = '\n'.join(lines[:50]) + f"\n\n... [Properties file truncated - {len(lines)} total lines] ..."
+            line_count = content.count('\n') + 1
+            if line_count > 50:
+                content = content[:lines_end_offset(content, 50)] + f"\n\n... [Properties file truncated - {line_count} total lines] ..."
         
         return content
     
@@ -2875,40 +3314,11 @@ Your response must be ONLY a JSON object with this exact structure:
                 print(f"     Empty response from LLM for {file_path}")
                 return None
             
-            json_str = None
+            # Skip past a ```json fence, then take the first balanced object in a
+            # single scan; a closing fence or trailing prose is never reached
+            fence = response.find("```json")
+            json_str = find_json_span(response[fence + 7:] if fence != -1 else response)
             
-            # Method 1: Try to find JSON block in markdown format
-            if "```json" in response:
-                json_str = response.split("```json")[1].split("```")[0].strip()
-                if json_str:
-                    print(f"     Found JSON in markdown block for {file_path}")
-                
-            # Method 2: Check if entire response is JSON
-            elif response.startswith("{") and response.endswith("}"):
-                json_str = response
-                print(f"     Using entire response as JSON for {file_path}")
-                
-            # Method 3: Try to find JSON-like content with regex
-            else:
-                import re
-                # Look for JSON objects that might have text before/after
-                json_patterns = [
-                    r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}',  # Simple nested JSON
-                    r'\{(?:[^{}]|\\.|\"[^\"]*\")*\}',     # JSON with escaped quotes
-                    r'\{.*?\}(?=\s*(?:\n|$))',           # JSON ending at line boundary
-                    r'\{.*?\}(?=\s*[^\w])',              # JSON followed by non-word chars
-                ]
-                
-                for pattern in json_patterns:
-                    json_match = re.search(pattern, response, re.DOTALL)
-                    if json_match:
-                        potential_json = json_match.group(0)
-                        # Quick validation - try to count braces
-                        if potential_json.count('{') == potential_json.count('}'):
-                            json_str = potential_json
-                            print(f"     Found JSON with pattern match for {file_path}")
-                            break
-                
             if not json_str:
                 print(f"     No JSON structure found in response for {file_path}")
                 print(f"     Response preview: {response[:200]}...")
@@ -2920,6 +3330,17 @@ Your response must be ONLY a JSON object with this exact structure:
             # Remove any trailing incomplete content (commas, etc.)
             json_str = json_str.rstrip(',\n\r\t ')
             
+            # A truncated response is closed from the scanner's open-bracket stack
+            json_str += missing_json_closers(json_str)
+            
+            # Well-formed answers need none of the line-by-line cleaning below
+            try:
+                json_loads(json_str)
+                print(f"     Successfully parsed JSON for {file_path}")
+                return json_str
+            except json.JSONDecodeError:
+                pass
+            
             # Advanced JSON cleaning
             json_str = self._advanced_json_cleaning(json_str, file_path)
             
@@ -2929,7 +3350,7 @@ Your response must be ONLY a JSON object with this exact structure:
             
             # Test parse to validate
             try:
-                test_parse = json.loads(json_str)
+                json_loads(json_str)
                 print(f"     Successfully parsed JSON for {file_path}")
                 return json_str
             except json.JSONDecodeError as e:
@@ -2939,7 +3360,7 @@ Your response must be ONLY a JSON object with this exact structure:
                 fixed_json = self._attempt_json_repair(json_str, file_path)
                 if fixed_json:
                     try:
-                        json.loads(fixed_json)
+                        json_loads(fixed_json)
                         print(f"     Successfully repaired JSON for {file_path}")
                         return fixed_json
                     except:
@@ -2957,7 +3378,6 @@ Your response must be ONLY a JSON object with this exact structure:
         """Advanced JSON cleaning with multiple repair strategies."""
         try:
             # Remove common problematic patterns
-            import re
             
             # 1. Fix unescaped quotes in strings - much simpler approach
             lines = json_str.split('\n')
@@ -2987,7 +3407,6 @@ Your response must be ONLY a JSON object with this exact structure:
                             if value_part.count('"') > 2:  # More than just opening and closing
                                 # Use regex to find and fix only internal quotes
                                 # Pattern: "anything with "quotes" inside"
-                                import re
                                 # This pattern captures: "start_text "quoted_text" end_text"
                                 pattern = r'^"([^"]*)"([^"]*)"([^"]*)"(.*)$'
                                 match = re.match(pattern, value_part)
@@ -3001,31 +3420,8 @@ Your response must be ONLY a JSON object with this exact structure:
             
             cleaned_json = '\n'.join(cleaned_lines)
             
-            # 2. Balance brackets and braces
-            open_braces = cleaned_json.count('{')
-            close_braces = cleaned_json.count('}')
-            open_brackets = cleaned_json.count('[')
-            close_brackets = cleaned_json.count(']')
-            
-            if open_braces > close_braces:
-                cleaned_json += '}' * (open_braces - close_braces)
-            elif close_braces > open_braces:
-                # Remove extra closing braces from the end
-                extra_braces = close_braces - open_braces
-                for _ in range(extra_braces):
-                    last_brace = cleaned_json.rfind('}')
-                    if last_brace != -1:
-                        cleaned_json = cleaned_json[:last_brace] + cleaned_json[last_brace + 1:]
-            
-            if open_brackets > close_brackets:
-                cleaned_json += ']' * (open_brackets - close_brackets)
-            elif close_brackets > open_brackets:
-                # Remove extra closing brackets from the end
-                extra_brackets = close_brackets - open_brackets
-                for _ in range(extra_brackets):
-                    last_bracket = cleaned_json.rfind(']')
-                    if last_bracket != -1:
-                        cleaned_json = cleaned_json[:last_bracket] + cleaned_json[last_bracket + 1:]
+            # 2. Close any object/array the quote fixes left open
+            cleaned_json += missing_json_closers(cleaned_json)
             
             return cleaned_json
             
@@ -3036,7 +3432,6 @@ Your response must be ONLY a JSON object with this exact structure:
     def _attempt_json_repair(self, json_str, file_path):
         """Attempt to repair malformed JSON with specific strategies."""
         try:
-            import re
             
             # Strategy 1: Remove trailing commas
             json_str = re.sub(r',(\s*[}\]])', r'\1', json_str)
@@ -3081,16 +3476,23 @@ Your response must be ONLY a JSON object with this exact structure:
     
     def _is_text_file(self, file_path, content):
         """Check if a file appears to be a text file suitable for analysis."""
-        # Use the same logic as RobustFileReader for consistency
+        # Use the same logic as RobustFileReader for consistency: judge the
+        # file by its head, the way the detector samples the first bytes
+        head = content[:TEXT_SAMPLE_SIZE]
         try:
+            if isinstance(head, (bytes, bytearray)):
+                if b'\x00' in head:
+                    return False
+                head = head.decode('utf-8', errors='ignore')
+            
             # Check for null bytes (common in binary files)
-            if b'\x00' in content.encode('utf-8', errors='ignore'):
+            if '\x00' in head:
                 return False
                 
             # Check for high ratio of non-printable characters
-            if len(content) > 0:
-                printable_chars = sum(1 for char in content if char.isprintable() or char in ['\n', '\r', '\t'])
-                printable_ratio = printable_chars / len(content)
+            if len(head) > 0:
+                printable_chars = sum(1 for char in head if char.isprintable() or char in ['\n', '\r', '\t'])
+                printable_ratio = printable_chars / len(head)
                 
                 # If less than 70% printable characters, likely binary
                 if printable_ratio < 0.7:
@@ -3162,11 +3564,10 @@ Your response must be ONLY a JSON object with this exact structure:
                 return False
             
             # Required fields for all changes
-            required_fields = ["file", "type", "description"]
-            for field in required_fields:
-                if field not in change:
-                    print(f"     Warning: Change for {file_path} missing required field: {field}")
-                    return False
+            missing_fields = REQUIRED_CHANGE_FIELDS - change.keys()
+            if missing_fields:
+                print(f"     Warning: Change for {file_path} missing required field: {min(missing_fields)}")
+                return False
             
             # Ensure file path is correct
             if change.get("file") != file_path:
@@ -3190,8 +3591,6 @@ Your response must be ONLY a JSON object with this exact structure:
     
     def _check_java_version_compatibility(self, content, file_path):
         """Check if the Java version meets Spring 6 requirements (Java 17+)."""
-        import re
-        
         java_version = None
         
         # Detect Java version in build files
@@ -3497,14 +3896,15 @@ Your response must be ONLY a JSON object with this exact structure:
         if line_report["by_file"]:
             print(f"\n   📄 Files Requiring Changes:")
             
-            # Sort files by number of changes
-            sorted_files = sorted(
+            # Only the 10 files with the most changes are shown, so select
+            # them instead of sorting every file
+            top_files = heapq.nlargest(
+                10,
                 line_report["by_file"].items(),
-                key=lambda x: len(x[1]["changes"]),
-                reverse=True
+                key=lambda x: len(x[1]["changes"])
             )
             
-            for file_path, file_info in sorted_files[:10]:  # Show top 10
+            for file_path, file_info in top_files:
                 change_count = len(file_info["changes"])
                 lines_affected = file_info["total_lines_affected"]
                 categories = ", ".join(cat.replace('_', ' ').title() for cat in file_info["categories"])
@@ -3514,7 +3914,7 @@ Your response must be ONLY a JSON object with this exact structure:
                 print(f"         🏷️  Categories: {categories}")
                 
                 # Show specific changes for this file
-                for change in file_info["changes"][:3]:  # Show first 3 changes
+                for change in islice(file_info["changes"], 3):  # Show first 3 changes
                     change_type = change["type"].replace('_', ' ').title()
                     line_info = ""
                     if change["line_numbers"]:
@@ -3526,8 +3926,8 @@ Your response must be ONLY a JSON object with this exact structure:
                     remaining = len(file_info["changes"]) - 3
                     print(f"         ... and {remaining} more changes")
             
-            if len(sorted_files) > 10:
-                remaining_files = len(sorted_files) - 10
+            if len(line_report["by_file"]) > 10:
+                remaining_files = len(line_report["by_file"]) - 10
                 print(f"      ... and {remaining_files} more files")
 
     def _format_line_range(self, line_numbers):
@@ -3557,36 +3957,6 @@ Your response must be ONLY a JSON object with this exact structure:
         comprehensive_changes = {}
         javax_pattern = re.compile(r'import\s+(javax\.[a-zA-Z][a-zA-Z0-9_.]*)')
         
-        # Comprehensive javax→jakarta mappings
-        javax_to_jakarta_mappings = {
-            # Core EE packages  
-            "javax.persistence": "jakarta.persistence",
-            "javax.validation": "jakarta.validation",
-            "javax.servlet": "jakarta.servlet", 
-            "javax.annotation": "jakarta.annotation",
-            "javax.ejb": "jakarta.ejb",
-            "javax.jms": "jakarta.jms",
-            "javax.enterprise": "jakarta.enterprise",
-            "javax.inject": "jakarta.inject",
-            "javax.interceptor": "jakarta.interceptor",
-            "javax.decorator": "jakarta.decorator",
-            "javax.transaction": "jakarta.transaction",
-            "javax.ws.rs": "jakarta.ws.rs",
-            "javax.json": "jakarta.json",
-            "javax.jsonb": "jakarta.jsonb",
-            "javax.mail": "jakarta.mail",
-            "javax.faces": "jakarta.faces",
-            "javax.websocket": "jakarta.websocket",
-            "javax.security.enterprise": "jakarta.security.enterprise",
-            "javax.security.auth.message": "jakarta.security.auth.message",
-            "javax.xml.bind": "jakarta.xml.bind",
-            "javax.xml.soap": "jakarta.xml.soap", 
-            "javax.xml.ws": "jakarta.xml.ws",
-            "javax.batch": "jakarta.batch",
-            "javax.enterprise.concurrent": "jakarta.enterprise.concurrent",
-            "javax.security.jacc": "jakarta.security.jacc",
-        }
-        
         total_javax_found = 0
         total_files_scanned = 0
         
@@ -3610,7 +3980,7 @@ Your response must be ONLY a JSON object with this exact structure:
                     
                     # Find matching jakarta equivalent
                     jakarta_import = None
-                    for javax_pkg, jakarta_pkg in javax_to_jakarta_mappings.items():
+                    for javax_pkg, jakarta_pkg in JAVAX_TO_JAKARTA_MAPPINGS.items():
                         if javax_import.startswith(javax_pkg):
                             jakarta_import = javax_import.replace(javax_pkg, jakarta_pkg, 1)
                             break
@@ -3652,6 +4022,64 @@ Your response must be ONLY a JSON object with this exact structure:
         return None
 
 
+# javax packages and their Jakarta EE replacements
+JAVAX_TO_JAKARTA_MAPPINGS = {
+    # Core EE packages
+    "javax.persistence": "jakarta.persistence",
+    "javax.validation": "jakarta.validation", 
+    "javax.servlet": "jakarta.servlet",
+    "javax.annotation": "jakarta.annotation",
+    "javax.ejb": "jakarta.ejb",
+    "javax.jms": "jakarta.jms",
+    "javax.enterprise": "jakarta.enterprise",
+    "javax.inject": "jakarta.inject",
+    "javax.interceptor": "jakarta.interceptor",
+    "javax.decorator": "jakarta.decorator",
+    "javax.transaction": "jakarta.transaction",
+    "javax.ws.rs": "jakarta.ws.rs",
+    "javax.json": "jakarta.json",
+    "javax.jsonb": "jakarta.jsonb",
+    "javax.mail": "jakarta.mail",
+    "javax.faces": "jakarta.faces",
+    "javax.websocket": "jakarta.websocket",
+    "javax.security.enterprise": "jakarta.security.enterprise",
+    "javax.security.auth.message": "jakarta.security.auth.message",
+    "javax.xml.bind": "jakarta.xml.bind",
+    "javax.xml.soap": "jakarta.xml.soap",
+    "javax.xml.ws": "jakarta.xml.ws",
+    # Batch processing
+    "javax.batch": "jakarta.batch",
+    # Concurrency utilities  
+    "javax.enterprise.concurrent": "jakarta.enterprise.concurrent",
+    # Authentication
+    "javax.security.jacc": "jakarta.security.jacc",
+}
+
+# Any import (static or not) from a mapped javax package, in one alternation;
+# longer packages come first so the most specific one is captured
+JAVAX_IMPORT_RE = re.compile(
+    r'^([^\S\n]*import\s+(?:static\s+)?)('
+    + "|".join(re.escape(p) for p in sorted(JAVAX_TO_JAKARTA_MAPPINGS, key=len, reverse=True))
+    + r')(\.[^;\n]+?)(\s*;)',
+    re.MULTILINE
+)
+
+
+@lru_cache(maxsize=256)
+def javax_import_patterns(from_import):
+    """
+    Compile the standard, static and wildcard import patterns for one javax
+    import. The same few dozen imports recur across every file of a project,
+    so each set is built once.
+    """
+    escaped = re.escape(from_import)
+    return (
+        re.compile(rf'^(\s*import\s+){escaped}(\s*;.*?)$', re.MULTILINE),
+        re.compile(rf'^(\s*import\s+static\s+){escaped}(\.[^;]+\s*;.*?)$', re.MULTILINE),
+        re.compile(rf'^(\s*import\s+){escaped}(\.\*\s*;.*?)$', re.MULTILINE),
+    )
+
+
 class MigrationFileApplicator(Node):
     """
     Actually applies the generated migration changes to files in the migration workspace.
@@ -3726,6 +4154,11 @@ class MigrationFileApplicator(Node):
         # **NEW: Force Spring Boot version updates in build files**
         self._force_spring_boot_updates(migration_workspace, results)
         
+        # Changes edit files in memory; each changed file is written once below
+        file_contents = {}
+        dirty_files = set()
+        applied_by_path = {}
+        
         # Process each category of changes
         for category, changes in generated_changes.items():
             if not isinstance(changes, list):
@@ -3738,11 +4171,12 @@ class MigrationFileApplicator(Node):
                     continue
                 
                 try:
-                    result = self._apply_single_change(change, migration_workspace, category)
+                    result = self._apply_single_change(change, migration_workspace, category, file_contents, dirty_files)
                     
                     if result["success"]:
                         results["successful"].append(result)
                         results["files_modified"].add(change.get("file", "unknown"))
+                        applied_by_path.setdefault(os.path.join(migration_workspace, change["file"]), []).append(result)
                         results["total_changes_applied"] += 1
                         print(f"   ✅ {result['description']}")
                     elif result.get("skipped", False):
@@ -3762,6 +4196,22 @@ class MigrationFileApplicator(Node):
                     results["failed"].append(error_result)
                     print(f"   ❌ Error applying change to {change.get('file', 'unknown')}: {e}")
         
+        for full_file_path in sorted(dirty_files):
+            try:
+                self._write_workspace_file(full_file_path, file_contents[full_file_path])
+            except Exception as e:
+                # The file kept its old content, so none of its changes were applied
+                lost = applied_by_path[full_file_path]
+                lost_ids = {id(result) for result in lost}
+                results["successful"] = [r for r in results["successful"] if id(r) not in lost_ids]
+                results["total_changes_applied"] -= len(lost)
+                # A force update may already have written this file; it stays modified then
+                if not any(r["file"] == lost[0]["file"] for r in results["successful"]):
+                    results["files_modified"].discard(lost[0]["file"])
+                for result in lost:
+                    results["failed"].append({**result, "success": False, "error": f"Error writing file: {e}"})
+                print(f"   ❌ Error writing {lost[0]['file']}: {e}")
+        
         # Summary
         total_successful = len(results["successful"])
         total_skipped = len(results["skipped"])
@@ -3782,9 +4232,6 @@ class MigrationFileApplicator(Node):
     
     def _force_spring_boot_updates(self, migration_workspace, results):
         """Force Spring Boot version updates in build files regardless of LLM detection."""
-        import os
-        import re
-        
         print(f"\n🔍 Checking for Spring Boot version updates...")
         
         # Find all build files
@@ -3899,9 +4346,6 @@ class MigrationFileApplicator(Node):
     
     def _force_javax_to_jakarta_updates(self, migration_workspace, results):
         """Force comprehensive javax→jakarta import updates in all Java files."""
-        import os
-        import re
-        
         print(f"\n🔍 Performing comprehensive javax→jakarta import scan...")
         
         # Find all Java files
@@ -3911,70 +4355,34 @@ class MigrationFileApplicator(Node):
                 if file.endswith('.java'):
                     java_files.append(os.path.join(root, file))
         
-        # Comprehensive javax→jakarta mapping
-        javax_to_jakarta_mappings = {
-            "javax.persistence": "jakarta.persistence",
-            "javax.validation": "jakarta.validation", 
-            "javax.servlet": "jakarta.servlet",
-            "javax.annotation": "jakarta.annotation",
-            "javax.ejb": "jakarta.ejb",
-            "javax.jms": "jakarta.jms",
-            "javax.enterprise": "jakarta.enterprise",
-            "javax.inject": "jakarta.inject",
-            "javax.interceptor": "jakarta.interceptor",
-            "javax.decorator": "jakarta.decorator",
-            "javax.transaction": "jakarta.transaction",
-            "javax.ws.rs": "jakarta.ws.rs",
-            "javax.json": "jakarta.json",
-            "javax.jsonb": "jakarta.jsonb",
-            "javax.mail": "jakarta.mail",
-            "javax.faces": "jakarta.faces",
-            "javax.websocket": "jakarta.websocket",
-            "javax.security.enterprise": "jakarta.security.enterprise",
-            "javax.security.auth.message": "jakarta.security.auth.message",
-            "javax.xml.bind": "jakarta.xml.bind",
-            "javax.xml.soap": "jakarta.xml.soap",
-            "javax.xml.ws": "jakarta.xml.ws",
-            "javax.batch": "jakarta.batch",
-            "javax.enterprise.concurrent": "jakarta.enterprise.concurrent",
-            "javax.security.jacc": "jakarta.security.jacc",
-        }
-        
         for java_file in java_files:
             relative_path = os.path.relpath(java_file, migration_workspace)
             
             try:
-                with open(java_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                with open(java_file, 'rb') as f:
+                    raw = f.read()
+                
+                # Most files import nothing from javax; skip decoding them
+                if b'javax.' not in raw:
+                    continue
                 
+                content = raw.decode('utf-8')
                 original_content = content
                 changes_made = []
                 
-                # Check and replace ALL javax imports
-                for javax_pkg, jakarta_pkg in javax_to_jakarta_mappings.items():
-                    # Pattern to match all imports starting with this javax package
-                    import_pattern = rf'^(\s*import\s+(?:static\s+)?){re.escape(javax_pkg)}(\.[^;]+\s*;.*?)$'
-                    
-                    matches = re.findall(import_pattern, content, re.MULTILINE)
-                    if matches:
-                        for match in matches:
-                            # Get the full original import
-                            full_javax_import = javax_pkg + match[1].split(';')[0]
-                            # Create the jakarta equivalent
-                            full_jakarta_import = full_javax_import.replace(javax_pkg, jakarta_pkg, 1)
-                            
-                            # Replace the import
-                            old_line = match[0] + full_javax_import + ';'
-                            new_line = match[0] + full_jakarta_import + ';'
-                            
-                            if old_line.strip() in content:
-                                content = content.replace(old_line.strip(), new_line.strip())
-                                changes_made.append(f"{full_javax_import} → {full_jakarta_import}")
+                # Replace ALL mapped javax imports in one pass over the file
+                def replace_import(match):
+                    prefix, javax_pkg, rest, terminator = match.groups()
+                    jakarta_pkg = JAVAX_TO_JAKARTA_MAPPINGS[javax_pkg]
+                    changes_made.append(f"{javax_pkg}{rest} → {jakarta_pkg}{rest}")
+                    return f"{prefix}{jakarta_pkg}{rest}{terminator}"
+                
+                content = JAVAX_IMPORT_RE.sub(replace_import, content)
                 
                 # Write changes if any were made
                 if content != original_content and changes_made:
-                    with open(java_file, 'w', encoding='utf-8') as f:
-                        f.write(content)
+                    with open(java_file, 'wb') as f:
+                        f.write(content.encode('utf-8'))
                     
                     for change in changes_made:
                         results["successful"].append({
@@ -3992,8 +4400,15 @@ class MigrationFileApplicator(Node):
                 print(f"   ⚠️  Error checking {relative_path}: {e}")
                 continue
     
-    def _apply_single_change(self, change, migration_workspace, category):
-        """Apply a single change to a file."""
+    def _apply_single_change(self, change, migration_workspace, category, file_contents=None, dirty_files=None):
+        """
+        Apply a single change to a file.
+
+        When file_contents is given, files are read into it once (as bytes,
+        decoded on first use) and changed text is kept there instead of being
+        written; the paths of changed files are added to dirty_files so the
+        caller can write each one once. Without it the file is written now.
+        """
         file_path = change.get("file", "")
         change_type = change.get("type", "")
         automatic = change.get("automatic", False)
@@ -4030,13 +4445,36 @@ class MigrationFileApplicator(Node):
                 "error": f"File not found in workspace: {full_file_path}"
             }
         
+        write_now = file_contents is None
+        if write_now:
+            file_contents = {}
+        
         try:
-            # Read the file
-            with open(full_file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # Read the file, once per exec when sharing file_contents
+            current = file_contents.get(full_file_path)
+            if current is None:
+                with open(full_file_path, 'rb') as f:
+                    current = file_contents[full_file_path] = f.read()
+            
+            # A literal replacement cannot apply when its "from" text is absent,
+            # so skip decoding and rewriting the file
+            from_text = change.get("from", "")
+            if isinstance(current, bytes) and from_text:
+                from_text = from_text.encode('utf-8')
+            if category != "dependency_updates" and from_text and from_text not in current:
+                return {
+                    "success": False,
+                    "skipped": True,
+                    "file": file_path,
+                    "type": change_type,
+                    "reason": "No changes needed - content already correct"
+                }
             
+            if isinstance(current, bytes):
+                current = file_contents[full_file_path] = current.decode('utf-8')
+            content = current
             original_content = content
-            original_lines = len(original_content.split('\n'))
+            original_lines = original_content.count('\n')
             
             # **NEW: Try Spring Boot version update first for dependency changes**
             if category == "dependency_updates" and ("spring" in change_type.lower() or "boot" in change_type.lower()):
@@ -4064,12 +4502,14 @@ class MigrationFileApplicator(Node):
                     "reason": "No changes needed - content already correct"
                 }
             
-            # Write the modified content back
-            with open(full_file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            file_contents[full_file_path] = content
+            if write_now:
+                self._write_workspace_file(full_file_path, content)
+            else:
+                dirty_files.add(full_file_path)
             
             # Calculate lines changed (approximate)
-            new_lines = len(content.split('\n'))
+            new_lines = content.count('\n')
             lines_changed = abs(new_lines - original_lines)
             
             return {
@@ -4088,6 +4528,11 @@ class MigrationFileApplicator(Node):
                 "error": f"Error modifying file: {str(e)}"
             }
     
+    def _write_workspace_file(self, full_file_path, content):
+        """Write changed text back to a workspace file, keeping its line endings."""
+        with open(full_file_path, 'wb') as f:
+            f.write(content.encode('utf-8'))
+    
     def _apply_javax_to_jakarta_change(self, content, change):
         """Apply javax to jakarta import changes with comprehensive mapping."""
         from_import = change.get("from", "")
@@ -4102,42 +4547,9 @@ class MigrationFileApplicator(Node):
             print(f"      🚨 BLOCKED: Attempted to change non-javax import '{from_import}' - this would corrupt custom code!")
             return content, False
         
-        # **NEW: Comprehensive javax→jakarta mapping validation**
-        javax_to_jakarta_mappings = {
-            # Core EE packages
-            "javax.persistence": "jakarta.persistence",
-            "javax.validation": "jakarta.validation", 
-            "javax.servlet": "jakarta.servlet",
-            "javax.annotation": "jakarta.annotation",
-            "javax.ejb": "jakarta.ejb",
-            "javax.jms": "jakarta.jms",
-            "javax.enterprise": "jakarta.enterprise",
-            "javax.inject": "jakarta.inject",
-            "javax.interceptor": "jakarta.interceptor",
-            "javax.decorator": "jakarta.decorator",
-            "javax.transaction": "jakarta.transaction",
-            "javax.ws.rs": "jakarta.ws.rs",
-            "javax.json": "jakarta.json",
-            "javax.jsonb": "jakarta.jsonb",
-            "javax.mail": "jakarta.mail",
-            "javax.faces": "jakarta.faces",
-            "javax.websocket": "jakarta.websocket",
-            "javax.security.enterprise": "jakarta.security.enterprise",
-            "javax.security.auth.message": "jakarta.security.auth.message",
-            "javax.xml.bind": "jakarta.xml.bind",
-            "javax.xml.soap": "jakarta.xml.soap",
-            "javax.xml.ws": "jakarta.xml.ws",
-            # Batch processing
-            "javax.batch": "jakarta.batch",
-            # Concurrency utilities  
-            "javax.enterprise.concurrent": "jakarta.enterprise.concurrent",
-            # Authentication
-            "javax.security.jacc": "jakarta.security.jacc",
-        }
-        
         # Validate the mapping
         found_valid_mapping = False
-        for javax_pkg, jakarta_pkg in javax_to_jakarta_mappings.items():
+        for javax_pkg, jakarta_pkg in JAVAX_TO_JAKARTA_MAPPINGS.items():
             if from_import.startswith(javax_pkg):
                 expected_to = from_import.replace(javax_pkg, jakarta_pkg, 1)
                 if to_import != expected_to:
@@ -4150,38 +4562,32 @@ class MigrationFileApplicator(Node):
             print(f"      ⚠️  UNMAPPED javax package: '{from_import}' - please verify this is correct")
         
         # **ENHANCED: More precise import replacement**
-        import re
+        import_pattern, static_import_pattern, wildcard_pattern = javax_import_patterns(from_import)
+        replacement = rf'\g<1>{to_import}\g<2>'
         
         # Pattern 1: Standard import statement
-        import_pattern = rf'^(\s*import\s+){re.escape(from_import)}(\s*;.*?)$'
-        if re.search(import_pattern, content, re.MULTILINE):
-            new_content = re.sub(import_pattern, rf'\g<1>{to_import}\g<2>', content, flags=re.MULTILINE)
-            if new_content != content:
-                print(f"      ✅ Updated import: {from_import} → {to_import}")
-                return new_content, True
+        new_content = import_pattern.sub(replacement, content)
+        if new_content != content:
+            print(f"      ✅ Updated import: {from_import} → {to_import}")
+            return new_content, True
         
         # Pattern 2: Static import
-        static_import_pattern = rf'^(\s*import\s+static\s+){re.escape(from_import)}(\.[^;]+\s*;.*?)$'  
-        if re.search(static_import_pattern, content, re.MULTILINE):
-            new_content = re.sub(static_import_pattern, rf'\g<1>{to_import}\g<2>', content, flags=re.MULTILINE)
-            if new_content != content:
-                print(f"      ✅ Updated static import: {from_import} → {to_import}")
-                return new_content, True
+        new_content = static_import_pattern.sub(replacement, content)
+        if new_content != content:
+            print(f"      ✅ Updated static import: {from_import} → {to_import}")
+            return new_content, True
                 
         # Pattern 3: Wildcard import  
-        wildcard_pattern = rf'^(\s*import\s+){re.escape(from_import)}(\.\*\s*;.*?)$'
-        if re.search(wildcard_pattern, content, re.MULTILINE):
-            new_content = re.sub(wildcard_pattern, rf'\g<1>{to_import}\g<2>', content, flags=re.MULTILINE)
-            if new_content != content:
-                print(f"      ✅ Updated wildcard import: {from_import}.* → {to_import}.*")
-                return new_content, True
+        new_content = wildcard_pattern.sub(replacement, content)
+        if new_content != content:
+            print(f"      ✅ Updated wildcard import: {from_import}.* → {to_import}.*")
+            return new_content, True
 
         print(f"      ⚠️  Import not found in content: {from_import}")
         return content, False
     
     def _apply_dependency_change(self, content, change):
         """Apply dependency version updates in build files."""
-        import re
         
         from_version = change.get("from", "")
         to_version = change.get("to", "")
@@ -4254,7 +4660,6 @@ class MigrationFileApplicator(Node):
     
     def _apply_spring_boot_version_update(self, content, file_path):
         """Specifically handle Spring Boot version updates in pom.xml and build.gradle files."""
-        import re
         
         updated = False
         
@@ -4442,6 +4847,58 @@ class MigrationFileApplicator(Node):
         return "default"
 
 
+# Fixed layout of EXECUTIVE_SUMMARY.md; the *_section fields hold the
+# variable lines, already formatted, so the report is built in one substitute
+EXECUTIVE_SUMMARY_TEMPLATE = Template("""# Executive Summary: $project_name Spring Migration
+
+## Overview
+
+This report summarizes the analysis and migration of **$project_name** from Spring Framework 5 to Spring Framework 6.
+
+## Key Findings
+
+### Migration Readiness
+**Status:** $migration_readiness
+
+### Impact Assessment
+${impact_section}### Scope
+- **$total_changes** code changes identified
+- **$files_requiring_changes** files require modification
+- **$automation_coverage%** of changes can be automated
+
+### Effort Estimation
+${effort_section}
+### Risk Assessment
+${risk_section}
+## Recommendations
+
+### Immediate Actions Required
+1. **Review Critical Issues**: Address any blocking issues before proceeding
+2. **Plan Migration Timeline**: Schedule migration activities with development team
+3. **Prepare Test Environment**: Ensure comprehensive testing capabilities
+
+### Implementation Strategy
+${strategy_section}
+## Success Metrics
+
+- **Automated Changes:** $changes_applied/$total_changes applied
+- **Success Rate:** $success_rate%
+- **Files Updated:** $files_modified files modified
+
+## Next Steps
+
+1. **Executive Approval**: Secure approval for migration project
+2. **Resource Allocation**: Assign development team and timeline
+3. **Detailed Planning**: Review technical implementation plan
+4. **Testing Strategy**: Plan comprehensive testing approach
+5. **Risk Mitigation**: Address identified blocking issues
+
+---
+
+*For detailed technical information, see the complete migration analysis reports.*
+""")
+
+
 class MigrationReportGenerator(Node):
     """
     Generates and saves comprehensive migration reports to files in the migration workspace.
@@ -4486,9 +4943,6 @@ class MigrationReportGenerator(Node):
         }
 
     def exec(self, prep_res):
-        import json
-        from datetime import datetime
-        
         vlogger = get_verbose_logger()
         
         print(f"📄 Generating comprehensive migration reports...")
@@ -4505,46 +4959,46 @@ class MigrationReportGenerator(Node):
         try:
             # 1. Save migration analysis report
             analysis_file = os.path.join(workspace, "spring_migration_analysis.json")
-            with open(analysis_file, 'w', encoding='utf-8') as f:
-                json.dump(prep_res["migration_analysis"], f, indent=2, ensure_ascii=False)
+            with open(analysis_file, 'wb') as f:
+                f.write(json_bytes_indented(prep_res["migration_analysis"]))
             report_files.append(("Migration Analysis", analysis_file))
             print(f"   ✅ Saved migration analysis: spring_migration_analysis.json")
             
             # 2. Save detailed changes report
             changes_file = os.path.join(workspace, "migration_changes_detailed.json")
-            with open(changes_file, 'w', encoding='utf-8') as f:
-                json.dump(prep_res["generated_changes"], f, indent=2, ensure_ascii=False)
+            with open(changes_file, 'wb') as f:
+                f.write(json_bytes_indented(prep_res["generated_changes"]))
             report_files.append(("Detailed Changes", changes_file))
             print(f"   ✅ Saved detailed changes: migration_changes_detailed.json")
             
             # 3. Save migration plan
             plan_file = os.path.join(workspace, "migration_plan.json")
-            with open(plan_file, 'w', encoding='utf-8') as f:
-                json.dump(prep_res["migration_plan"], f, indent=2, ensure_ascii=False)
+            with open(plan_file, 'wb') as f:
+                f.write(json_bytes_indented(prep_res["migration_plan"]))
             report_files.append(("Migration Plan", plan_file))
             print(f"   ✅ Saved migration plan: migration_plan.json")
             
             # 4. Save line-by-line change report
             if prep_res["line_change_report"]:
                 line_report_file = os.path.join(workspace, "line_change_report.json")
-                with open(line_report_file, 'w', encoding='utf-8') as f:
-                    json.dump(prep_res["line_change_report"], f, indent=2, ensure_ascii=False)
+                with open(line_report_file, 'wb') as f:
+                    f.write(json_bytes_indented(prep_res["line_change_report"]))
                 report_files.append(("Line Change Report", line_report_file))
                 print(f"   ✅ Saved line change report: line_change_report.json")
             
             # 5. Save application results
             if prep_res["applied_changes"]:
                 applied_file = os.path.join(workspace, "migration_application_results.json")
-                with open(applied_file, 'w', encoding='utf-8') as f:
-                    json.dump(prep_res["applied_changes"], f, indent=2, ensure_ascii=False)
+                with open(applied_file, 'wb') as f:
+                    f.write(json_bytes_indented(prep_res["applied_changes"]))
                 report_files.append(("Application Results", applied_file))
                 print(f"   ✅ Saved application results: migration_application_results.json")
             
             # 6. Generate comprehensive metrics
             metrics = self._generate_migration_metrics(prep_res)
             metrics_file = os.path.join(workspace, "migration_metrics.json")
-            with open(metrics_file, 'w', encoding='utf-8') as f:
-                json.dump(metrics, f, indent=2, ensure_ascii=False)
+            with open(metrics_file, 'wb') as f:
+                f.write(json_bytes_indented(metrics))
             report_files.append(("Migration Metrics", metrics_file))
             print(f"   ✅ Saved migration metrics: migration_metrics.json")
             
@@ -4592,8 +5046,6 @@ class MigrationReportGenerator(Node):
     
     def _generate_migration_metrics(self, prep_res):
         """Generate comprehensive migration metrics."""
-        from datetime import datetime
-        
         metrics = {
             "project_info": {
                 "name": prep_res["project_name"],
@@ -4685,7 +5137,8 @@ class MigrationReportGenerator(Node):
         """Generate a comprehensive human-readable summary report."""
         project_name = prep_res["project_name"]
         
-        md = f"""# Spring Migration Summary Report
+        md = io.StringIO()
+        md.write(f"""# Spring Migration Summary Report
 
 **Project:** {project_name}  
 **Generated:** {timestamp}  
@@ -4697,32 +5150,32 @@ class MigrationReportGenerator(Node):
 
 ### Migration Status: {metrics["overall_metrics"]["migration_readiness"]}
 
-"""
+""")
         
         # Add analysis summary
         analysis = prep_res["migration_analysis"]
         if isinstance(analysis, dict):
             exec_summary = analysis.get("executive_summary", {})
             if exec_summary:
-                md += f"""### Analysis Overview
+                md.write(f"""### Analysis Overview
 - **Impact Assessment:** {exec_summary.get("migration_impact", "Not available")}
 - **Recommended Approach:** {exec_summary.get("recommended_approach", "Not specified")}
 
-"""
+""")
                 
                 key_blockers = exec_summary.get("key_blockers", [])
                 if key_blockers:
-                    md += f"""### Key Migration Blockers
-"""
-                    for i, blocker in enumerate(key_blockers[:5], 1):
-                        md += f"{i}. {blocker}\n"
-                    md += "\n"
+                    md.write(f"""### Key Migration Blockers
+""")
+                    for i, blocker in enumerate(islice(key_blockers, 5), 1):
+                        md.write(f"{i}. {blocker}\n")
+                    md.write("\n")
         
         # Add metrics
         change_metrics = metrics.get("change_metrics", {})
         app_metrics = metrics.get("application_metrics", {})
         
-        md += f"""## 📊 Migration Metrics
+        md.write(f"""## 📊 Migration Metrics
 
 | Metric | Value |
 |--------|--------|
@@ -4733,83 +5186,82 @@ class MigrationReportGenerator(Node):
 | **Automation Coverage** | {metrics["overall_metrics"]["automation_coverage"]}% |
 | **Success Rate** | {app_metrics.get("application_success_rate", 0)}% |
 
-"""
+""")
         
         # Add change breakdown
         changes_by_category = change_metrics.get("changes_by_category", {})
         if changes_by_category:
-            md += f"""## 🔧 Changes by Category
+            md.write(f"""## 🔧 Changes by Category
 
 | Category | Changes Identified |
 |----------|-------------------|
-"""
+""")
             for category, count in changes_by_category.items():
                 category_name = category.replace('_', ' ').title()
-                md += f"| {category_name} | {count} |\n"
-            md += "\n"
+                md.write(f"| {category_name} | {count} |\n")
+            md.write("\n")
         
         # Add application results
         applied = prep_res["applied_changes"]
         if isinstance(applied, dict) and not applied.get("skipped", False):
-            md += f"""## ✅ Application Results
+            md.write(f"""## ✅ Application Results
 
 ### Summary
 - **✅ Successful:** {len(applied.get("successful", []))} changes
 - **⏭️ Skipped:** {len(applied.get("skipped", []))} changes  
 - **❌ Failed:** {len(applied.get("failed", []))} changes
 
-"""
+""")
             
             # Show modified files
             files_modified = applied.get("files_modified", set())
             if files_modified:
-                md += f"""### Files Modified ({len(files_modified)})
-"""
-                for file_path in sorted(files_modified):
-                    md += f"- `{file_path}`\n"
-                md += "\n"
+                md.write(f"""### Files Modified ({len(files_modified)})
+""")
+                md.writelines(f"- `{file_path}`\n" for file_path in sorted(files_modified))
+                md.write("\n")
         
         # Add recommendations
-        md += f"""## 🎯 Next Steps
+        md.write(f"""## 🎯 Next Steps
 
-"""
+""")
         
         migration_plan = prep_res["migration_plan"]
         if isinstance(migration_plan, dict):
             roadmap = migration_plan.get("migration_roadmap", [])
             if roadmap:
-                md += f"""### Migration Roadmap
-"""
-                for step in roadmap[:3]:  # Show first 3 steps
+                md.write(f"""### Migration Roadmap
+""")
+                for step in islice(roadmap, 3):  # Show first 3 steps
                     step_num = step.get("step", "?")
                     title = step.get("title", "Unknown step")
                     description = step.get("description", "No description")
                     effort = step.get("estimated_effort", "Unknown effort")
                     
-                    md += f"""**Step {step_num}: {title}**
+                    md.write(f"""**Step {step_num}: {title}**
 - Description: {description}
 - Estimated Effort: {effort}
 
-"""
+""")
         
         # Add manual review items
         if applied and len(applied.get("skipped", [])) > 0:
-            md += f"""### Manual Review Required
+            md.write(f"""### Manual Review Required
 
 The following changes were identified but require manual review:
 
-"""
-            for skipped in applied.get("skipped", [])[:10]:  # Show first 10
+""")
+            for skipped in islice(applied.get("skipped", ()), 10):  # Show first 10
                 file_name = skipped.get("file", "Unknown file")
                 reason = skipped.get("reason", "Manual review required")
-                md += f"- **{file_name}**: {reason}\n"
+                md.write(f"- **{file_name}**: {reason}\n")
             
             if len(applied.get("skipped", [])) > 10:
-                md += f"- ... and {len(applied.get('skipped', [])) - 10} more items\n"
-            md += "\n"
+                md.write(f"- ... and {len(applied.get('skipped', [])) - 10} more items\n")
+            md.write("\n")
         
         # Add file locations
-        md += f"""## 📁 Generated Reports
+        md.write(f"""## 📁 Generated Reports
 
 The following detailed reports have been generated:
 
@@ -4831,112 +5283,65 @@ The following detailed reports have been generated:
 ---
 
 *Generated by Spring Migration Tool - {timestamp}*
-"""
+""")
         
-        return md
+        return md.getvalue()
     
     def _generate_executive_summary(self, prep_res, metrics):
         """Generate an executive summary for stakeholders."""
-        project_name = prep_res["project_name"]
-        
-        md = f"""# Executive Summary: {project_name} Spring Migration
-
-## Overview
-
-This report summarizes the analysis and migration of **{project_name}** from Spring Framework 5 to Spring Framework 6.
-
-## Key Findings
-
-### Migration Readiness
-**Status:** {metrics["overall_metrics"]["migration_readiness"]}
-
-### Impact Assessment
-"""
+        return EXECUTIVE_SUMMARY_TEMPLATE.substitute(self._executive_summary_fields(prep_res, metrics))
+    
+    def _executive_summary_fields(self, prep_res, metrics):
+        """Collect the values and variable sections of the executive summary."""
+        change_metrics = metrics.get("change_metrics", {})
+        app_metrics = metrics.get("application_metrics", {})
+        fields = {
+            "project_name": prep_res["project_name"],
+            "migration_readiness": metrics["overall_metrics"]["migration_readiness"],
+            "total_changes": change_metrics.get("total_changes_identified", 0),
+            "files_requiring_changes": change_metrics.get("files_requiring_changes", 0),
+            "automation_coverage": metrics["overall_metrics"]["automation_coverage"],
+            "changes_applied": app_metrics.get("changes_applied", 0),
+            "success_rate": app_metrics.get("application_success_rate", 0),
+            "files_modified": app_metrics.get("files_modified", 0),
+            "impact_section": "",
+            "effort_section": "",
+            "risk_section": "",
+            "strategy_section": ""
+        }
         
         analysis = prep_res["migration_analysis"]
         if isinstance(analysis, dict):
             exec_summary = analysis.get("executive_summary", {})
             impact = exec_summary.get("migration_impact", "Impact assessment not available")
-            md += f"- {impact}\n\n"
-        
-        # Add metrics in business terms
-        change_metrics = metrics.get("change_metrics", {})
-        app_metrics = metrics.get("application_metrics", {})
-        
-        md += f"""### Scope
-- **{change_metrics.get("total_changes_identified", 0)}** code changes identified
-- **{change_metrics.get("files_requiring_changes", 0)}** files require modification
-- **{metrics["overall_metrics"]["automation_coverage"]}%** of changes can be automated
-
-### Effort Estimation
-"""
-        
-        if isinstance(analysis, dict):
+            fields["impact_section"] = f"- {impact}\n\n"
+            
             effort_estimation = analysis.get("effort_estimation", {})
             total_effort = effort_estimation.get("total_effort", "Effort estimation not available")
-            md += f"- **Estimated Effort:** {total_effort}\n"
-            
+            effort_lines = [f"- **Estimated Effort:** {total_effort}\n"]
             team_size = effort_estimation.get("by_category", {}).get("team_size_recommendation", "2-3 developers")
             if isinstance(team_size, str):
-                md += f"- **Recommended Team Size:** {team_size}\n"
-        
-        md += f"""
-### Risk Assessment
-"""
-        
-        if isinstance(analysis, dict):
+                effort_lines.append(f"- **Recommended Team Size:** {team_size}\n")
+            fields["effort_section"] = "".join(effort_lines)
+            
             key_blockers = exec_summary.get("key_blockers", [])
             if key_blockers:
-                md += f"**Critical Issues ({len(key_blockers)}):**\n"
-                for blocker in key_blockers[:3]:
-                    md += f"- {blocker}\n"
+                risk_lines = [f"**Critical Issues ({len(key_blockers)}):**\n"]
+                risk_lines.extend(f"- {blocker}\n" for blocker in islice(key_blockers, 3))
                 if len(key_blockers) > 3:
-                    md += f"- ... and {len(key_blockers) - 3} more issues\n"
+                    risk_lines.append(f"- ... and {len(key_blockers) - 3} more issues\n")
+                fields["risk_section"] = "".join(risk_lines)
             else:
-                md += "- No critical blocking issues identified\n"
-        
-        md += f"""
-## Recommendations
-
-### Immediate Actions Required
-1. **Review Critical Issues**: Address any blocking issues before proceeding
-2. **Plan Migration Timeline**: Schedule migration activities with development team
-3. **Prepare Test Environment**: Ensure comprehensive testing capabilities
-
-### Implementation Strategy
-"""
+                fields["risk_section"] = "- No critical blocking issues identified\n"
         
         migration_plan = prep_res["migration_plan"]
         if isinstance(migration_plan, dict):
             strategy = migration_plan.get("migration_strategy", {})
             approach = strategy.get("approach", "Phased approach recommended")
             timeline = strategy.get("estimated_timeline", "Timeline to be determined")
-            
-            md += f"""- **Approach:** {approach}
-- **Estimated Timeline:** {timeline}
-"""
-        
-        md += f"""
-## Success Metrics
-
-- **Automated Changes:** {app_metrics.get("changes_applied", 0)}/{change_metrics.get("total_changes_identified", 0)} applied
-- **Success Rate:** {app_metrics.get("application_success_rate", 0)}%
-- **Files Updated:** {app_metrics.get("files_modified", 0)} files modified
-
-## Next Steps
-
-1. **Executive Approval**: Secure approval for migration project
-2. **Resource Allocation**: Assign development team and timeline
-3. **Detailed Planning**: Review technical implementation plan
-4. **Testing Strategy**: Plan comprehensive testing approach
-5. **Risk Mitigation**: Address identified blocking issues
-
----
-
-*For detailed technical information, see the complete migration analysis reports.*
-"""
+            fields["strategy_section"] = f"- **Approach:** {approach}\n- **Estimated Timeline:** {timeline}\n"
         
-        return md
+        return fields
     
     def _generate_report_index(self, report_files, project_name, timestamp):
         """Generate an index file for easy navigation of all reports."""
@@ -7,9 +7,15 @@ Restores files from backup when migration corrupts the working directory.
 import os
 import json
 import shutil
+import tarfile
 import argparse
 from pathlib import Path
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 def find_latest_backup():
     """Find the most recent backup directory."""
     migration_dir = Path("migration_analysis")
@@ -54,12 +60,31 @@ def restore_from_backup(backup_dir, target_dir, dry_run=False):
     if dry_run:
         print("🔍 DRY RUN - showing what would be restored:")
     
-    restored_count = 0
-    
     # Create target directory
     if not dry_run:
         target_path.mkdir(parents=True, exist_ok=True)
     
+    if backup_info.get("backup_archive"):
+        restored_count = restore_from_archive(backup_path, backup_info, target_path, dry_run)
+        if restored_count is None:
+            return False
+    else:
+        restored_count = restore_from_flattened_files(backup_path, backup_info, target_path, dry_run)
+    
+    if dry_run:
+        print(f"\n🔍 Would restore {restored_count} files")
+    else:
+        print(f"\n✅ Successfully restored {restored_count} files")
+        
+        # Copy backup manifest to target for reference
+        shutil.copy2(manifest_file, target_path / "restored_from_backup.json")
+    
+    return True
+
+def restore_from_flattened_files(backup_path, backup_info, target_path, dry_run):
+    """Restore a backup made of one flattened file per source file."""
+    restored_count = 0
+    
     # Restore each file
     for file_info in backup_info.get("migration_files", []):
         original_path = file_info["original_path"]
@@ -87,15 +112,51 @@ def restore_from_backup(backup_dir, target_dir, dry_run=False):
         
         restored_count += 1
     
-    if dry_run:
-        print(f"\n🔍 Would restore {restored_count} files")
-    else:
-        print(f"\n✅ Successfully restored {restored_count} files")
-        
-        # Copy backup manifest to target for reference
-        shutil.copy2(manifest_file, target_path / "restored_from_backup.json")
+    return restored_count
+
+def restore_from_archive(backup_path, backup_info, target_path, dry_run):
+    """Restore a backup stored as a single tar archive (gzip or zstd)."""
+    archive_path = backup_path / Path(backup_info["backup_archive"]).name
+    if not archive_path.exists():
+        print(f"❌ Backup archive not found: {archive_path}")
+        return None
+    
+    # Only members listed in the manifest are restored, by their original path
+    wanted = {info["archive_member"]: info["original_path"]
+              for info in backup_info.get("files_backed_up", [])}
+    restored_count = 0
     
-    return True
+    with open(archive_path, 'rb') as raw:
+        if archive_path.suffix == ".zst":
+            if zstandard is None:
+                print("❌ The zstandard package is required to read this backup")
+                return None
+            tar = tarfile.open(fileobj=zstandard.ZstdDecompressor().stream_reader(raw), mode="r|")
+        else:
+            tar = tarfile.open(fileobj=raw, mode="r|*")
+        
+        # Read the archive front to back so streamed (zstd) archives work too
+        with tar:
+            for member in tar:
+                original_path = wanted.pop(member.name, None)
+                if original_path is None or not member.isfile():
+                    continue
+                
+                target_file_path = target_path / original_path
+                if dry_run:
+                    print(f"   Would restore: {original_path}")
+                else:
+                    target_file_path.parent.mkdir(parents=True, exist_ok=True)
+                    with tar.extractfile(member) as src, open(target_file_path, 'wb') as dst:
+                        shutil.copyfileobj(src, dst)
+                    print(f"   ✅ Restored: {original_path}")
+                
+                restored_count += 1
+    
+    for missing in wanted:
+        print(f"⚠️  Backup file not found in archive: {missing}")
+    
+    return restored_count
 
 def main():
     parser = argparse.ArgumentParser(description="Recover from Spring Migration Tool backup")
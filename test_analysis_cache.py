@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent LLM analysis cache.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from utils import analysis_cache
+from utils import call_llm
+from utils.call_llm import FallbackResponse, is_fallback_response
+
+
+class TestAnalysisCache(unittest.TestCase):
+    """Test key derivation and atomic storage of cached analyses."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root_patch = patch.object(analysis_cache, "CACHE_ROOT", self.temp_dir)
+        self.root_patch.start()
+
+    def tearDown(self):
+        self.root_patch.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_no_key_without_provider(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(analysis_cache.analysis_cache_key("prompt", "project"))
+
+    def test_key_depends_on_model_and_parts(self):
+        with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "key"}, clear=True):
+            key = analysis_cache.analysis_cache_key("prompt", "project")
+            self.assertEqual(key, analysis_cache.analysis_cache_key("prompt", "project"))
+            self.assertNotEqual(key, analysis_cache.analysis_cache_key("prompt", "other"))
+            self.assertNotEqual(key, analysis_cache.analysis_cache_key("promptproject", ""))
+        with patch.dict(os.environ, {"GOOGLE_API_KEY": "key"}, clear=True):
+            self.assertNotEqual(key, analysis_cache.analysis_cache_key("prompt", "project"))
+
+    def test_store_and_load_round_trip(self):
+        analysis = {"executive_summary": {"migration_impact": "Low"}}
+        self.assertIsNone(analysis_cache.load_cached_analysis("spring_analysis", "abc"))
+
+        analysis_cache.store_cached_analysis("spring_analysis", "abc", analysis)
+
+        self.assertEqual(analysis_cache.load_cached_analysis("spring_analysis", "abc"), analysis)
+        self.assertEqual(os.listdir(os.path.join(self.temp_dir, "spring_analysis")), ["abc.json"])
+
+    def test_structure_cache_persists_between_opens(self):
+        key = analysis_cache.file_content_key("A.java", "import a;")
+        self.assertNotEqual(key, analysis_cache.file_content_key("B.java", "import a;"))
+
+        cache = analysis_cache.open_structure_cache(self.temp_dir)
+        cache[key] = (["import a;"], [])
+        cache.close()
+
+        cache = analysis_cache.open_structure_cache(self.temp_dir)
+        try:
+            self.assertEqual(cache.get(key), (["import a;"], []))
+        finally:
+            cache.close()
+
+    def test_structure_cache_in_memory_without_output_dir(self):
+        cache = analysis_cache.open_structure_cache(None)
+        cache["key"] = ([], [])
+        self.assertEqual(cache["key"], ([], []))
+        cache.close()
+
+    def test_fallback_response_marker(self):
+        self.assertTrue(is_fallback_response(FallbackResponse("{}")))
+        self.assertFalse(is_fallback_response("{}"))
+
+    def test_model_id_matches_model_called(self):
+        environments = [
+            {"OPENAI_API_KEY": "sk-" + "x" * 30},
+            {"OPENAI_API_KEY": "local"},
+            {"ANTHROPIC_API_KEY": "key"},
+            {"GOOGLE_API_KEY": "key"},
+        ]
+        for environment in environments:
+            with self.subTest(environment=environment), patch.dict(os.environ, environment, clear=True):
+                provider, _, model_id = call_llm.llm_model_id().partition(":")
+                with patch.object(call_llm, f"_call_{provider}", return_value="{}") as call:
+                    call_llm._make_llm_request("prompt", 10)
+                self.assertEqual(model_id.partition("@")[0], call.call_args.args[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
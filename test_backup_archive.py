@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for the archive-based file backup and its recovery.
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from nodes import EnhancedFileBackupManager
+from recover_from_backup import restore_from_backup
+
+
+class TestBackupArchive(unittest.TestCase):
+    """Test that backups are written to one archive and restore with their layout."""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.files = [
+            ("pom.xml", "<project/>\n"),
+            ("src/main/java/com/example/App.java", "import javax.persistence.Entity;\n"),
+            ("src/main/resources/application.yml", "name: café\n"),
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_backup_round_trip(self):
+        backup_info = EnhancedFileBackupManager().exec((self.files, str(self.temp_dir), "demo"))
+
+        backup_dir = Path(backup_info["backup_dir"])
+        self.assertEqual(sorted(p.name for p in backup_dir.iterdir()),
+                         sorted(["backup_manifest.json", Path(backup_info["backup_archive"]).name]))
+        for file_path, content in self.files:
+            workspace_file = Path(backup_info["migration_workspace"]) / file_path
+            self.assertEqual(workspace_file.read_text(encoding="utf-8"), content)
+
+        target = self.temp_dir / "restored"
+        self.assertTrue(restore_from_backup(backup_dir, target, dry_run=True))
+        self.assertFalse(target.exists())
+
+        self.assertTrue(restore_from_backup(backup_dir, target))
+        for file_path, content in self.files:
+            self.assertEqual((target / file_path).read_text(encoding="utf-8"), content)
+
+
+if __name__ == "__main__":
+    unittest.main()
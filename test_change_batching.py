@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Tests for batched per-file change analysis in MigrationChangeGenerator.
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import nodes
+from nodes import MigrationChangeGenerator
+from utils import analysis_cache
+
+
+def java_file(name, package):
+    return (
+        f"src/{name}.java",
+        f"package com.example;\n\nimport javax.{package}.Entity;\n\n@Entity\npublic class {name} {{}}\n",
+    )
+
+
+def import_change(file_path, package):
+    return {
+        "file": file_path,
+        "type": "import_replacement",
+        "from": f"javax.{package}.Entity",
+        "to": f"jakarta.{package}.Entity",
+        "automatic": True,
+        "description": "JPA: javax.persistence -> jakarta.persistence",
+    }
+
+
+class TestChangeBatching(unittest.TestCase):
+    """Test that screened files share one LLM call and results fan back out."""
+
+    def setUp(self):
+        self.generator = MigrationChangeGenerator()
+        self.generator.cur_retry = 0
+        self.analysis = {"executive_summary": {"migration_impact": "High"}, "detailed_analysis": {}}
+
+    def test_batch_uses_one_call_and_fans_out(self):
+        files = [java_file(f"Entity{i}", "persistence") for i in range(3)]
+        response = json.dumps({
+            str(i): {"javax_to_jakarta": [import_change(path, "persistence")]}
+            for i, (path, _) in enumerate(files, 1)
+        })
+
+        with patch.object(nodes, "call_llm", return_value=response) as call_llm:
+            results = self.generator._analyze_files_batch(files, "Migration Impact: High", "proj", False)
+
+        self.assertEqual(call_llm.call_count, 1)
+        self.assertIn("### File 3", call_llm.call_args[0][0])
+        self.assertEqual(
+            [result["javax_to_jakarta"][0]["file"] for result in results],
+            [path for path, _ in files],
+        )
+
+    def test_missing_entry_is_analyzed_on_its_own(self):
+        files = [java_file("First", "persistence"), java_file("Second", "persistence")]
+        batch_response = json.dumps({"1": {"javax_to_jakarta": [import_change(files[0][0], "persistence")]}})
+        single_response = json.dumps({"javax_to_jakarta": [import_change(files[1][0], "persistence")]})
+
+        with patch.object(nodes, "call_llm", side_effect=[batch_response, single_response]) as call_llm:
+            results = self.generator._analyze_files_batch(files, "Migration Impact: High", "proj", False)
+
+        self.assertEqual(call_llm.call_count, 2)
+        self.assertEqual(results[1]["javax_to_jakarta"][0]["file"], files[1][0])
+
+    def test_file_without_triggers_skips_the_llm(self):
+        plain = ("src/Plain.java", "package com.example;\n\npublic class Plain {}\n")
+        entity = java_file("Entity", "persistence")
+
+        self.assertEqual(self.generator._screen_file_for_llm(*plain), self.generator._get_empty_changes())
+        self.assertIsNone(self.generator._screen_file_for_llm(*entity))
+
+    def test_java_files_are_sent_as_a_structural_summary(self):
+        source = (
+            "package com.example;\r\n"
+            "import javax.persistence.Entity;\r\n"
+            "@Entity\r\n"
+            "public class Order extends Base {\r\n"
+            "    @Id\r\n"
+            "    private Long id;\r\n"
+            "    void configure(HttpSecurity http) {\r\n"
+            "        http.authorizeRequests().antMatchers(\"/\").permitAll();\r\n"
+            "        int total = 0;\r\n"
+            "    }\r\n"
+            "}\r\n"
+        )
+        prepared = self.generator._prepare_file_content_for_llm(source, "src/Order.java")
+        self.assertEqual(prepared.split("\n\n...")[0], "\n".join([
+            "package com.example;",
+            "import javax.persistence.Entity;",
+            "@Entity",
+            "public class Order extends Base {",
+            "    @Id",
+            "        http.authorizeRequests().antMatchers(\"/\").permitAll();",
+        ]))
+        self.assertEqual(self.generator._prepare_file_content_for_llm("<project/>", "pom.xml"), "<project/>")
+
+    def test_changes_missing_required_fields_are_dropped(self):
+        file_path, content = java_file("Entity", "persistence")
+        incomplete = {k: v for k, v in import_change(file_path, "persistence").items() if k != "description"}
+        validated = self.generator._validate_and_filter_changes(
+            {"javax_to_jakarta": [incomplete, import_change(file_path, "persistence")]}, content, file_path)
+        self.assertEqual(validated["javax_to_jakarta"], [import_change(file_path, "persistence")])
+
+    def test_text_check_samples_the_head(self):
+        self.assertFalse(self.generator._is_text_file("a.bin", "PK\x00\x03" + "a" * 100))
+        self.assertFalse(self.generator._is_text_file("a.bin", b"PK\x00\x03"))
+        self.assertTrue(self.generator._is_text_file("A.java", "class A {}\n" * 2000 + "\x00"))
+
+    def test_retry_changes_the_prompt_and_keeps_caching(self):
+        file_path, content = java_file("Entity", "persistence")
+        response = json.dumps({"javax_to_jakarta": []})
+
+        with patch.object(nodes, "call_llm", return_value=response) as call_llm:
+            self.generator._analyze_file_with_llm(file_path, content, "Migration Impact: High", "proj", True)
+            self.generator.cur_retry = 1
+            self.generator._analyze_file_with_llm(file_path, content, "Migration Impact: High", "proj", True)
+
+        first, retry = call_llm.call_args_list
+        self.assertTrue(first.kwargs["use_cache"] and retry.kwargs["use_cache"])
+        self.assertEqual(retry.args[0], first.args[0] + nodes.RETRY_JSON_REMINDER)
+
+    def test_prompts_share_a_static_prefix(self):
+        files = [java_file("First", "persistence"), java_file("Second", "persistence")]
+        response = json.dumps({"javax_to_jakarta": []})
+
+        with patch.object(nodes, "call_llm", return_value=response) as call_llm:
+            for file_path, content in files:
+                self.generator._analyze_file_with_llm(file_path, content, "Migration Impact: High", "proj", False)
+
+        prompts = [call.args[0] for call in call_llm.call_args_list]
+        prefixes = [call.kwargs["cache_prefix"] for call in call_llm.call_args_list]
+        self.assertEqual(prefixes[0], prefixes[1])
+        self.assertTrue(prefixes[0].startswith(nodes.CHANGE_ANALYSIS_PROMPT_PREFIX))
+        for prompt, (file_path, _) in zip(prompts, files):
+            self.assertTrue(prompt.startswith(prefixes[0]))
+            self.assertIn(file_path, prompt[len(prefixes[0]):])
+
+    def test_exec_batches_only_screened_files(self):
+        files = [java_file(f"Entity{i}", "persistence") for i in range(nodes.LLM_FILE_BATCH_SIZE + 1)]
+        files.append(("README.md", "# Readme\n"))
+        skip_paths = {"README.md"}
+
+        def answer(prompt, use_cache=True, cache_prefix=None):
+            paths = [path for path, _ in files if f"**File Path:** {path}\n" in prompt]
+            if len(paths) == 1:
+                return json.dumps({"javax_to_jakarta": [import_change(paths[0], "persistence")]})
+            return json.dumps({
+                str(i): {"javax_to_jakarta": [import_change(path, "persistence")]}
+                for i, path in enumerate(paths, 1)
+            })
+
+        for enable_parallel in (False, True):
+            with self.subTest(enable_parallel=enable_parallel):
+                with patch.object(nodes, "call_llm", side_effect=answer) as call_llm:
+                    changes = self.generator.exec((files, self.analysis, "proj", False, {}, skip_paths, 4, enable_parallel))
+
+                self.assertEqual(call_llm.call_count, 2)
+                self.assertEqual(self.generator._llm_calls, 2)
+                self.assertEqual(
+                    [change["file"] for change in changes["javax_to_jakarta"]],
+                    [path for path, _ in files[:-1]],
+                )
+
+    def test_unchanged_files_reuse_cached_changes(self):
+        files = [java_file("Order", "persistence"), java_file("Invoice", "persistence")]
+        response = json.dumps({
+            str(i): {"javax_to_jakarta": [import_change(path, "persistence")]}
+            for i, (path, _) in enumerate(files, 1)
+        })
+        cache_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_root, ignore_errors=True)
+
+        with patch.object(analysis_cache, "CACHE_ROOT", cache_root), \
+                patch.object(analysis_cache, "llm_model_id", return_value="openai:test"), \
+                patch.object(nodes, "call_llm", return_value=response) as call_llm:
+            first = self.generator.exec((files, self.analysis, "proj", True, {}, set(), 4, False))
+            second = self.generator.exec((files, self.analysis, "proj", True, {}, set(), 4, False))
+
+        self.assertEqual(call_llm.call_count, 1)
+        self.assertEqual(second, first)
+        self.assertEqual(len(second["javax_to_jakarta"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
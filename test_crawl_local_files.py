@@ -10,7 +10,7 @@ import tempfile
 import shutil
 import unittest
 from pathlib import Path
-from utils.crawl_local_files import crawl_local_files
+from utils.crawl_local_files import crawl_local_files, compile_glob_patterns
 
 
 class TestCrawlLocalFiles(unittest.TestCase):
@@ -185,6 +185,18 @@ class TestCrawlLocalFiles(unittest.TestCase):
         finally:
             shutil.rmtree(empty_dir)
     
+    def test_compile_glob_patterns(self):
+        """Test that compiled glob patterns match like fnmatch"""
+        self.assertIsNone(compile_glob_patterns(None))
+        self.assertIsNone(compile_glob_patterns(set()))
+        
+        pattern_re = compile_glob_patterns({"*.java", "*/target/*", "pom.xml"})
+        self.assertTrue(pattern_re.match("src/main/java/App.java"))
+        self.assertTrue(pattern_re.match("module/target/App.class"))
+        self.assertTrue(pattern_re.match("pom.xml"))
+        self.assertFalse(pattern_re.match("README.md"))
+        self.assertFalse(pattern_re.match("App.java.bak"))
+    
     def test_complex_filtering_combination(self):
         """Test complex combination of include/exclude patterns"""
         result = crawl_local_files(
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for rewriting workspace files in MigrationFileApplicator.
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from nodes import MigrationFileApplicator
+
+
+def empty_results():
+    return {"successful": [], "skipped": [], "failed": [], "files_modified": set(), "total_changes_applied": 0}
+
+
+class TestFileApplicator(unittest.TestCase):
+    """Test javax imports are rewritten in place and other code is left alone."""
+
+    def setUp(self):
+        self.workspace = Path(tempfile.mkdtemp())
+        self.applicator = MigrationFileApplicator()
+
+    def tearDown(self):
+        shutil.rmtree(self.workspace, ignore_errors=True)
+
+    def test_force_update_rewrites_every_mapped_import(self):
+        source = self.workspace / "src" / "Order.java"
+        source.parent.mkdir()
+        source.write_text(
+            "import javax.persistence.Entity;\n"
+            "  import static javax.persistence.CascadeType.ALL;\n"
+            "import javax.jsonb.Jsonb;\n"
+            "import javax.json.Json;\n"
+            "import javax.swing.JFrame;\n"
+            "// javax.persistence.Entity\n",
+            encoding="utf-8",
+        )
+        results = empty_results()
+
+        self.applicator._force_javax_to_jakarta_updates(str(self.workspace), results)
+
+        self.assertEqual(
+            source.read_text(encoding="utf-8"),
+            "import jakarta.persistence.Entity;\n"
+            "  import static jakarta.persistence.CascadeType.ALL;\n"
+            "import jakarta.jsonb.Jsonb;\n"
+            "import jakarta.json.Json;\n"
+            "import javax.swing.JFrame;\n"
+            "// javax.persistence.Entity\n",
+        )
+        self.assertEqual(results["total_changes_applied"], 4)
+        self.assertEqual(results["files_modified"], {"src/Order.java"})
+
+    def test_import_change_covers_static_and_wildcard_imports(self):
+        content = (
+            "import static javax.persistence.CascadeType.ALL;\n"
+            "import javax.validation.constraints.*;\n"
+        )
+        content, static_done = self.applicator._apply_javax_to_jakarta_change(
+            content, {"from": "javax.persistence.CascadeType", "to": "jakarta.persistence.CascadeType"})
+        content, wildcard_done = self.applicator._apply_javax_to_jakarta_change(
+            content, {"from": "javax.validation.constraints", "to": "jakarta.validation.constraints"})
+
+        self.assertTrue(static_done and wildcard_done)
+        self.assertEqual(content, (
+            "import static jakarta.persistence.CascadeType.ALL;\n"
+            "import jakarta.validation.constraints.*;\n"
+        ))
+
+    def test_change_without_its_from_text_leaves_the_file_untouched(self):
+        config = self.workspace / "application.properties"
+        config.write_bytes(b"server.port=8080\r\n")
+        change = {"file": "application.properties", "type": "property_update",
+                  "from": "security.basic.enabled=", "to": "spring.security.enabled="}
+
+        result = self.applicator._apply_single_change(change, str(self.workspace), "configuration_updates")
+
+        self.assertTrue(result["skipped"])
+        self.assertEqual(config.read_bytes(), b"server.port=8080\r\n")
+
+        change.update({"from": "server.port=", "to": "server.http.port="})
+        result = self.applicator._apply_single_change(change, str(self.workspace), "configuration_updates")
+
+        self.assertTrue(result["success"])
+        self.assertEqual(config.read_bytes(), b"server.http.port=8080\r\n")
+
+    def test_exec_writes_each_changed_file_once(self):
+        config = self.workspace / "application.properties"
+        config.write_text("server.port=8080\nsecurity.basic.enabled=true\n", encoding="utf-8")
+        changes = {
+            "configuration_updates": [
+                {"file": "application.properties", "type": "property_update",
+                 "from": "server.port=", "to": "server.http.port="},
+                {"file": "application.properties", "type": "property_update",
+                 "from": "security.basic.enabled=", "to": "spring.security.enabled="},
+            ],
+        }
+
+        with patch.object(self.applicator, "_write_workspace_file",
+                          wraps=self.applicator._write_workspace_file) as write:
+            results = self.applicator.exec((changes, str(self.workspace), "demo"))
+
+        self.assertEqual(write.call_count, 1)
+        self.assertEqual(results["total_changes_applied"], 2)
+        self.assertEqual(config.read_text(encoding="utf-8"),
+                         "server.http.port=8080\nspring.security.enabled=true\n")
+
+    def test_failed_write_keeps_file_changed_by_a_force_update(self):
+        source = self.workspace / "Order.java"
+        source.write_text("import javax.persistence.Entity;\nclass Order extends Base {}\n", encoding="utf-8")
+        changes = {
+            "other_changes": [
+                {"file": "Order.java", "type": "api_update", "from": "extends Base", "to": "extends NewBase",
+                 "automatic": True},
+            ],
+        }
+
+        with patch.object(self.applicator, "_write_workspace_file", side_effect=OSError("disk full")):
+            results = self.applicator.exec((changes, str(self.workspace), "demo"))
+
+        self.assertEqual(results["files_modified"], {"Order.java"})
+        self.assertEqual([r["type"] for r in results["successful"]], ["javax_to_jakarta_comprehensive"])
+        self.assertEqual([r["type"] for r in results["failed"]], ["api_update"])
+        self.assertEqual(source.read_text(encoding="utf-8"),
+                         "import jakarta.persistence.Entity;\nclass Order extends Base {}\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,7 +8,7 @@ Tests the enhanced JSON handling in MigrationChangeGenerator to ensure it can ha
 import json
 import os
 import tempfile
-from nodes import MigrationChangeGenerator
+from nodes import MigrationChangeGenerator, find_json_span, missing_json_closers
 
 
 def test_json_extraction_scenarios():
@@ -223,6 +223,44 @@ def test_json_repair_strategies():
     return passed == total
 
 
+def test_missing_json_closers():
+    """Truncated JSON is closed in nesting order, ignoring brackets inside strings."""
+    
+    assert missing_json_closers('{"a": 1}') == ''
+    assert missing_json_closers('{"a": [{"b": 1}, {"c": [2,') == ']}]}'
+    assert missing_json_closers('{"a": "[{ \\" }", "b": [') == ']}'
+    
+    truncated = '{"changes": [{"file": "A.java", "lines": [1, 2'
+    assert json.loads(truncated + missing_json_closers(truncated)) == {
+        "changes": [{"file": "A.java", "lines": [1, 2]}]
+    }
+
+
+def test_find_json_span():
+    """The first balanced object is found without regex backtracking."""
+    
+    assert find_json_span('no json here') is None
+    assert find_json_span('Result: {"a": "}{", "b": {"c": 1}} and {"d": 2}') == '{"a": "}{", "b": {"c": 1}}'
+    # Unterminated objects run to the end so they can be closed
+    assert find_json_span('text {"a": [1, 2') == '{"a": [1, 2'
+
+
+def test_extract_fenced_and_truncated_json():
+    """Fenced answers stop at the root object and truncated ones are closed."""
+    
+    generator = MigrationChangeGenerator()
+    
+    fenced = 'Sure:\n```json\n{"javax_to_jakarta": [{"from": "a}b"}]}\n```\nAnything else? {"x": 1}'
+    assert json.loads(generator._extract_and_clean_json(fenced, "test.java")) == {
+        "javax_to_jakarta": [{"from": "a}b"}]
+    }
+    
+    truncated = '{"javax_to_jakarta": [{"file": "A.java", "from": "javax.persistence.Id"},'
+    assert json.loads(generator._extract_and_clean_json(truncated, "test.java")) == {
+        "javax_to_jakarta": [{"file": "A.java", "from": "javax.persistence.Id"}]
+    }
+
+
 def run_all_tests():
     """Run all JSON extraction and cleaning tests."""
     
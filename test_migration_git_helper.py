@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Unit tests for MigrationGitHelper
+
+Runs the git helper against a throwaway migration workspace repository.
+"""
+
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+from migration_git_helper import MigrationGitHelper
+
+
+def _git(workspace, *args):
+    """Run a git command inside the test workspace."""
+    subprocess.run(["git", *args], cwd=workspace, check=True, capture_output=True)
+
+
+class TestMigrationGitHelper(unittest.TestCase):
+    """Test cases for MigrationGitHelper"""
+    
+    def setUp(self):
+        """Create a migration workspace with one committed Java file"""
+        self.original_cwd = os.getcwd()
+        self.test_dir = tempfile.mkdtemp(prefix="test_git_helper_")
+        self.workspace = Path(self.test_dir) / "demo_migration_20240101_000000"
+        (self.workspace / "src").mkdir(parents=True)
+        (self.workspace / "src" / "App.java").write_text("import javax.persistence.Entity;\n")
+        (self.workspace / "pom.xml").write_text("<project/>\n")
+        
+        _git(self.workspace, "init", "-q")
+        _git(self.workspace, "config", "user.name", "Test User")
+        _git(self.workspace, "config", "user.email", "test@localhost")
+        _git(self.workspace, "add", ".")
+        _git(self.workspace, "commit", "-q", "-m", "Initial commit")
+        
+        with redirect_stdout(io.StringIO()):
+            self.helper = MigrationGitHelper(str(self.workspace))
+    
+    def tearDown(self):
+        """Clean up test directory"""
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def _run(self, method, *args, **kwargs):
+        """Call a helper method and return (result, captured stdout)."""
+        out = io.StringIO()
+        with redirect_stdout(out):
+            result = method(*args, **kwargs)
+        return result, out.getvalue()
+    
+    def test_show_status_clean(self):
+        """Test status output for a clean workspace"""
+        _, output = self._run(self.helper.show_status)
+        self.assertIn("No changes detected", output)
+        self.assertNotIn("Change Summary", output)
+    
+    def test_show_status_with_changes(self):
+        """Test status output lists modified files and a diff summary"""
+        (self.workspace / "src" / "App.java").write_text("import jakarta.persistence.Entity;\n")
+        
+        _, output = self._run(self.helper.show_status)
+        self.assertIn("Modified files:", output)
+        self.assertIn("src/App.java", output)
+        self.assertIn("Change Summary", output)
+    
+    def test_show_status_skips_diff_without_unstaged_edits(self):
+        """Test only staged and untracked changes need a single git process"""
+        (self.workspace / "pom.xml").write_text("<project><version>6</version></project>\n")
+        self._run(self.helper.stage_changes)
+        (self.workspace / "NOTES.txt").write_text("untracked\n")
+        
+        with patch("migration_git_helper.subprocess.run", wraps=subprocess.run) as run:
+            _, output = self._run(self.helper.show_status)
+        
+        self.assertIn("M  pom.xml", output)
+        self.assertIn("?? NOTES.txt", output)
+        self.assertEqual(run.call_count, 1)
+
+    
+    def test_commit_changes_reports_hash(self):
+        """Test committing staged changes prints the new commit hash"""
+        (self.workspace / "src" / "App.java").write_text("import jakarta.persistence.Entity;\n")
+        self._run(self.helper.stage_changes)
+        
+        committed, output = self._run(self.helper.commit_changes, "Migrate imports")
+        head = subprocess.run(["git", "rev-parse", "HEAD"], cwd=self.workspace,
+                              capture_output=True, text=True).stdout.strip()
+        self.assertTrue(committed)
+        self.assertIn(f"Commit hash: {head[:7]}", output)
+    
+    def test_commit_changes_without_staged_changes(self):
+        """Test committing with nothing staged is refused"""
+        committed, output = self._run(self.helper.commit_changes, "Nothing")
+        self.assertFalse(committed)
+        self.assertIn("No staged changes", output)
+
+    
+    def test_cached_git_reuses_output_until_index_changes(self):
+        """Test index-only queries are cached and refreshed after staging"""
+        (self.workspace / "pom.xml").write_text("<project><version>6</version></project>\n")
+        first = self.helper._cached_git("diff", "--cached", "--name-only")
+        self.assertIs(self.helper._cached_git("diff", "--cached", "--name-only"), first)
+        self.assertEqual(first.stdout, b"")
+        
+        self._run(self.helper.stage_changes)
+        refreshed = self.helper._cached_git("diff", "--cached", "--name-only")
+        self.assertEqual(refreshed.stdout.split(), [b"pom.xml"])
+
+    
+    def test_create_patch_contains_staged_and_unstaged_sections(self):
+        """Test the patch file holds both staged and unstaged diffs"""
+        (self.workspace / "pom.xml").write_text("<project><version>6</version></project>\n")
+        self._run(self.helper.stage_changes, "pom.xml")
+        (self.workspace / "src" / "App.java").write_text("import jakarta.persistence.Entity;\n")
+        
+        patch_file = str(Path(self.test_dir) / "migration.patch")
+        self._run(self.helper.create_patch, patch_file)
+        patch = Path(patch_file).read_text()
+        
+        self.assertTrue(patch.startswith("# Staged Changes\ndiff --git a/pom.xml b/pom.xml"))
+        self.assertIn("# Unstaged Changes\ndiff --git a/src/App.java b/src/App.java", patch)
+        self.assertIn("+import jakarta.persistence.Entity;", patch)
+    
+    def test_create_patch_omits_empty_unstaged_section(self):
+        """Test a patch of only staged changes has no unstaged header"""
+        (self.workspace / "pom.xml").write_text("<project><version>6</version></project>\n")
+        self._run(self.helper.stage_changes)
+        
+        patch_file = Path(self.test_dir) / "staged.patch"
+        self._run(self.helper.create_patch, str(patch_file))
+        patch_text = patch_file.read_text()
+        
+        self.assertTrue(patch_text.startswith("# Staged Changes\n"))
+        self.assertNotIn("# Unstaged Changes", patch_text)
+    
+    def test_create_patch_omits_empty_staged_section(self):
+        """Test a patch of only unstaged changes starts at the unstaged header"""
+        (self.workspace / "src" / "App.java").write_text("import jakarta.persistence.Entity;\n")
+        
+        patch_file = Path(self.test_dir) / "unstaged.patch"
+        with patch("migration_git_helper.subprocess.run", wraps=subprocess.run) as run:
+            self._run(self.helper.create_patch, str(patch_file))
+        
+        self.assertTrue(patch_file.read_text().startswith("# Unstaged Changes\ndiff --git"))
+        run.assert_not_called()  # no probing queries, only the two streamed diffs
+    
+    def test_git_operations_keep_working_directory(self):
+        """Test git operations run in the workspace without changing the process cwd"""
+        (self.workspace / "pom.xml").write_text("<project><version>7</version></project>\n")
+        self._run(self.helper.show_status)
+        self._run(self.helper.stage_changes)
+        self._run(self.helper.create_patch, "migration.patch")
+        
+        self.assertEqual(os.getcwd(), self.original_cwd)
+        self.assertTrue((self.workspace / "migration.patch").exists())
+
+    
+    def test_auto_detects_most_recent_workspace(self):
+        """Test workspace auto-detection picks the newest *_migration_* directory"""
+        older = Path(self.test_dir) / "demo_migration_20230101_000000"
+        older.mkdir()
+        (Path(self.test_dir) / "notes_migration_.txt").write_text("not a directory")
+        os.utime(older, (0, 0))
+        
+        os.chdir(self.test_dir)
+        helper, _ = self._run(MigrationGitHelper)
+        self.assertEqual(helper.workspace, self.workspace)
+
+    
+    def test_generate_commit_message_classifies_staged_files(self):
+        """Test the auto-generated message reflects staged file types"""
+        (self.workspace / "src" / "App.java").write_text("import jakarta.persistence.Entity;\n")
+        (self.workspace / "application.yml").write_text("server:\n  port: 8080\n")
+        self._run(self.helper.stage_changes)
+        
+        message = self.helper._generate_commit_message()
+        self.assertIn("- Updated Java source files (javax → jakarta)", message)
+        self.assertIn("- Updated configuration files", message)
+        self.assertNotIn("- Updated build files and dependencies", message)
+        self.assertIn("Files changed: 2", message)
+    
+    def test_generate_commit_message_is_cached_until_index_changes(self):
+        """Test the staged-state message is reused until something new is staged"""
+        (self.workspace / "src" / "App.java").write_text("import jakarta.persistence.Entity;\n")
+        self._run(self.helper.stage_changes)
+        
+        message = self.helper._generate_commit_message()
+        self.assertIs(self.helper._generate_commit_message(), message)
+        
+        (self.workspace / "pom.xml").write_text("<project><version>6</version></project>\n")
+        self._run(self.helper.stage_changes)
+        self.assertIn("Files changed: 2", self.helper._generate_commit_message())
+    
+    def test_generate_commit_message_detects_build_files(self):
+        """Test Gradle Kotlin scripts and pom.xml count as build files"""
+        message = self.helper._generate_commit_message("build.gradle.kts\0docs/README.md\0")
+        self.assertIn("- Updated build files and dependencies", message)
+        self.assertNotIn("- Updated Java source files", message)
+        
+        message = self.helper._generate_commit_message("module/pom.xml\0")
+        self.assertIn("- Updated build files and dependencies", message)
+    
+    def test_stage_and_commit(self):
+        """Test staging and committing everything, with and without a message"""
+        (self.workspace / "src" / "App.java").write_text("import jakarta.persistence.Entity;\n")
+        committed, output = self._run(self.helper.stage_and_commit)
+        self.assertTrue(committed)
+        self.assertIn("with message: Spring 5 to 6 migration - Automated changes\n", output)
+        self.assertIn("Commit hash:", output)
+        
+        (self.workspace / "pom.xml").unlink()
+        with patch("migration_git_helper.subprocess.run", wraps=subprocess.run) as run:
+            committed, _ = self._run(self.helper.stage_and_commit, "Drop pom.xml")
+        self.assertTrue(committed)
+        self.assertEqual(
+            [call.args[0] for call in run.call_args_list],
+            [["git", "add", "-A"], ["git", "diff", "--cached", "--quiet"], ["git", "commit", "-F", "-"]],
+        )
+        
+        log = subprocess.run(["git", "log", "--format=%s", "-2"], cwd=self.workspace,
+                             capture_output=True, text=True).stdout.splitlines()
+        self.assertEqual(log, ["Drop pom.xml", "Spring 5 to 6 migration - Automated changes"])
+        
+        committed, output = self._run(self.helper.stage_and_commit, "Nothing")
+        self.assertFalse(committed)
+        self.assertIn("No staged changes", output)
+    
+    def test_commit_runs_one_staged_files_query(self):
+        """Test the staged check and the generated message share one git query"""
+        (self.workspace / "src" / "App.java").write_text("import jakarta.persistence.Entity;\n")
+        self._run(self.helper.stage_changes)
+        
+        with patch("migration_git_helper.subprocess.run", wraps=subprocess.run) as run:
+            committed, _ = self._run(self.helper.commit_changes)
+        
+        self.assertTrue(committed)
+        diff_calls = [call.args[0] for call in run.call_args_list if call.args[0][1] == "diff"]
+        self.assertEqual(diff_calls, [["git", "diff", "--cached", "-z", "--name-only"]])
+
+    
+    def test_interactive_workflow_stops_at_end_of_input(self):
+        """Test scripted input that ends without 'quit' exits cleanly"""
+        with patch('sys.stdin', io.StringIO("status\n")):
+            _, output = self._run(self.helper.interactive_workflow)
+        
+        self.assertIn("No changes detected", output)
+        self.assertIn("Goodbye!", output)
+    
+    def test_interactive_menu_dispatches_aliases(self):
+        """Test numbered and named menu choices reach the same action"""
+        with patch('sys.stdin', io.StringIO("1\nstatus\nbogus\nq\n")):
+            _, output = self._run(self.helper.interactive_workflow)
+        
+        self.assertEqual(output.count("No changes detected"), 2)
+        self.assertIn("Invalid choice", output)
+        self.assertEqual(output.count("Available actions"), 2)  # at start and after the invalid choice
+        self.assertIn("Goodbye!", output)
+    
+    def test_complete_action(self):
+        """Test tab completion of menu action names"""
+        self.assertEqual(self.helper._complete_action("co", 0), "commit")
+        self.assertEqual(self.helper._complete_action("co", 1), "compare")
+        self.assertEqual(self.helper._complete_action("co", 2), "copy")
+        self.assertIsNone(self.helper._complete_action("co", 3))
+    
+    def test_create_migration_branch_initializes_repository(self):
+        """Test a workspace without git gets initialized before branching"""
+        shutil.rmtree(self.workspace / ".git")
+        self.helper._invalidate_git_cache()
+        
+        branch, output = self._run(self.helper.create_migration_branch, "spring-6-migration")
+        
+        self.assertEqual(branch, "spring-6-migration")
+        self.assertIn("Git repository initialized", output)
+        current = subprocess.run(["git", "branch", "--show-current"], cwd=self.workspace,
+                                 capture_output=True, text=True).stdout.strip()
+        self.assertEqual(current, "spring-6-migration")
+        self.assertEqual(self.helper._index_stamp()[1], subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=self.workspace, capture_output=True).stdout.strip())
+    
+    def test_review_changes_truncates_long_diff(self):
+        """Test file diffs stop after max_diff_lines lines"""
+        (self.workspace / "src" / "App.java").write_text("".join(f"// line {i}\n" for i in range(100)))
+        
+        self.helper.max_diff_lines = 10
+        _, output = self._run(self.helper.review_changes, "src/App.java")
+        self.assertIn("output truncated after 10 lines", output)
+        self.assertNotIn("// line 50", output)
+        
+        self.helper.max_diff_lines = None
+        _, output = self._run(self.helper.review_changes, "src/App.java")
+        self.assertNotIn("output truncated", output)
+        self.assertIn("+// line 99", output)
+    
+    def test_find_analysis_dir_is_remembered(self):
+        """Test the analysis directory is scanned for only until it is found"""
+        os.chdir(self.test_dir)
+        self.assertIsNone(self.helper._find_analysis_dir())
+        
+        (Path(self.test_dir) / "migration_analysis").mkdir()
+        analysis_dir = self.helper._find_analysis_dir()
+        self.assertEqual(analysis_dir, Path(self.test_dir) / "migration_analysis")
+        
+        with patch.object(self.helper, "_scan_analysis_dir") as scan:
+            self.assertEqual(self.helper._find_analysis_dir(), analysis_dir)
+        scan.assert_not_called()
+    
+    def test_review_changes_pages_on_terminal(self):
+        """Test the full diff is handed to git's pager when stdout is a terminal"""
+        (self.workspace / "src" / "App.java").write_text("import jakarta.persistence.Entity;\n")
+        
+        with patch("builtins.input", return_value="y"), \
+             patch("migration_git_helper.sys.stdout.isatty", return_value=True, create=True), \
+             patch("migration_git_helper.subprocess.run") as run:
+            run.return_value = subprocess.CompletedProcess([], 0, "M\tsrc/App.java\n", "")
+            self.helper.review_changes()
+        
+        self.assertEqual(run.call_args.args[0], ["git", "--paginate", "diff"])
+    
+    def test_user_paths_are_not_parsed_as_git_options(self):
+        """Test a file name that looks like an option is passed to git as a path"""
+        output_file = Path(self.test_dir) / "written.txt"
+        self._run(self.helper.review_changes, f"--output={output_file}")
+        self.assertFalse(output_file.exists())
+    
+    def test_copy_to_original_project(self):
+        """Test files changed in the last commit are copied to the original project"""
+        (self.workspace / "src" / "App.java").write_text("import jakarta.persistence.Entity;\n")
+        (self.workspace / "src" / "web").mkdir()
+        (self.workspace / "src" / "web" / "Api.java").write_text("import jakarta.ws.rs.GET;\n")
+        (self.workspace / "src" / "web" / "My Resource.java").write_text("class MyResource {}\n")
+        _git(self.workspace, "add", ".")
+        _git(self.workspace, "commit", "-q", "-m", "Migrate")
+        original = Path(self.test_dir) / "original"
+        (original / "src").mkdir(parents=True)
+        
+        copied, output = self._run(self.helper.copy_to_original_project, str(original), dry_run=True)
+        self.assertFalse(copied)
+        self.assertIn("Would copy: src/web/Api.java", output)
+        self.assertFalse((original / "src" / "web").exists())
+        
+        copied, output = self._run(self.helper.copy_to_original_project, str(original))
+        self.assertTrue(copied)
+        self.assertIn("Copied: 3 files", output)
+        self.assertEqual((original / "src" / "App.java").read_text(), "import jakarta.persistence.Entity;\n")
+        self.assertEqual((original / "src" / "web" / "Api.java").read_text(), "import jakarta.ws.rs.GET;\n")
+        self.assertTrue((original / "src" / "web" / "My Resource.java").exists())
+
+    
+    def test_copy_to_original_project_without_tar(self):
+        """Test files are copied one at a time when tar is not available"""
+        (self.workspace / "src" / "App.java").write_text("import jakarta.persistence.Entity;\n")
+        _git(self.workspace, "commit", "-q", "-am", "Migrate")
+        original = Path(self.test_dir) / "original"
+        original.mkdir()
+        
+        with patch("migration_git_helper.shutil.which", return_value=None):
+            copied, output = self._run(self.helper.copy_to_original_project, str(original))
+        
+        self.assertTrue(copied)
+        self.assertIn("Copied: 1 files", output)
+        self.assertEqual((original / "src" / "App.java").read_text(), "import jakarta.persistence.Entity;\n")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -156,6 +156,27 @@ def test_fallback_plan_generation():
         return False
 
 
+def test_plan_response_with_escaped_quotes():
+    """Test that valid JSON with escaped quotes is parsed without being rewritten."""
+    
+    plan_generator = MigrationPlanGenerator()
+    
+    response = """{
+        "migration_strategy": {
+            "approach": "Phased",
+            "rationale": "Replace the \\"legacy\\" security config first"
+        },
+        "phase_breakdown": [],
+        "automation_recommendations": [],
+        "testing_strategy": {}
+    }"""
+    
+    plan = plan_generator._parse_plan_response(response, {}, "test-project")
+    
+    assert "plan_metadata" not in plan
+    assert plan["migration_strategy"]["rationale"] == 'Replace the "legacy" security config first'
+
+
 def run_all_tests():
     """Run all migration plan generation tests."""
     
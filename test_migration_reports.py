@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for the report files written by MigrationReportGenerator.
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from nodes import MigrationReportGenerator
+
+
+class TestMigrationReports(unittest.TestCase):
+    """Test that every report is written and the JSON reports parse back."""
+
+    def setUp(self):
+        self.workspace = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.workspace, ignore_errors=True)
+
+    def test_reports_include_application_results(self):
+        prep_res = {
+            "migration_analysis": {"executive_summary": {"migration_impact": "High", "key_blockers": ["Java 17"]}},
+            "generated_changes": {"javax_to_jakarta": [{"file": "src/Café.java", "type": "import_replacement"}]},
+            "migration_plan": {"migration_roadmap": [{"step": 1, "title": "Update imports"}]},
+            "applied_changes": {
+                "successful": [{"file": "src/Café.java"}],
+                "skipped": [],
+                "failed": [],
+                "files_modified": {"src/Café.java", "pom.xml"},
+            },
+            "backup_info": {},
+            "project_name": "demo",
+            "migration_workspace": str(self.workspace),
+            "line_change_report": {},
+            "migration_changes_summary": {},
+            "verbose_mode": False,
+        }
+
+        result = MigrationReportGenerator().exec(prep_res)
+
+        self.assertTrue(result["success"], result.get("error"))
+        applied = json.loads((self.workspace / "migration_application_results.json").read_text(encoding="utf-8"))
+        self.assertEqual(applied["files_modified"], ["pom.xml", "src/Café.java"])
+        self.assertIn('"src/Café.java"', (self.workspace / "migration_changes_detailed.json").read_text(encoding="utf-8"))
+        summary = (self.workspace / "MIGRATION_SUMMARY.md").read_text(encoding="utf-8")
+        self.assertIn("### Files Modified (2)\n- `pom.xml`\n- `src/Café.java`\n", summary)
+        executive = (self.workspace / "EXECUTIVE_SUMMARY.md").read_text(encoding="utf-8")
+        self.assertIn("### Impact Assessment\n- High\n\n### Scope\n", executive)
+        self.assertIn("**Critical Issues (1):**\n- Java 17\n\n## Recommendations", executive)
+        self.assertIn("- **Files Updated:** 2 files modified\n", executive)
+
+
+if __name__ == "__main__":
+    unittest.main()
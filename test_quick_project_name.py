@@ -31,6 +31,9 @@ def test_project_name_logic():
             self.git_integration = False
             self.disable_optimization = False
             self.max_files = None
+            self.max_size = 1024 * 1024
+            self.include = None
+            self.exclude = None
             self.parallel = False
             self.max_workers = 4
             self.batch_size = 10
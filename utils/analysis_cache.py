@@ -0,0 +1,95 @@
+import os
+import dbm
+import json
+import shelve
+import hashlib
+from utils.call_llm import llm_model_id
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Bump whenever prompts or the parsed result layout change so stale entries are ignored
+SCHEMA_VERSION = "1"
+
+CACHE_ROOT = os.getenv("MIGRAITE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "migraite"))
+
+# Per-project shelf of extracted file structures, kept next to the reports
+STRUCTURE_CACHE_NAME = ".migraite_cache"
+
+
+def _content_digest(parts):
+    """Hash NUL-separated parts with xxh3-128 when available, blake2b otherwise."""
+    hasher = xxhash.xxh3_128() if xxhash is not None else hashlib.blake2b(digest_size=16)
+    for part in parts:
+        hasher.update(part.encode("utf-8", "surrogatepass"))
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def analysis_cache_key(*parts):
+    """
+    Build the on-disk cache key for a parsed LLM result.
+
+    The key covers the schema version, the provider/model that would answer
+    and every caller-supplied part (prompt, project name, ...).
+
+    Returns:
+        str or None: 128-bit hex digest, or None when no LLM provider is
+        configured (the canned fallback response must never be persisted)
+    """
+    model_id = llm_model_id()
+    if model_id is None:
+        return None
+    return _content_digest((SCHEMA_VERSION, model_id, *parts))
+
+
+def _cache_path(namespace, key):
+    return os.path.join(CACHE_ROOT, namespace, f"{key}.json")
+
+
+def load_cached_analysis(namespace, key):
+    """Return the result stored under key, or None on a miss or unreadable entry."""
+    try:
+        with open(_cache_path(namespace, key), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached_analysis(namespace, key, value):
+    """Persist a result atomically; failures only cost the cache, never the run."""
+    path = _cache_path(namespace, key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def file_content_key(path, content):
+    """Key a file's cached structure by its path and content."""
+    return _content_digest((path, content))
+
+
+def open_structure_cache(output_dir):
+    """
+    Open the per-file structure cache stored in output_dir.
+
+    Falls back to an in-memory shelf when no directory is given or it is not
+    writable, so callers can always use the mapping interface and close() it.
+    """
+    if not output_dir:
+        return shelve.Shelf({})
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        return shelve.open(os.path.join(output_dir, STRUCTURE_CACHE_NAME))
+    except (OSError, *dbm.error):
+        return shelve.Shelf({})
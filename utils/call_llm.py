@@ -4,6 +4,7 @@ import json
 from datetime import datetime
 import requests
 import time
+import threading
 from functools import lru_cache
 import hashlib
 from utils.verbose_logger import get_verbose_logger
@@ -34,10 +35,32 @@ MAX_RETRIES = 5  # More retries for better reliability (increased from 3)
 RATE_LIMIT_DELAY = 1  # Reduced delay between requests (reduced from 2 seconds)
 MAX_CONTEXT_LENGTH = 200000  # Increased context length for larger analysis (increased from 100000)
 
+# Model each provider is called with; llm_model_id reports the same choice
+OPENAI_MODEL = "gpt-4-turbo-preview"  # Use model with large context window
+LOCAL_OPENAI_MODEL = "meta-llama-3.1-8b-instruct"  # Use exact available local model
+ANTHROPIC_MODEL = "claude-3-sonnet-20240229"
+GOOGLE_MODEL = "gemini-pro"
+
+# Anthropic models that accept cache_control, with the smallest prefix (in
+# tokens) they will cache; shorter prefixes are not worth marking
+ANTHROPIC_PROMPT_CACHE_MIN_TOKENS = (
+    ("claude-3-haiku", 2048),
+    ("claude-3-5-haiku", 2048),
+    ("claude-3-opus", 1024),
+    ("claude-3-5-sonnet", 1024),
+    ("claude-3-7-sonnet", 1024),
+    ("claude-sonnet-4", 1024),
+    ("claude-opus-4", 1024),
+)
+CHARS_PER_TOKEN = 4  # Rough estimate for English text and code
+
 
-def call_llm(prompt, use_cache=True, timeout=DEFAULT_TIMEOUT, max_retries=MAX_RETRIES):
+def call_llm(prompt, use_cache=True, timeout=DEFAULT_TIMEOUT, max_retries=MAX_RETRIES, cache_prefix=None):
     """
     Enhanced LLM calling with maximum timeout handling, aggressive retry logic, and large content optimization.
+
+    cache_prefix is an optional leading part of the prompt that repeats across
+    calls; providers that support prompt caching are asked to cache it.
     """
     vlogger = get_verbose_logger()
     
@@ -51,6 +74,10 @@ def call_llm(prompt, use_cache=True, timeout=DEFAULT_TIMEOUT, max_retries=MAX_RE
         timeout = max(timeout, 1800)  # Force 30 minutes for very large prompts
         vlogger.debug(f"Large prompt detected, using extended timeout: {timeout}s")
     
+    # A truncated prompt no longer shares the caller's prefix
+    if cache_prefix and not (len(prompt) > len(cache_prefix) and prompt.startswith(cache_prefix)):
+        cache_prefix = None
+    
     # Generate cache key
     cache_key = hashlib.md5(prompt.encode()).hexdigest()
     
@@ -75,7 +102,7 @@ def call_llm(prompt, use_cache=True, timeout=DEFAULT_TIMEOUT, max_retries=MAX_RE
             vlogger.llm_call(f"Attempt {attempt + 1}", "", len(prompt), use_cache)
             
             # Use the appropriate LLM provider with extended timeout
-            response = _make_llm_request(prompt, timeout)
+            response = _make_llm_request(prompt, timeout, cache_prefix)
             
             # Cache successful response
             if use_cache and response:
@@ -156,31 +183,80 @@ def _optimize_large_prompt(prompt):
     return optimized_prompt
 
 
-def _make_llm_request(prompt, timeout):
+class FallbackResponse(str):
+    """Canned response returned when no LLM provider answered."""
+
+
+def is_fallback_response(response):
+    """Tell whether a call_llm result is a canned fallback rather than a model answer."""
+    return isinstance(response, FallbackResponse)
+
+
+def _openai_target():
+    """
+    Pick the model and base URL the OPENAI_API_KEY selects.
+    
+    A full sk- key goes to the OpenAI API (base URL None); anything else goes
+    to the local OpenAI-compatible server.
+    """
+    api_key = os.environ.get("OPENAI_API_KEY", "your-api-key")
+    if api_key.startswith("sk-") and len(api_key) > 20:
+        return OPENAI_MODEL, None
+    return LOCAL_OPENAI_MODEL, os.environ.get("OPENAI_URL", "http://localhost:1234/v1")
+
+
+def _configured_providers():
+    """List (provider, model) for every provider with a key set, in the order they are tried."""
+    providers = []
+    if os.getenv('OPENAI_API_KEY'):
+        providers.append(("openai", _openai_target()[0]))
+    if os.getenv('ANTHROPIC_API_KEY'):
+        providers.append(("anthropic", ANTHROPIC_MODEL))
+    if os.getenv('GOOGLE_API_KEY'):
+        providers.append(("google", GOOGLE_MODEL))
+    return providers
+
+
+def llm_model_id():
+    """
+    Identify the provider and model _make_llm_request would use first.
+    
+    Returns None when no provider key is configured.
+    """
+    providers = _configured_providers()
+    if not providers:
+        return None
+    provider, model = providers[0]
+    if provider == "openai":
+        base_url = _openai_target()[1]
+        if base_url:
+            return f"openai:{model}@{base_url}"
+    return f"{provider}:{model}"
+
+
+def _make_llm_request(prompt, timeout, cache_prefix=None):
     """Make the actual LLM request with timeout handling."""
     vlogger = get_verbose_logger()
     
-    # Try different LLM providers in order of preference
-    providers = ['openai', 'anthropic', 'google']
-    
-    for provider in providers:
+    # Try the configured providers in order of preference
+    for provider, model in _configured_providers():
         try:
-            if provider == 'openai' and os.getenv('OPENAI_API_KEY'):
-                return _call_openai(prompt, timeout)
-            elif provider == 'anthropic' and os.getenv('ANTHROPIC_API_KEY'):
-                return _call_anthropic(prompt, timeout)
-            elif provider == 'google' and os.getenv('GOOGLE_API_KEY'):
-                return _call_google(prompt, timeout)
+            if provider == 'openai':
+                return _call_openai(prompt, timeout, model, cache_prefix)
+            elif provider == 'anthropic':
+                return _call_anthropic(prompt, timeout, model, cache_prefix)
+            elif provider == 'google':
+                return _call_google(prompt, timeout, model)
         except Exception as e:
             vlogger.warning(f"Provider {provider} failed: {str(e)}")
             continue
     
     # Fallback: return a structured error response that can be parsed
     vlogger.error("All LLM providers failed, returning fallback response")
-    return _get_fallback_llm_response(prompt)
+    return FallbackResponse(_get_fallback_llm_response(prompt))
 
 
-def _call_openai(prompt, timeout):
+def _call_openai(prompt, timeout, model, cache_prefix=None):
     """Call OpenAI with enhanced timeout handling."""
     try:
         from openai import OpenAI
@@ -192,57 +268,42 @@ def _call_openai(prompt, timeout):
         # Use extended timeout for very large requests
         extended_timeout = max(timeout, 900)  # At least 15 minutes
         
-        # Set timeout alarm with extended time
-        signal.signal(signal.SIGALRM, timeout_handler)
-        signal.alarm(extended_timeout)
+        # Set timeout alarm with extended time; signals only work on the main
+        # thread, worker threads rely on the client's own timeout below
+        use_alarm = threading.current_thread() is threading.main_thread()
+        if use_alarm:
+            signal.signal(signal.SIGALRM, timeout_handler)
+            signal.alarm(extended_timeout)
         
         try:
-            # Use real OpenAI API if API key is provided, otherwise use local server
-            api_key = os.environ.get("OPENAI_API_KEY", "your-api-key")
-            if api_key and api_key != "your-api-key" and api_key.startswith("sk-"):
-                # Configure OpenAI client
-                config = {
-                    "api_key": api_key,
-                    "timeout": extended_timeout
-                }
-                
-                # Use real OpenAI API if API key is valid, otherwise use local server
-                if api_key.startswith("sk-") and len(api_key) > 20:
-                    # Real OpenAI API
-                    client = OpenAI(**config)
-                    model = "gpt-4-turbo-preview"  # Use model with large context window
-                else:
-                    # Local server - use one of the available models
-                    config["base_url"] = os.environ.get("OPENAI_URL", "http://localhost:1234/v1")
-                    client = OpenAI(**config)
-                    model = "meta-llama-3.1-8b-instruct"  # Use exact available local model
-                response = client.chat.completions.create(
-                    model=model,
-                    messages=[{"role": "user", "content": prompt}],
-                    timeout=extended_timeout,
-                    max_tokens=8192,
-                    temperature=0.1,
-                    top_p=0.9
-                )
-            else:
-                # Fallback to local server
-                client_kwargs = {
-                    "api_key": api_key,
-                    "base_url": os.environ.get("OPENAI_URL", "http://localhost:1234/v1"),
-                    "timeout": extended_timeout
-                }
-                client = OpenAI(**client_kwargs)
-                response = client.chat.completions.create(
-                    model="meta-llama-3.1-8b-instruct",  # Use exact available local model
-                    messages=[{"role": "user", "content": prompt}],
-                    timeout=extended_timeout,
-                    max_tokens=8192,
-                    temperature=0.1,
-                    top_p=0.9
-                )
+            # Use real OpenAI API if API key is valid, otherwise use local server
+            client_kwargs = {
+                "api_key": os.environ.get("OPENAI_API_KEY", "your-api-key"),
+                "timeout": extended_timeout
+            }
+            request_options = {}
+            base_url = _openai_target()[1]
+            if base_url:
+                client_kwargs["base_url"] = base_url
+            elif cache_prefix:
+                # OpenAI caches prefixes automatically; the key routes
+                # calls sharing a prefix to the same cache
+                prefix_key = hashlib.sha256(cache_prefix.encode()).hexdigest()[:32]
+                request_options["extra_body"] = {"prompt_cache_key": prefix_key}
+            client = OpenAI(**client_kwargs)
+            response = client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                timeout=extended_timeout,
+                max_tokens=8192,
+                temperature=0.1,
+                top_p=0.9,
+                **request_options
+            )
             return response.choices[0].message.content
         finally:
-            signal.alarm(0)  # Cancel the alarm
+            if use_alarm:
+                signal.alarm(0)  # Cancel the alarm
             
     except ImportError:
         raise Exception("OpenAI library not installed")
@@ -252,7 +313,17 @@ def _call_openai(prompt, timeout):
         raise Exception(f"OpenAI error: {str(e)}")
 
 
-def _call_anthropic(prompt, timeout):
+def _anthropic_can_cache_prefix(model, cache_prefix):
+    """Tell whether model supports prompt caching and cache_prefix is long enough to be cached."""
+    if not cache_prefix:
+        return False
+    for model_prefix, min_tokens in ANTHROPIC_PROMPT_CACHE_MIN_TOKENS:
+        if model.startswith(model_prefix):
+            return len(cache_prefix) // CHARS_PER_TOKEN >= min_tokens
+    return False
+
+
+def _call_anthropic(prompt, timeout, model, cache_prefix=None):
     """Call Anthropic with enhanced timeout handling."""
     try:
         from anthropic import Anthropic
@@ -264,9 +335,17 @@ def _call_anthropic(prompt, timeout):
             api_key=os.getenv('ANTHROPIC_API_KEY'),
             timeout=extended_timeout  # Set client-level timeout
         )
+        if _anthropic_can_cache_prefix(model, cache_prefix):
+            # Mark the shared prefix as a cache breakpoint
+            content = [
+                {"type": "text", "text": cache_prefix, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": prompt[len(cache_prefix):]}
+            ]
+        else:
+            content = prompt
         response = client.messages.create(
-            model="claude-3-sonnet-20240229",
-            messages=[{"role": "user", "content": prompt}],
+            model=model,
+            messages=[{"role": "user", "content": content}],
             max_tokens=8192,  # Increased for better response completeness
             timeout=extended_timeout,  # Set request-level timeout
             temperature=0.1  # Lower temperature for more consistent responses
@@ -278,7 +357,7 @@ def _call_anthropic(prompt, timeout):
         raise Exception(f"Anthropic error: {str(e)}")
 
 
-def _call_google(prompt, timeout):
+def _call_google(prompt, timeout, model_name):
     """Call Google Generative AI with enhanced timeout handling."""
     try:
         import google.generativeai as genai
@@ -297,7 +376,7 @@ def _call_google(prompt, timeout):
             "max_output_tokens": 8192  # Increased output tokens
         }
         
-        model = genai.GenerativeModel('gemini-pro', generation_config=generation_config)
+        model = genai.GenerativeModel(model_name, generation_config=generation_config)
         
         # Use asyncio timeout for better timeout handling
         async def generate_with_timeout():
@@ -506,8 +585,9 @@ def _get_fallback_generic_response():
     }, indent=2)
 
 
-# Simple in-memory cache
+# Simple in-memory cache, shared by the worker threads that call the LLM
 _response_cache = {}
+_response_cache_lock = threading.Lock()
 
 
 def _get_cached_response(cache_key):
@@ -517,14 +597,15 @@ def _get_cached_response(cache_key):
 
 def _cache_response(cache_key, response):
     """Cache successful response."""
-    # Limit cache size to prevent memory issues
-    if len(_response_cache) > 100:
-        # Remove oldest entries
-        keys_to_remove = list(_response_cache.keys())[:20]
-        for key in keys_to_remove:
-            del _response_cache[key]
-    
-    _response_cache[cache_key] = response
+    with _response_cache_lock:
+        # Limit cache size to prevent memory issues
+        if len(_response_cache) > 100:
+            # Remove oldest entries
+            keys_to_remove = list(_response_cache.keys())[:20]
+            for key in keys_to_remove:
+                del _response_cache[key]
+        
+        _response_cache[cache_key] = response
 
 
 # Rate limiting for concurrent requests
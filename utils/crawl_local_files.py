@@ -1,9 +1,29 @@
 import os
+import re
 import fnmatch
 import pathspec
 from .file_encoding_detector import RobustFileReader
 
 
+def compile_glob_patterns(patterns):
+    """
+    Compile a collection of glob patterns into a single alternation regex.
+    
+    Matching one compiled regex per path replaces a per-pattern fnmatch loop,
+    so filtering cost stays O(files) instead of O(files x patterns).
+    
+    Args:
+        patterns (iterable): Glob patterns (e.g. {"*.java", "*/target/*"})
+    
+    Returns:
+        re.Pattern or None: Compiled regex, or None if no patterns were given
+    """
+    if not patterns:
+        return None
+    # Sort so the same pattern set always yields the same regex
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in sorted(patterns)))
+
+
 def crawl_local_files(
     directory,
     include_patterns=None,
@@ -63,6 +83,10 @@ def crawl_local_files(
     print(f"Include patterns: {include_patterns}")
     print(f"Exclude patterns: {exclude_patterns}")
     
+    # Compile glob patterns once instead of running fnmatch per pattern per file
+    include_re = compile_glob_patterns(include_patterns)
+    exclude_re = compile_glob_patterns(exclude_patterns)
+    
     # Find all files
     all_files = []
     for root, dirs, files in os.walk(directory):
@@ -89,23 +113,17 @@ def crawl_local_files(
             exclusion_reason = "gitignore"
             stats["files_excluded_gitignore"] += 1
 
-        if not excluded and exclude_patterns:
-            for pattern in exclude_patterns:
-                # Check if the pattern matches any part of the path
-                if fnmatch.fnmatch(relpath, pattern) or any(fnmatch.fnmatch(part, pattern) for part in relpath.split(os.sep)):
-                    excluded = True
-                    exclusion_reason = "exclude_pattern"
-                    stats["files_excluded_patterns"] += 1
-                    break
+        if not excluded and exclude_re:
+            # Check if any pattern matches the full path or any part of it
+            if exclude_re.match(relpath) or any(exclude_re.match(part) for part in relpath.split(os.sep)):
+                excluded = True
+                exclusion_reason = "exclude_pattern"
+                stats["files_excluded_patterns"] += 1
 
         # --- Inclusion check ---
-        included = False
-        if include_patterns:
-            for pattern in include_patterns:
-                # Match by filename or full path
-                if fnmatch.fnmatch(relpath, pattern) or fnmatch.fnmatch(os.path.basename(relpath), pattern):
-                    included = True
-                    break
+        if include_re:
+            # Match by filename or full path
+            included = bool(include_re.match(relpath) or include_re.match(os.path.basename(relpath)))
         else:
             included = True  # Include all files if no include patterns specified
 
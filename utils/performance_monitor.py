@@ -1,3 +1,4 @@
+import re
 import time
 import psutil
 import threading
@@ -9,6 +10,17 @@ import json
 import os
 
 
+# Path fragments that mark Spring-relevant files, kept first when filtering
+SPRING_PRIORITY_PATH_RE = re.compile(
+    "|".join(re.escape(p) for p in ('pom.xml', 'build.gradle', 'application.', 'config',
+                                    'controller', 'service', 'repository', 'entity', 'component',
+                                    'security', 'boot', 'spring')),
+    re.IGNORECASE
+)
+
+CONFIG_FILE_EXTENSIONS = ('.xml', '.properties', '.yml', '.yaml')
+
+
 @dataclass
 class PerformanceMetrics:
     """Performance metrics for a specific operation."""
@@ -241,12 +253,17 @@ class ResourceOptimizer:
                                      enable_llm_analysis: bool = True) -> Dict[str, Any]:
         """Estimate resource requirements for analysis."""
         total_files = len(files_data)
-        total_size = sum(len(content) for _, content in files_data)
         
-        # File type analysis
-        java_files = sum(1 for path, _ in files_data if path.endswith('.java'))
-        config_files = sum(1 for path, _ in files_data if any(path.endswith(ext) for ext in ['.xml', '.properties', '.yml', '.yaml']))
-        build_files = sum(1 for path, _ in files_data if any(name in path for name in ['pom.xml', 'build.gradle']))
+        # Size and file type analysis in one pass over the files
+        total_size = java_files = config_files = build_files = 0
+        for path, content in files_data:
+            total_size += len(content)
+            if path.endswith('.java'):
+                java_files += 1
+            if path.endswith(CONFIG_FILE_EXTENSIONS):
+                config_files += 1
+            if 'pom.xml' in path or 'build.gradle' in path:
+                build_files += 1
         
         # Memory estimation (rough)
         estimated_memory_mb = (total_size / 1024 / 1024) * 2  # 2x content size for processing overhead
@@ -317,17 +334,12 @@ class ResourceOptimizer:
             return files_data
         
         # Prioritize Spring-relevant files
-        spring_priority_patterns = [
-            'pom.xml', 'build.gradle', 'application.', 'config', 
-            'controller', 'service', 'repository', 'entity', 'component',
-            'security', 'boot', 'spring'
-        ]
-        
         prioritized_files = []
         regular_files = []
         
         for file_path, content in files_data:
-            is_priority = any(pattern.lower() in file_path.lower() for pattern in spring_priority_patterns)
+            # One case-insensitive scan of the path instead of a lowered copy per pattern
+            is_priority = SPRING_PRIORITY_PATH_RE.search(file_path) is not None
             
             if is_priority:
                 prioritized_files.append((file_path, content))
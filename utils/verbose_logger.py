@@ -40,26 +40,39 @@ class VerboseLogger:
         """Log a message with optional formatting."""
         if not self.enabled:
             return
-            
-        # Get timestamp
-        timestamp = ""
-        if self.show_timestamps:
-            current_time = datetime.now().strftime("%H:%M:%S.%f")[:-3]  # Include milliseconds
-            elapsed = time.time() - self.start_time
-            timestamp = f"[{current_time}] [{elapsed:6.1f}s] "
         
-        # Get level emoji and color
-        level_info = self._get_level_info(level)
+        # Print formatted message
+        print(self._format_line(message, level, indent, self._timestamp()))
+        sys.stdout.flush()
         
-        # Format indentation
-        indent_str = "  " * (indent + len(self.operation_stack))
+        self.last_update_time = time.time()
+    
+    def log_block(self, entries):
+        """Log several (message, level, indent) entries with a single write."""
+        if not self.enabled or not entries:
+            return
         
-        # Print formatted message
-        print(f"{timestamp}{level_info['emoji']} {indent_str}{message}")
+        timestamp = self._timestamp()
+        print("\n".join(self._format_line(message, level, indent, timestamp)
+                        for message, level, indent in entries))
         sys.stdout.flush()
         
         self.last_update_time = time.time()
     
+    def _timestamp(self) -> str:
+        """Build the timestamp prefix for a log line."""
+        if not self.show_timestamps:
+            return ""
+        current_time = datetime.now().strftime("%H:%M:%S.%f")[:-3]  # Include milliseconds
+        elapsed = time.time() - self.start_time
+        return f"[{current_time}] [{elapsed:6.1f}s] "
+    
+    def _format_line(self, message: str, level: LogLevel, indent: int, timestamp: str) -> str:
+        """Format a single log line with level emoji and indentation."""
+        level_info = self._get_level_info(level)
+        indent_str = "  " * (indent + len(self.operation_stack))
+        return f"{timestamp}{level_info['emoji']} {indent_str}{message}"
+    
     def start_operation(self, operation_name: str, details: str = ""):
         """Start a new operation with progress tracking."""
         self.operation_stack.append(operation_name)
@@ -119,8 +132,13 @@ class VerboseLogger:
     
     def performance_metric(self, metric_name: str, value: float, unit: str = ""):
         """Log performance metrics."""
+        self.log(*self._performance_metric_entry(metric_name, value, unit))
+    
+    @staticmethod
+    def _performance_metric_entry(metric_name: str, value: float, unit: str = ""):
+        """Build the (message, level, indent) entry for a performance metric."""
         unit_str = f" {unit}" if unit else ""
-        self.log(f"📈 {metric_name}: {value:.2f}{unit_str}", LogLevel.DEBUG, indent=1)
+        return f"📈 {metric_name}: {value:.2f}{unit_str}", LogLevel.DEBUG, 1
     
     def warning(self, message: str):
         """Log a warning message."""
@@ -150,8 +168,14 @@ class VerboseLogger:
     
     def subsection_header(self, title: str):
         """Log a subsection header."""
-        self.log(f"📂 {title}", LogLevel.INFO)
-        self.log("-" * min(40, len(title) + 5), LogLevel.INFO)
+        for entry in self._subsection_header_entries(title):
+            self.log(*entry)
+    
+    @staticmethod
+    def _subsection_header_entries(title: str):
+        """Build the (message, level, indent) entries for a subsection header."""
+        return [(f"📂 {title}", LogLevel.INFO, 0),
+                ("-" * min(40, len(title) + 5), LogLevel.INFO, 0)]
     
     def git_operation(self, operation: str, details: str = ""):
         """Log Git operations."""
@@ -193,9 +217,37 @@ class VerboseLogger:
     
     def optimization_applied(self, optimization: str, improvement: str = ""):
         """Log applied optimizations."""
+        self.log(*self._optimization_entry(optimization, improvement))
+    
+    @staticmethod
+    def _optimization_entry(optimization: str, improvement: str = ""):
+        """Build the (message, level, indent) entry for an applied optimization."""
         improvement_str = f" ({improvement})" if improvement else ""
-        self.log(f"⚡ Applied optimization: {optimization}{improvement_str}", 
-                LogLevel.INFO, indent=1)
+        return f"⚡ Applied optimization: {optimization}{improvement_str}", LogLevel.INFO, 1
+    
+    def emit_summary_block(self, perf_summary: Dict[str, Any], optimizations=()):
+        """Log final performance metrics and recommendations as one block."""
+        if not self.enabled:
+            return
+        
+        metrics = [
+            ("Total duration", perf_summary['overall_duration'], "seconds"),
+            ("Files processed", perf_summary['total_files_processed'], ""),
+            ("LLM calls", perf_summary['total_llm_calls'], ""),
+            ("Peak memory", perf_summary['peak_memory_mb'], "MB"),
+            ("Processing rate", perf_summary['files_per_second'], "files/sec"),
+        ]
+        
+        entries = self._subsection_header_entries("Final Performance Metrics")
+        entries.extend(self._performance_metric_entry(name, value, unit)
+                       for name, value, unit in metrics)
+        
+        if optimizations:
+            entries.extend(self._subsection_header_entries("Optimization Recommendations"))
+            entries.extend(self._optimization_entry(f"Recommendation {i + 1}", opt)
+                           for i, opt in enumerate(optimizations))
+        
+        self.log_block(entries)
     
     def _get_level_info(self, level: LogLevel) -> Dict[str, str]:
         """Get emoji and color info for log levels."""